@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Build report viewer/comparator (reports generated with limepsb_rpcm.py --build-report).
+
+import sys
+import json
+import argparse
+
+# Compare ------------------------------------------------------------------------------------------
+
+def compare(old, new, fmax_threshold=5.0, util_threshold=5.0):
+    """
+    Compare two build reports.
+
+    Returns (rows, regressions): a regression is a domain Fmax drop above `fmax_threshold` % or a
+    domain no longer meeting its constraint, a resource usage increase above `util_threshold` % or
+    a resource over capacity.
+    """
+    rows        = []
+    regressions = []
+
+    # Timings.
+    for domain in sorted(set(old["domains"]) | set(new["domains"])):
+        o = old["domains"].get(domain, {}).get("achieved_mhz")
+        n = new["domains"].get(domain, {}).get("achieved_mhz")
+        constraint = new["domains"].get(domain, old["domains"].get(domain, {})).get("constraint_mhz")
+        change     = None if not (o and n) else (n - o)/o*100
+        rows.append((f"{domain} Fmax (MHz)", o, n, change))
+        if change is not None and change < -fmax_threshold:
+            regressions.append(f"{domain}: Fmax {o:.2f} -> {n:.2f} MHz ({change:+.1f}%)")
+        if n is not None and constraint and n < constraint and (o is None or o >= constraint):
+            regressions.append(f"{domain}: Fmax {n:.2f} MHz below {constraint:.2f} MHz constraint")
+
+    # Utilization.
+    for resource in sorted(set(old["utilization"]) | set(new["utilization"])):
+        o = old["utilization"].get(resource, {}).get("used")
+        n = new["utilization"].get(resource, {}).get("used")
+        available = new["utilization"].get(resource, {}).get("available")
+        change    = None if not (o and n is not None) else (n - o)/o*100
+        rows.append((f"{resource} used", o, n, change))
+        if change is not None and change > util_threshold:
+            regressions.append(f"{resource}: {o} -> {n} used ({change:+.1f}%)")
+        if n is not None and available and n > available:
+            regressions.append(f"{resource}: {n} used over {available} available")
+
+    return rows, regressions
+
+def format_value(value):
+    if value is None:
+        return "-"
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LimePSB-RPCM build report comparison")
+    parser.add_argument("old",              help="Reference build report (JSON)")
+    parser.add_argument("new",              help="New build report (JSON)")
+    parser.add_argument("--fmax-threshold", default=5.0, type=float, help="Allowed Fmax drop per domain (%%, default: 5)")
+    parser.add_argument("--util-threshold", default=5.0, type=float, help="Allowed resource usage increase (%%, default: 5)")
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    rows, regressions = compare(old, new, args.fmax_threshold, args.util_threshold)
+    print(f"{'':20s} {old.get('git') or 'old':>12s} {new.get('git') or 'new':>12s} {'change':>8s}")
+    for name, o, n, change in rows:
+        print(f"{name:20s} {format_value(o):>12s} {format_value(n):>12s} " +
+              (f"{change:+7.1f}%" if change is not None else f"{'-':>8s}"))
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
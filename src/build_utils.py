@@ -0,0 +1,230 @@
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Build helpers for LimePSB-RPCM gateware: place-and-route seed sweep and build report.
+
+import os
+import re
+import glob
+import json
+import time
+import shlex
+import shutil
+import subprocess
+
+from concurrent.futures import ProcessPoolExecutor
+
+# Build Script -------------------------------------------------------------------------------------
+
+def parse_build_script(gateware_dir):
+    """Return the commands of the LiteX generated build script (yosys, nextpnr, packer) as argument lists."""
+    scripts = glob.glob(os.path.join(gateware_dir, "build_*.sh"))
+    if len(scripts) != 1:
+        raise OSError(f"Unable to find build script in {gateware_dir}, run the build with run=False first.")
+    cmds = []
+    with open(scripts[0]) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or line.startswith("set "):
+                continue
+            cmds.append(shlex.split(line))
+    return cmds
+
+def run_build_script(gateware_dir):
+    """Run the commands of the LiteX generated build script, with the nextpnr log kept for build_report."""
+    cmds       = parse_build_script(gateware_dir)
+    build_name = get_build_name(cmds)
+    for cmd in cmds:
+        if cmd[0].startswith("nextpnr"):
+            cmd = set_option(cmd, "--log", f"{build_name}.log")
+        subprocess.run(cmd, cwd=gateware_dir, check=True)
+
+def get_build_name(cmds):
+    pnr = next(cmd for cmd in cmds if cmd[0].startswith("nextpnr"))
+    return os.path.splitext(get_option(pnr, "--asc"))[0]
+
+def get_option(cmd, name):
+    return cmd[cmd.index(name) + 1] if name in cmd else None
+
+def set_option(cmd, name, value):
+    cmd = list(cmd)
+    if name in cmd:
+        cmd[cmd.index(name) + 1] = str(value)
+    else:
+        cmd += [name, str(value)]
+    return cmd
+
+# Nextpnr Timing -----------------------------------------------------------------------------------
+
+NEXTPNR_FMAX_RE = re.compile(r"Max frequency for clock\s+'(?P<clock>[^']+)':\s+(?P<achieved>[\d.]+) MHz "
+                             r"\((?:PASS|FAIL) at (?P<constraint>[\d.]+) MHz\)")
+
+def parse_nextpnr_fmax(log):
+    """{clock: (achieved MHz, constraint MHz)} from a nextpnr log (last report, post-routing, wins)."""
+    fmax = {}
+    for m in NEXTPNR_FMAX_RE.finditer(log):
+        fmax[m.group("clock")] = (float(m.group("achieved")), float(m.group("constraint")))
+    return fmax
+
+def worst_slack(fmax):
+    """Worst period slack (ns) over all clocks."""
+    return min((1e3/constraint - 1e3/achieved for achieved, constraint in fmax.values()), default=0.0)
+
+# Seed Sweep ---------------------------------------------------------------------------------------
+
+def _run_pnr(args):
+    cmd, cwd, build_name, seed = args
+    asc = f"{build_name}_seed{seed}.asc"
+    log = f"{build_name}_seed{seed}.log"
+    cmd = set_option(cmd, "--seed", seed)
+    cmd = set_option(cmd, "--asc",  asc)
+    cmd = set_option(cmd, "--log",  log)
+    s   = subprocess.run(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if s.returncode:
+        return seed, None
+    with open(os.path.join(cwd, log)) as f:
+        return seed, parse_nextpnr_fmax(f.read())
+
+def seed_sweep(gateware_dir, seeds, jobs=None):
+    """
+    Synthesize once, place-and-route every seed in a process pool and pack the best one.
+
+    The best seed is the one with the largest worst slack over all clocks; its .asc/.log become
+    the build outputs. Returns (best seed, {seed: fmax}).
+    """
+    cmds       = parse_build_script(gateware_dir)
+    yosys      = next(cmd for cmd in cmds if cmd[0] == "yosys")
+    pnr        = next(cmd for cmd in cmds if cmd[0].startswith("nextpnr"))
+    post       = cmds[cmds.index(pnr) + 1:] # Pre-packer/packer commands.
+    build_name = get_build_name(cmds)
+
+    # Synthesis.
+    print("Synthesis...")
+    subprocess.run(yosys, cwd=gateware_dir, check=True)
+
+    # Place and Route.
+    print(f"Place and Route: {len(seeds)} seeds, {jobs or os.cpu_count()} jobs...")
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = dict(executor.map(_run_pnr, [(pnr, gateware_dir, build_name, seed) for seed in seeds]))
+    routed = {seed: fmax for seed, fmax in results.items() if fmax}
+    if not routed:
+        raise OSError("Place and Route failed for all seeds.")
+    best = max(routed, key=lambda seed: worst_slack(routed[seed]))
+
+    # Report.
+    clocks = sorted({clock for fmax in routed.values() for clock in fmax})
+    print("Seed | Worst Slack (ns) | " + " | ".join(f"{clock} (MHz)" for clock in clocks))
+    for seed, fmax in results.items():
+        if not fmax:
+            print(f"{seed:4d} | failed")
+            continue
+        values = " | ".join(f"{fmax[clock][0]:.2f}/{fmax[clock][1]:.2f}" if clock in fmax else "-" for clock in clocks)
+        print(f"{seed:4d} | {worst_slack(fmax):16.3f} | {values}" + (" <- best" if seed == best else ""))
+
+    # Pack best seed.
+    for ext in ["asc", "log"]:
+        shutil.copyfile(
+            os.path.join(gateware_dir, f"{build_name}_seed{best}.{ext}"),
+            os.path.join(gateware_dir, f"{build_name}.{ext}"))
+    for cmd in post:
+        subprocess.run(cmd, cwd=gateware_dir, check=True)
+    return best, results
+
+# Build Report -------------------------------------------------------------------------------------
+
+# Clock nets of each clock domain, as named by nextpnr.
+DOMAIN_CLOCKS = {
+    "sys"      : ["sys_clk"],
+    "rf"       : ["rf_clk"],
+    "clk10"    : ["clk10_clk",    "lmk10_clk_out0"],
+    "clk30p72" : ["clk30p72_clk", "lmkrf_clk_out4"],
+}
+
+# Report resources: (nextpnr bel type / yosys cell prefix, source).
+REPORT_RESOURCES = {
+    "lc"  : ("ICESTORM_LC",  "nextpnr"),
+    "lut" : ("SB_LUT4",      "yosys"),
+    "ff"  : ("SB_DFF",       "yosys"),
+    "ebr" : ("ICESTORM_RAM", "nextpnr"),
+    "io"  : ("SB_IO",        "nextpnr"),
+}
+
+NEXTPNR_UTIL_RE = re.compile(r"^Info:\s+(\w+):\s+(\d+)/\s*(\d+)\s+\d+%", re.MULTILINE)
+
+def parse_nextpnr_utilization(log):
+    """{bel type: (used, available)} from a nextpnr log."""
+    return {m.group(1): (int(m.group(2)), int(m.group(3))) for m in NEXTPNR_UTIL_RE.finditer(log)}
+
+def parse_yosys_cells(rpt):
+    """{cell type: count} from the last statistics block of a Yosys log."""
+    cells = {}
+    for line in rpt.splitlines():
+        if "Number of cells" in line or re.match(r"^\s*\d+\s+cells$", line):
+            cells = {}
+        m = re.match(r"^\s+(SB_\w+)\s+(\d+)\s*$", line) or re.match(r"^\s+(\d+)\s+(SB_\w+)\s*$", line)
+        if m:
+            name, count = m.groups() if m.group(1).startswith("SB_") else m.groups()[::-1]
+            cells[name] = int(count)
+    return cells
+
+def build_report(gateware_dir, domains):
+    """
+    Build report from the outputs of a script build (run_build_script or seed_sweep).
+
+    `domains` gives the constrained frequency (Hz) of each clock domain; each domain reports its
+    achieved Fmax and slack, resources their used/available counts.
+    """
+    build_name = get_build_name(parse_build_script(gateware_dir))
+    if not os.path.exists(os.path.join(gateware_dir, f"{build_name}.log")):
+        raise OSError(f"No nextpnr log in {gateware_dir}, build with --build-report --build or --seed-sweep first.")
+    with open(os.path.join(gateware_dir, f"{build_name}.log")) as f:
+        log = f.read()
+    with open(os.path.join(gateware_dir, f"{build_name}.rpt")) as f:
+        rpt = f.read()
+    fmax  = parse_nextpnr_fmax(log)
+    util  = parse_nextpnr_utilization(log)
+    cells = parse_yosys_cells(rpt)
+    git   = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True)
+
+    report = {
+        "build_name"  : build_name,
+        "date"        : time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git"         : git.stdout.strip() or None,
+        "domains"     : {},
+        "utilization" : {},
+    }
+
+    # Timings.
+    for domain, freq in domains.items():
+        constraint = freq / 1e6
+        achieved   = None
+        for clock, (clock_fmax, _) in fmax.items():
+            if any(name in clock for name in DOMAIN_CLOCKS.get(domain, [f"{domain}_clk"])):
+                achieved = clock_fmax if achieved is None else min(achieved, clock_fmax)
+        report["domains"][domain] = {
+            "constraint_mhz" : constraint,
+            "achieved_mhz"   : achieved,
+            "slack_ns"       : None if achieved is None else 1e3/constraint - 1e3/achieved,
+        }
+    slacks = [d["slack_ns"] for d in report["domains"].values() if d["slack_ns"] is not None]
+    report["worst_slack_ns"] = min(slacks, default=None)
+
+    # Utilization (LUT/FF available: one of each per logic cell).
+    lc_available = util.get("ICESTORM_LC", (0, 0))[1]
+    for resource, (name, source) in REPORT_RESOURCES.items():
+        if source == "nextpnr":
+            used, available = util.get(name, (0, 0))
+        else:
+            used      = sum(count for cell, count in cells.items() if cell.startswith(name))
+            available = lc_available
+        report["utilization"][resource] = {"used": used, "available": available}
+
+    return report
+
+def write_build_report(filename, report):
+    with open(filename, "w") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,186 @@
+-- ----------------------------------------------------------------------------
+-- FILE        :	gpsdocfg_tb.vhd
+-- DESCRIPTION :	File driven testbench for gpsdocfg cross-check (xcheck.py).
+--							Each stimulus line holds the status inputs (hex)
+--							followed by the SPI frame bits; each result line
+--							holds the MISO bits sampled on SCLK rising edges
+--							and the configuration outputs (hex).
+-- DATE        :	2025
+-- AUTHOR(s)   :	Lime Microsystems
+-- REVISIONS   :
+-- ----------------------------------------------------------------------------
+
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.std_logic_textio.all;
+use std.textio.all;
+
+-- ----------------------------------------------------------------------------
+-- Entity declaration
+-- ----------------------------------------------------------------------------
+entity gpsdocfg_tb is
+   generic (
+      stimulus_file : string := "stimulus.txt";
+      result_file   : string := "result.txt"
+   );
+end gpsdocfg_tb;
+
+-- ----------------------------------------------------------------------------
+-- Architecture
+-- ----------------------------------------------------------------------------
+architecture tb of gpsdocfg_tb is
+   constant half_period : time := 100 ns;
+
+   signal sdin             : std_logic := '0';
+   signal sclk             : std_logic := '0';
+   signal sen              : std_logic := '1';
+   signal sdout            : std_logic;
+   signal reset            : std_logic := '1';
+
+   signal one_s_error      : std_logic_vector(31 downto 0) := (others => '0');
+   signal ten_s_error      : std_logic_vector(31 downto 0) := (others => '0');
+   signal hundred_s_error  : std_logic_vector(31 downto 0) := (others => '0');
+   signal dac_tuned_val    : std_logic_vector(15 downto 0) := (others => '0');
+   signal accuracy         : std_logic_vector(3 downto 0)  := (others => '0');
+   signal state            : std_logic_vector(3 downto 0)  := (others => '0');
+   signal pps_active       : std_logic_vector(3 downto 0)  := (others => '0');
+   signal dac_init_cap     : std_logic_vector(3 downto 0)  := (others => '0');
+   signal seq              : std_logic_vector(15 downto 0) := (others => '0');
+   signal hist_level       : std_logic_vector(15 downto 0) := (others => '0');
+   signal hist_data        : std_logic_vector(63 downto 0) := (others => '0');
+   signal pps_time         : std_logic_vector(63 downto 0) := (others => '0');
+   signal pps_count        : std_logic_vector(31 downto 0) := (others => '0');
+
+   signal en               : std_logic;
+   signal clk_sel          : std_logic;
+   signal tpulse_sel       : std_logic_vector(1 downto 0);
+   signal rpi_sync_in_dir  : std_logic;
+   signal one_s_target     : std_logic_vector(31 downto 0);
+   signal one_s_tol        : std_logic_vector(15 downto 0);
+   signal ten_s_target     : std_logic_vector(31 downto 0);
+   signal ten_s_tol        : std_logic_vector(15 downto 0);
+   signal hundred_s_target : std_logic_vector(31 downto 0);
+   signal hundred_s_tol    : std_logic_vector(15 downto 0);
+   signal hist_pop         : std_logic;
+   signal dac_init_en      : std_logic;
+   signal dac_init         : std_logic_vector(15 downto 0);
+
+begin
+   -- ---------------------------------------------------------------------------------------------
+   -- Device under test
+   -- ---------------------------------------------------------------------------------------------
+   dut: entity work.gpsdocfg port map (
+      maddress                  => (others => '0'),
+      mimo_en                   => '1',
+      sdin                      => sdin,
+      sclk                      => sclk,
+      sen                       => sen,
+      sdout                     => sdout,
+      lreset                    => reset,
+      mreset                    => reset,
+      oen                       => open,
+      PPS_1S_ERROR_in           => one_s_error,
+      PPS_10S_ERROR_in          => ten_s_error,
+      PPS_100S_ERROR_in         => hundred_s_error,
+      DAC_TUNED_VAL_in          => dac_tuned_val,
+      ACCURACY_in               => accuracy,
+      STATE_in                  => state,
+      TPULSE_ACTIVE_in          => pps_active(0),
+      DAC_INIT_CAP_in           => dac_init_cap(0),
+      SEQ_in                    => seq,
+      HIST_LEVEL_in             => hist_level,
+      HIST_DATA_in              => hist_data,
+      PPS_TIME_in               => pps_time,
+      PPS_CNT_in                => pps_count,
+      IICFG_EN_out              => en,
+      IICFG_CLK_SEL_out         => clk_sel,
+      IICFG_TPULSE_SEL_out      => tpulse_sel,
+      IICFG_RPI_SYNC_IN_DIR_out => rpi_sync_in_dir,
+      IICFG_1S_TARGET_out       => one_s_target,
+      IICFG_1S_TOL_out          => one_s_tol,
+      IICFG_10S_TARGET_out      => ten_s_target,
+      IICFG_10S_TOL_out         => ten_s_tol,
+      IICFG_100S_TARGET_out     => hundred_s_target,
+      IICFG_100S_TOL_out        => hundred_s_tol,
+      IICFG_HIST_POP_out        => hist_pop,
+      IICFG_DAC_INIT_EN_out     => dac_init_en,
+      IICFG_DAC_INIT_out        => dac_init
+   );
+
+   -- ---------------------------------------------------------------------------------------------
+   -- Stimulus
+   -- ---------------------------------------------------------------------------------------------
+   stimulus: process
+      file     fin  : text open read_mode  is stimulus_file;
+      file     fout : text open write_mode is result_file;
+      variable lin  : line;
+      variable lout : line;
+      variable c    : character;
+      variable good : boolean;
+      variable v4   : std_logic_vector(3 downto 0);
+      variable v16  : std_logic_vector(15 downto 0);
+      variable v32  : std_logic_vector(31 downto 0);
+      variable v64  : std_logic_vector(63 downto 0);
+      variable cfg  : std_logic_vector(167 downto 0);
+   begin
+      wait for 4*half_period;
+      reset <= '0';
+      wait for 4*half_period;
+
+      while not endfile(fin) loop
+         -- Status inputs (stable during the frame)
+         readline(fin, lin);
+         hread(lin, v32); one_s_error     <= v32;
+         hread(lin, v32); ten_s_error     <= v32;
+         hread(lin, v32); hundred_s_error <= v32;
+         hread(lin, v16); dac_tuned_val   <= v16;
+         hread(lin, v4);  accuracy        <= v4;
+         hread(lin, v4);  state           <= v4;
+         hread(lin, v4);  pps_active      <= v4;
+         hread(lin, v4);  dac_init_cap    <= v4;
+         hread(lin, v16); seq             <= v16;
+         hread(lin, v16); hist_level      <= v16;
+         hread(lin, v64); hist_data       <= v64;
+         hread(lin, v64); pps_time        <= v64;
+         hread(lin, v32); pps_count       <= v32;
+
+         -- SPI frame (mode 0, MISO sampled just before SCLK rising edges)
+         sen <= '0';
+         wait for half_period;
+         write(lout, character'('M'));
+         loop
+            read(lin, c, good);
+            exit when not good;
+            next when c = ' ';
+            if c = '1' then
+               sdin <= '1';
+            else
+               sdin <= '0';
+            end if;
+            wait for half_period;
+            if sdout = '1' then
+               write(lout, character'('1'));
+            elsif sdout = '0' then
+               write(lout, character'('0'));
+            else
+               write(lout, character'('X'));
+            end if;
+            sclk <= '1';
+            wait for half_period;
+            sclk <= '0';
+         end loop;
+         wait for half_period;
+         sen <= '1';
+         wait for 2*half_period;
+
+         -- Configuration outputs
+         cfg := en & clk_sel & tpulse_sel & rpi_sync_in_dir & hist_pop & dac_init_en & '0' & dac_init &
+                one_s_target & one_s_tol & ten_s_target & ten_s_tol & hundred_s_target & hundred_s_tol;
+         write(lout, character'(' '));
+         hwrite(lout, cfg);
+         writeline(fout, lout);
+      end loop;
+      wait;
+   end process stimulus;
+
+end tb;
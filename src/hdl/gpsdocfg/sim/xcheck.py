@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Cross-check of the migen gpsdocfg implementation against the VHDL one (GHDL).
+
+import os
+import sys
+import random
+import argparse
+import subprocess
+
+from migen import *
+from migen.sim import run_simulation
+
+sdir = os.path.abspath(os.path.dirname(__file__))
+cdir = os.path.join(sdir, "..", "src")
+sys.path.append(cdir)
+
+from gpsdocfg import GPSDOCFG, gpsdocfg_status_layout
+
+# Stimulus -----------------------------------------------------------------------------------------
+
+def inst(address, write=False, burst=False, maddress=0):
+    return (int(write) << 15) | (int(burst) << 14) | (maddress << 5) | address
+
+def word_bits(words):
+    return [(word >> bit) & 1 for word in words for bit in range(15, -1, -1)]
+
+def random_status(rng):
+    return {name: rng.getrandbits(width) for name, width, _ in gpsdocfg_status_layout}
+
+def gen_frames(num=1000, seed=0):
+    """Directed frames (single/burst/back-to-back cycles, other module address) then random ones."""
+    rng    = random.Random(seed)
+    frames = []
+    # Single reads of the whole address space.
+    for address in range(32):
+        frames.append([inst(address), 0])
+    # Single writes and read-backs of the configuration registers.
+    for address in range(10):
+        frames.append([inst(address, write=True), rng.getrandbits(16)])
+        frames.append([inst(address), 0])
+    # Bursts: status record read, configuration write, whole address space read (wrap-around).
+    frames.append([inst(0x0A, burst=True)] + [0] * 8)
+    frames.append([inst(0x01, write=True, burst=True)] + [rng.getrandbits(16) for _ in range(4)])
+    frames.append([inst(0x00, burst=True)] + [0] * 33)
+    # History pop and head read.
+    frames.append([inst(0x13, write=True), 0])
+    frames.append([inst(0x14, burst=True)] + [0] * 4)
+    # Scratch register write/read-back.
+    frames.append([inst(0x18, write=True), 0xA55A])
+    frames.append([inst(0x18), 0])
+    # Warm start DAC value write/read-back.
+    frames.append([inst(0x19, write=True), 0x7123])
+    frames.append([inst(0x19), 0])
+    # PPS timestamp/count read (latched on PPS_TIME0).
+    frames.append([inst(0x1A, burst=True)] + [0] * 6)
+    frames.append([inst(0x1A), 0, inst(0x1F), 0])
+    # Other module address (ignored).
+    frames.append([inst(0x01, write=True, maddress=1), 0x1234])
+    frames.append([inst(0x01, maddress=1), 0])
+    # Back-to-back single cycles in one frame.
+    frames.append([inst(0x0A), 0, inst(0x10), 0, inst(0x03, write=True), 0x5555, inst(0x03), 0])
+    frames = [word_bits(words) for words in frames]
+
+    # Random cycles, possibly truncated.
+    for _ in range(num):
+        words = [inst(
+            address  = rng.randrange(32),
+            write    = rng.random() < 0.3,
+            burst    = rng.random() < 0.3,
+            maddress = 0 if rng.random() < 0.9 else rng.getrandbits(9))]
+        words += [rng.getrandbits(16) for _ in range(rng.randint(1, 4))]
+        bits = word_bits(words)
+        if rng.random() < 0.2:
+            bits = bits[:rng.randint(1, len(bits))]
+        frames.append(bits)
+
+    return [(random_status(rng), bits) for bits in frames]
+
+def write_stimulus(filename, frames):
+    with open(filename, "w") as f:
+        for status, bits in frames:
+            s = status
+            f.write(f"{s['one_s_error']:08X} {s['ten_s_error']:08X} {s['hundred_s_error']:08X} "
+                    f"{s['dac_tuned_val']:04X} {s['accuracy']:X} {s['state']:X} {s['pps_active']:X} "
+                    f"{s['dac_init_cap']:X} {s['seq']:04X} {s['hist_level']:04X} {s['hist_data']:016X} "
+                    f"{s['pps_time']:016X} {s['pps_count']:08X} "
+                    + "".join(str(bit) for bit in bits) + "\n")
+
+# Result Format ------------------------------------------------------------------------------------
+
+def format_result(miso, config):
+    """Same layout as gpsdocfg_tb.vhd: MISO bits then packed configuration outputs (hex)."""
+    c = config
+    value  = (c["en"] << 167) | (c["clk_sel"] << 166) | (c["tpulse_sel"] << 164)
+    value |= (c["rpi_sync_in_dir"] << 163) | (c["hist_pop"] << 162) | (c["dac_init_en"] << 161)
+    value |= (c["dac_init"] << 144)
+    value |= (c["one_s_target"]     << 112) | (c["one_s_tol"]     << 96)
+    value |= (c["ten_s_target"]     <<  64) | (c["ten_s_tol"]     << 48)
+    value |= (c["hundred_s_target"] <<  16) | (c["hundred_s_tol"] <<  0)
+    return "M" + "".join(str(bit) for bit in miso) + f" {value:042X}"
+
+# Native Simulation --------------------------------------------------------------------------------
+
+# Fastest SCLK supported by the native implementation (half period in sys clock cycles): SCLK <=
+# sys_clk_freq/8 (the resynchronization and edge detection latency must fit in a half period).
+SCLK_MIN_HALF_PERIOD = 4
+
+def run_native(frames, half_period=8):
+    """Simulate GPSDOCFG(native=True) with migen, SCLK half period in sys clock cycles."""
+    pads    = Record([("sclk", 1), ("mosi", 1), ("miso", 1), ("ss1", 1)])
+    dut     = GPSDOCFG(pads, native=True)
+    results = []
+
+    def wait(n):
+        for _ in range(n):
+            yield
+
+    def generator():
+        yield pads.ss1.eq(1)
+        yield from wait(4*half_period)
+        for status, bits in frames:
+            for name, value in status.items():
+                yield getattr(dut.status, name).eq(value)
+            yield pads.ss1.eq(0)
+            yield from wait(half_period)
+            miso = []
+            for bit in bits:
+                yield pads.mosi.eq(bit)
+                yield from wait(half_period)
+                miso.append((yield pads.miso))
+                yield pads.sclk.eq(1)
+                yield from wait(half_period)
+                yield pads.sclk.eq(0)
+            yield from wait(half_period)
+            yield pads.ss1.eq(1)
+            yield from wait(2*half_period)
+            config = {}
+            for name, _, _ in dut.config.layout:
+                config[name] = (yield getattr(dut.config, name))
+            results.append(format_result(miso, config))
+
+    run_simulation(dut, generator())
+    return results
+
+# VHDL Simulation ----------------------------------------------------------------------------------
+
+def run_vhdl(stimulus_file, result_file, build_dir):
+    """Run gpsdocfg_tb.vhd with GHDL (same options as GPSDOCFG.add_sources)."""
+    files = [os.path.join(cdir, f) for f in ["mem_package.vhd", "revisions.vhd", "mcfg32wm_fsm.vhd", "gpsdocfg.vhd"]]
+    files.append(os.path.join(sdir, "gpsdocfg_tb.vhd"))
+    opts  = ["-fsynopsys", f"--workdir={build_dir}"]
+    subprocess.run(["ghdl", "-a", *opts, *files],       check=True, cwd=build_dir)
+    subprocess.run(["ghdl", "-e", *opts, "gpsdocfg_tb"], check=True, cwd=build_dir)
+    subprocess.run(["ghdl", "-r", *opts, "gpsdocfg_tb",
+        f"-gstimulus_file={stimulus_file}",
+        f"-gresult_file={result_file}"], check=True, cwd=build_dir)
+    with open(result_file) as f:
+        return [line.strip() for line in f]
+
+# Compare ------------------------------------------------------------------------------------------
+
+def compare(name_a, a, name_b, b):
+    """Print the first mismatching frames and return the number of mismatches."""
+    errors = 0
+    for n, (ra, rb) in enumerate(zip(a, b)):
+        if ra != rb:
+            errors += 1
+            if errors <= 10:
+                print(f"Frame {n} mismatch:\n  {name_a:6}: {ra}\n  {name_b:6}: {rb}")
+    if len(a) != len(b):
+        errors += 1
+        print(f"Frame count mismatch: {name_a}={len(a)}, {name_b}={len(b)}")
+    return errors
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="gpsdocfg migen/VHDL cross-check")
+    parser.add_argument("--frames",      default=1000,  type=int, help="Random frames (after the directed ones)")
+    parser.add_argument("--seed",        default=0,     type=int, help="Random seed")
+    parser.add_argument("--half-period", default=8,     type=int, help="Native SCLK half period (sys clock cycles)")
+    parser.add_argument("--fast-half-period", default=SCLK_MIN_HALF_PERIOD, type=int,
+        help="Native SCLK half period of the fast-SCLK check (default: fastest supported, SCLK = sys_clk_freq/8)")
+    parser.add_argument("--native-only", action="store_true", help="Skip GHDL, only check the fast SCLK against --half-period")
+    parser.add_argument("--build-dir",   default="build/gpsdocfg_xcheck", help="GHDL work/output directory")
+    args = parser.parse_args()
+
+    build_dir = os.path.abspath(args.build_dir)
+    os.makedirs(build_dir, exist_ok=True)
+    stimulus_file = os.path.join(build_dir, "stimulus.txt")
+
+    frames = gen_frames(args.frames, args.seed)
+    write_stimulus(stimulus_file, frames)
+    native = run_native(frames, half_period=args.half_period)
+    with open(os.path.join(build_dir, "native.txt"), "w") as f:
+        f.write("\n".join(native) + "\n")
+
+    errors = 0
+    if args.native_only:
+        reference = ("native", native)
+    else:
+        vhdl      = run_vhdl(stimulus_file, os.path.join(build_dir, "vhdl.txt"), build_dir)
+        errors   += compare("native", native, "vhdl", vhdl)
+        reference = ("vhdl", vhdl)
+
+    # Fast SCLK: the native implementation oversamples SCLK, results must not depend on its rate
+    # down to the fastest supported one.
+    fast    = run_native(frames, half_period=args.fast_half_period)
+    errors += compare("fast", fast, *reference)
+    print(f"{len(frames)} frames (fast SCLK: half period {args.fast_half_period}), {errors} mismatch(es).")
+    sys.exit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
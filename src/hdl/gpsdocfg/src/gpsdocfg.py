@@ -7,6 +7,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from migen import *
+from migen.genlib.cdc import MultiReg
 
 from litex.gen import *
 
@@ -25,6 +26,9 @@ gpsdocfg_config_layout = [
     ("ten_s_tol",        16, DIR_M_TO_S), # Tolerance for 10-second interval.
     ("hundred_s_target", 32, DIR_M_TO_S), # Target value for 100-second interval.
     ("hundred_s_tol",    16, DIR_M_TO_S), # Tolerance for 100-second interval.
+    ("hist_pop",          1, DIR_M_TO_S), # History FIFO pop (toggles on each pop request).
+    ("dac_init_en",       1, DIR_M_TO_S), # Warm start enable.
+    ("dac_init",         16, DIR_M_TO_S), # Warm start initial DAC value.
 ]
 
 gpsdocfg_status_layout = [
@@ -35,12 +39,24 @@ gpsdocfg_status_layout = [
     ("accuracy",          4, DIR_M_TO_S), # Accuracy status.
     ("state",             4, DIR_M_TO_S), # Current state.
     ("pps_active",        1, DIR_M_TO_S), # PPS active status.
+    ("dac_init_cap",      1, DIR_M_TO_S), # Warm start (DAC_INIT) supported by the core.
+    ("seq",              16, DIR_M_TO_S), # Sample sequence counter.
+    ("hist_level",       16, DIR_M_TO_S), # History FIFO level.
+    ("hist_data",        64, DIR_M_TO_S), # History FIFO head entry.
+    ("pps_time",         64, DIR_M_TO_S), # rf clock counter latched on the last PPS.
+    ("pps_count",        32, DIR_M_TO_S), # rf clock cycles between the last two PPS.
 ]
 
+# Configuration memory reset values (mem() in gpsdocfg.vhd) and DAC_INIT reset value.
+gpsdocfg_mem_defaults     = [0x0000, 0xC000, 0x01D4, 0x0003, 0x8000, 0x124F, 0x0022, 0x0000, 0xB71B, 0x0164]
+gpsdocfg_dac_init_default = 0x8000
+
 # GPSDO CFG ----------------------------------------------------------------------------------------
 
 class GPSDOCFG(LiteXModule):
-    def __init__(self, spi_pads):
+    def __init__(self, spi_pads, native=False):
+        self.native = native
+
         # Config.
         self.config = Record(gpsdocfg_config_layout)
         # Status.
@@ -48,6 +64,12 @@ class GPSDOCFG(LiteXModule):
 
         # # #
 
+        # Native.
+        # -------
+        if native:
+            self.add_native(spi_pads)
+            return
+
         # Instance.
         # ---------
         self.specials += Instance("gpsdocfg",
@@ -74,6 +96,12 @@ class GPSDOCFG(LiteXModule):
             i_ACCURACY_in               = self.status.accuracy,
             i_STATE_in                  = self.status.state,
             i_TPULSE_ACTIVE_in          = self.status.pps_active,
+            i_DAC_INIT_CAP_in           = self.status.dac_init_cap,
+            i_SEQ_in                    = self.status.seq,
+            i_HIST_LEVEL_in             = self.status.hist_level,
+            i_HIST_DATA_in              = self.status.hist_data,
+            i_PPS_TIME_in               = self.status.pps_time,
+            i_PPS_CNT_in                = self.status.pps_count,
 
             # Outputs.
             o_IICFG_EN_out              = self.config.en,
@@ -85,10 +113,185 @@ class GPSDOCFG(LiteXModule):
             o_IICFG_10S_TARGET_out      = self.config.ten_s_target,
             o_IICFG_10S_TOL_out         = self.config.ten_s_tol,
             o_IICFG_100S_TARGET_out     = self.config.hundred_s_target,
-            o_IICFG_100S_TOL_out        = self.config.hundred_s_tol
+            o_IICFG_100S_TOL_out        = self.config.hundred_s_tol,
+            o_IICFG_HIST_POP_out        = self.config.hist_pop,
+            o_IICFG_DAC_INIT_EN_out     = self.config.dac_init_en,
+            o_IICFG_DAC_INIT_out        = self.config.dac_init,
         )
 
+    def add_native(self, spi_pads):
+        """
+        migen implementation of the gpsdocfg SPI slave, for pure-Python simulation.
+
+        Same protocol and register map as gpsdocfg.vhd/mcfg32wm_fsm.vhd, but running in the sys
+        clock domain: SCLK/MOSI/SEN are resynchronized and SCLK edges detected, so SCLK must stay
+        at or below sys_clk_freq/8 (750kHz at the default 6MHz sys clock).
+        """
+        # SPI Resynchronization.
+        sclk      = Signal()
+        sclk_d    = Signal()
+        sclk_rise = Signal()
+        sclk_fall = Signal()
+        sdin      = Signal()
+        sen       = Signal(reset=1)
+        self.specials += [
+            MultiReg(spi_pads.sclk, sclk),
+            MultiReg(spi_pads.mosi, sdin),
+            MultiReg(spi_pads.ss1,  sen, reset=1),
+        ]
+        self.sync += sclk_d.eq(sclk)
+        self.comb += [
+            sclk_rise.eq( sclk & ~sclk_d),
+            sclk_fall.eq(~sclk &  sclk_d),
+        ]
+
+        # FSM (mcfg32wm_fsm: s0-s15 instruction, s16-s31 data, s32 read end).
+        inst     = Signal(16) # Instruction register.
+        din      = Signal(16) # Data input register.
+        dout     = Signal(16) # Data output register.
+        count    = Signal(4)  # Bits of current instruction/data word.
+        data     = Signal()   # Data phase (s16-s31).
+        tail     = Signal()   # Read cycle end (s32).
+        selected = Signal()
+        read     = Signal()
+        oe       = Signal()
+        reg      = inst[:5]
+        self.comb += [
+            selected.eq(inst[5:14] == 0), # maddress hard wired to 0, mimo_en to 1.
+            read.eq(data & selected & ~inst[15]),
+            oe.eq(read | tail),
+            spi_pads.miso.eq(dout[15] & oe),
+        ]
+
+        # Configuration memory.
+        mem      = [Signal(16, reset=value) for value in gpsdocfg_mem_defaults]
+        hist_pop = Signal()
+        scratch  = Signal(16)
+        dac_init = Signal(16, reset=gpsdocfg_dac_init_default)
+        self.sync += [
+            If(sen,
+                count.eq(0),
+                data.eq(0),
+                tail.eq(0),
+            ).Elif(sclk_rise,
+                tail.eq(0),
+                count.eq(count + 1),
+                # Instruction.
+                If(~data,
+                    inst.eq(Cat(sdin, inst[:15])),
+                    If(count == 15, data.eq(1))
+                # Data.
+                ).Else(
+                    din.eq(Cat(sdin, din[:15])),
+                    If(count == 15,
+                        If(selected & inst[15],
+                            # Any write to HIST_LEVEL pops the history FIFO head.
+                            If(reg == 0x13,
+                                hist_pop.eq(~hist_pop)
+                            ).Elif(reg == 0x18,
+                                scratch.eq(Cat(sdin, din[:15]))
+                            ).Elif(reg == 0x19,
+                                dac_init.eq(Cat(sdin, din[:15]))
+                            ).Elif(reg < len(mem),
+                                Array(mem)[reg].eq(Cat(sdin, din[:15]))
+                            )
+                        ),
+                        # Burst cycle: continue with next data word at incremented address.
+                        If(selected & inst[14],
+                            inst[:5].eq(inst[:5] + 1)
+                        ).Else(
+                            data.eq(0),
+                            tail.eq(selected & ~inst[15]),
+                        )
+                    )
+                )
+            )
+        ]
+
+        # Data output register (loaded/shifted on SCLK falling edges).
+        snap_1s_error   = Signal(32)
+        snap_10s_error  = Signal(32)
+        snap_100s_error = Signal(32)
+        snap_dac        = Signal(16)
+        snap_status     = Signal(16)
+        snap_hist       = Signal(64)
+        snap_pps_time   = Signal(64)
+        snap_pps_count  = Signal(32)
+        status          = self.status
+        self.sync += If(~sen & sclk_fall & read,
+            If(count == 0,
+                Case(reg, {
+                    # Reading PPS_1S_ERR_L latches the whole status record, 0x0B-0x11 return the snapshot.
+                    0x0A : [
+                        dout.eq(status.one_s_error[:16]),
+                        snap_1s_error.eq(status.one_s_error),
+                        snap_10s_error.eq(status.ten_s_error),
+                        snap_100s_error.eq(status.hundred_s_error),
+                        snap_dac.eq(status.dac_tuned_val),
+                        snap_status.eq(Cat(status.state, status.accuracy, status.pps_active, status.dac_init_cap)),
+                    ],
+                    0x0B : dout.eq(snap_1s_error[16:]),
+                    0x0C : dout.eq(snap_10s_error[:16]),
+                    0x0D : dout.eq(snap_10s_error[16:]),
+                    0x0E : dout.eq(snap_100s_error[:16]),
+                    0x0F : dout.eq(snap_100s_error[16:]),
+                    0x10 : dout.eq(snap_dac),
+                    0x11 : dout.eq(snap_status),
+                    0x12 : dout.eq(status.seq), # Live, not latched.
+                    0x13 : dout.eq(status.hist_level),
+                    # Reading HIST_DATA0 latches the FIFO head entry, 0x15-0x17 return the snapshot.
+                    0x14 : [
+                        dout.eq(status.hist_data[:16]),
+                        snap_hist.eq(status.hist_data),
+                    ],
+                    0x15 : dout.eq(snap_hist[16:32]),
+                    0x16 : dout.eq(snap_hist[32:48]),
+                    0x17 : dout.eq(snap_hist[48:64]),
+                    0x18 : dout.eq(scratch),
+                    0x19 : dout.eq(dac_init),
+                    # Reading PPS_TIME0 latches the PPS timestamp and count, 0x1B-0x1F return the snapshot.
+                    0x1A : [
+                        dout.eq(status.pps_time[:16]),
+                        snap_pps_time.eq(status.pps_time),
+                        snap_pps_count.eq(status.pps_count),
+                    ],
+                    0x1B : dout.eq(snap_pps_time[16:32]),
+                    0x1C : dout.eq(snap_pps_time[32:48]),
+                    0x1D : dout.eq(snap_pps_time[48:64]),
+                    0x1E : dout.eq(snap_pps_count[:16]),
+                    0x1F : dout.eq(snap_pps_count[16:]),
+                    "default" : If(reg < len(mem),
+                        dout.eq(Array(mem)[reg])
+                    ).Else(
+                        dout.eq(0) # Unmapped (reachable in burst mode).
+                    )
+                })
+            ).Else(
+                dout.eq(Cat(dout[15], dout[:15]))
+            )
+        )
+
+        # Decoding logic.
+        self.comb += [
+            self.config.en.eq(mem[0][0]),
+            self.config.clk_sel.eq(mem[0][1]),
+            self.config.tpulse_sel.eq(mem[0][2:4]),
+            self.config.rpi_sync_in_dir.eq(mem[0][4]),
+            self.config.dac_init_en.eq(mem[0][5]),
+            self.config.dac_init.eq(dac_init),
+            self.config.one_s_target.eq(Cat(mem[1], mem[2])),
+            self.config.one_s_tol.eq(mem[3]),
+            self.config.ten_s_target.eq(Cat(mem[4], mem[5])),
+            self.config.ten_s_tol.eq(mem[6]),
+            self.config.hundred_s_target.eq(Cat(mem[7], mem[8])),
+            self.config.hundred_s_tol.eq(mem[9]),
+            self.config.hist_pop.eq(hist_pop),
+        ]
+
     def add_sources(self):
+        if self.native:
+            return
+
         from litex.gen import LiteXContext
 
         cdir = os.path.abspath(os.path.dirname(__file__))
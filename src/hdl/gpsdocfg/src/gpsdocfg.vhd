@@ -42,6 +42,12 @@ entity gpsdocfg is
       ACCURACY_in               : in  std_logic_vector(3 downto 0);
       STATE_in                  : in  std_logic_vector(3 downto 0);
       TPULSE_ACTIVE_in          : in  std_logic;
+      DAC_INIT_CAP_in           : in  std_logic;
+      SEQ_in                    : in  std_logic_vector(15 downto 0);
+      HIST_LEVEL_in             : in  std_logic_vector(15 downto 0);
+      HIST_DATA_in              : in  std_logic_vector(63 downto 0);
+      PPS_TIME_in               : in  std_logic_vector(63 downto 0);
+      PPS_CNT_in                : in  std_logic_vector(31 downto 0);
 
       -- Outputs (formerly in t_FROM_GPSDOCFG)
       IICFG_EN_out              : out std_logic;
@@ -53,7 +59,10 @@ entity gpsdocfg is
       IICFG_10S_TARGET_out      : out std_logic_vector(31 downto 0);
       IICFG_10S_TOL_out         : out std_logic_vector(15 downto 0);
       IICFG_100S_TARGET_out     : out std_logic_vector(31 downto 0);
-      IICFG_100S_TOL_out        : out std_logic_vector(15 downto 0)
+      IICFG_100S_TOL_out        : out std_logic_vector(15 downto 0);
+      IICFG_HIST_POP_out        : out std_logic;
+      IICFG_DAC_INIT_EN_out     : out std_logic;
+      IICFG_DAC_INIT_out        : out std_logic_vector(15 downto 0)
    );
 end gpsdocfg;
 
@@ -63,12 +72,32 @@ end gpsdocfg;
 architecture arch of gpsdocfg is
    signal inst_reg: std_logic_vector(15 downto 0);    -- Instruction register
    signal inst_reg_en: std_logic;
+   signal inst_reg_inc: std_logic;                    -- Burst address increment
    signal din_reg: std_logic_vector(15 downto 0);     -- Data in register
    signal din_reg_en: std_logic;
 
    signal dout_reg: std_logic_vector(15 downto 0);    -- Data out register
    signal dout_reg_sen, dout_reg_len: std_logic;
 
+   -- Status record snapshot, latched when PPS_1S_ERR_L is read
+   signal snap_1s_error   : std_logic_vector(31 downto 0);
+   signal snap_10s_error  : std_logic_vector(31 downto 0);
+   signal snap_100s_error : std_logic_vector(31 downto 0);
+   signal snap_dac        : std_logic_vector(15 downto 0);
+   signal snap_status     : std_logic_vector(15 downto 0);
+
+   -- History FIFO head snapshot, latched when HIST_DATA0 is read
+   signal snap_hist       : std_logic_vector(63 downto 0);
+   -- PPS timestamp/count snapshot, latched when PPS_TIME0 is read
+   signal snap_pps_time   : std_logic_vector(63 downto 0);
+   signal snap_pps_cnt    : std_logic_vector(31 downto 0);
+   -- History FIFO pop request, toggled on each HIST_LEVEL write
+   signal hist_pop        : std_logic;
+   -- Scratch register (SPI link test, no side effect)
+   signal scratch         : std_logic_vector(15 downto 0);
+   -- Warm start initial DAC value
+   signal dac_init        : std_logic_vector(15 downto 0);
+
    signal mem: marray10x16 := (  0 => x"0000",
                                  1 => x"C000",
                                  2 => x"01D4",
@@ -100,6 +129,7 @@ architecture arch of gpsdocfg is
          dout_reg_sen : out std_logic;                    -- Data out register shift enable
          dout_reg_len : out std_logic;                    -- Data out register load enable
          mem_we       : out std_logic;                    -- Memory write enable
+         inst_reg_inc : out std_logic;                    -- Instruction register address increment (burst)
          oe           : out std_logic                     -- Output enable
       );
    end component;
@@ -131,7 +161,7 @@ begin
    fsm: mcfg32wm_fsm port map(
       address => maddress, mimo_en => mimo_en, inst_reg => inst_reg, sclk => sclk, sen => sen, reset => lreset,
       inst_reg_en => inst_reg_en, din_reg_en => din_reg_en, dout_reg_sen => dout_reg_sen,
-      dout_reg_len => dout_reg_len, mem_we => mem_we, oe => oe);
+      dout_reg_len => dout_reg_len, mem_we => mem_we, inst_reg_inc => inst_reg_inc, oe => oe);
 
    -- ---------------------------------------------------------------------------------------------
    -- Instruction register
@@ -147,6 +177,9 @@ begin
                inst_reg(i) <= inst_reg(i-1);
             end loop;
             inst_reg(0) <= sdin;
+         -- Burst mode: move to the next register address
+         elsif inst_reg_inc = '1' then
+            inst_reg(4 downto 0) <= std_logic_vector(unsigned(inst_reg(4 downto 0)) + 1);
          end if;
       end if;
    end process inst_reg_proc;
@@ -176,7 +209,15 @@ begin
       variable i: integer;
    begin
       if lreset = '1' then
-         dout_reg <= (others => '0');
+         dout_reg        <= (others => '0');
+         snap_1s_error   <= (others => '0');
+         snap_10s_error  <= (others => '0');
+         snap_100s_error <= (others => '0');
+         snap_dac        <= (others => '0');
+         snap_status     <= (others => '0');
+         snap_hist       <= (others => '0');
+         snap_pps_time   <= (others => '0');
+         snap_pps_cnt    <= (others => '0');
       elsif sclk'event and sclk = '0' then
          -- Shift operation
          if dout_reg_sen = '1' then
@@ -188,15 +229,45 @@ begin
          elsif dout_reg_len = '1' then
             case inst_reg(4 downto 0) is  -- mux read-only outputs
                --when "00001" => dout_reg <= (15 downto 8 => '0') to_gpsdocfg.BOM_VER & to_gpsdocfg.HW_VER;
-               when "01010" => dout_reg <= PPS_1S_ERROR_in(15 downto  0);   --adr = 25
-               when "01011" => dout_reg <= PPS_1S_ERROR_in(31 downto 16);   --adr = 26
-               when "01100" => dout_reg <= PPS_10S_ERROR_in(15 downto 0);   --adr = 27
-               when "01101" => dout_reg <= PPS_10S_ERROR_in(31 downto 16);  --adr = 28
-               when "01110" => dout_reg <= PPS_100S_ERROR_in(15 downto 0);  --adr = 29
-               when "01111" => dout_reg <= PPS_100S_ERROR_in(31 downto 16); --adr = 30
-               when "10000" => dout_reg <= DAC_TUNED_VAL_in;
-               when "10001" => dout_reg <= (15 downto 9 => '0') & TPULSE_ACTIVE_in & ACCURACY_in & STATE_in;
-               when others  => dout_reg <= mem(to_integer(unsigned(inst_reg(4 downto 0))));
+               -- Reading PPS_1S_ERR_L latches the whole status record, 0x0B-0x11 return the snapshot
+               when "01010" => dout_reg        <= PPS_1S_ERROR_in(15 downto  0);   --adr = 25
+                               snap_1s_error   <= PPS_1S_ERROR_in;
+                               snap_10s_error  <= PPS_10S_ERROR_in;
+                               snap_100s_error <= PPS_100S_ERROR_in;
+                               snap_dac        <= DAC_TUNED_VAL_in;
+                               snap_status     <= (15 downto 10 => '0') & DAC_INIT_CAP_in & TPULSE_ACTIVE_in & ACCURACY_in & STATE_in;
+               when "01011" => dout_reg <= snap_1s_error(31 downto 16);     --adr = 26
+               when "01100" => dout_reg <= snap_10s_error(15 downto 0);     --adr = 27
+               when "01101" => dout_reg <= snap_10s_error(31 downto 16);    --adr = 28
+               when "01110" => dout_reg <= snap_100s_error(15 downto 0);    --adr = 29
+               when "01111" => dout_reg <= snap_100s_error(31 downto 16);   --adr = 30
+               when "10000" => dout_reg <= snap_dac;
+               when "10001" => dout_reg <= snap_status;
+               when "10010" => dout_reg <= SEQ_in;                         -- Live, not latched
+               when "10011" => dout_reg <= HIST_LEVEL_in;
+               -- Reading HIST_DATA0 latches the FIFO head entry, 0x15-0x17 return the snapshot
+               when "10100" => dout_reg  <= HIST_DATA_in(15 downto 0);
+                               snap_hist <= HIST_DATA_in;
+               when "10101" => dout_reg <= snap_hist(31 downto 16);
+               when "10110" => dout_reg <= snap_hist(47 downto 32);
+               when "10111" => dout_reg <= snap_hist(63 downto 48);
+               when "11000" => dout_reg <= scratch;
+               when "11001" => dout_reg <= dac_init;
+               -- Reading PPS_TIME0 latches the PPS timestamp and count, 0x1B-0x1F return the snapshot
+               when "11010" => dout_reg      <= PPS_TIME_in(15 downto 0);
+                               snap_pps_time <= PPS_TIME_in;
+                               snap_pps_cnt  <= PPS_CNT_in;
+               when "11011" => dout_reg <= snap_pps_time(31 downto 16);
+               when "11100" => dout_reg <= snap_pps_time(47 downto 32);
+               when "11101" => dout_reg <= snap_pps_time(63 downto 48);
+               when "11110" => dout_reg <= snap_pps_cnt(15 downto 0);
+               when "11111" => dout_reg <= snap_pps_cnt(31 downto 16);
+               when others  =>
+                  if to_integer(unsigned(inst_reg(4 downto 0))) <= mem'high then
+                     dout_reg <= mem(to_integer(unsigned(inst_reg(4 downto 0))));
+                  else
+                     dout_reg <= (others => '0'); -- Unmapped (reachable in burst mode)
+                  end if;
             end case;
          end if;
       end if;
@@ -224,9 +295,18 @@ begin
          mem(7)   <= x"0000"; --  0 free, IICFG_100S_TARGET[15: 0]
          mem(8)   <= x"B71B"; --  0 free, IICFG_100S_TARGET[31:16]
          mem(9)   <= x"0164"; --  0 free, IICFG_100S_TOL[15: 0]
+         hist_pop <= '0';
+         scratch  <= (others => '0');
+         dac_init <= x"8000";
 
       elsif sclk'event and sclk = '1' then
-         if mem_we = '1' then
+         if mem_we = '1' and inst_reg(4 downto 0) = "10011" then
+            hist_pop <= not hist_pop; -- Any write to HIST_LEVEL pops the history FIFO head
+         elsif mem_we = '1' and inst_reg(4 downto 0) = "11000" then
+            scratch  <= din_reg(14 downto 0) & sdin;
+         elsif mem_we = '1' and inst_reg(4 downto 0) = "11001" then
+            dac_init <= din_reg(14 downto 0) & sdin;
+         elsif mem_we = '1' and to_integer(unsigned(inst_reg(4 downto 0))) <= mem'high then
             mem(to_integer(unsigned(inst_reg(4 downto 0)))) <= din_reg(14 downto 0) & sdin;
          end if;
 
@@ -247,11 +327,14 @@ begin
    IICFG_CLK_SEL_out         <= mem(0)(1);
    IICFG_TPULSE_SEL_out      <= mem(0)(3 downto 2);
    IICFG_RPI_SYNC_IN_DIR_out <= mem(0)(4);
+   IICFG_DAC_INIT_EN_out     <= mem(0)(5);
+   IICFG_DAC_INIT_out        <= dac_init;
    IICFG_1S_TARGET_out       <= mem(2) & mem(1);
    IICFG_1S_TOL_out          <= mem(3);
    IICFG_10S_TARGET_out      <= mem(5) & mem(4);
    IICFG_10S_TOL_out         <= mem(6);
    IICFG_100S_TARGET_out     <= mem(8) & mem(7);
    IICFG_100S_TOL_out        <= mem(9);
+   IICFG_HIST_POP_out        <= hist_pop;
 
 end arch;
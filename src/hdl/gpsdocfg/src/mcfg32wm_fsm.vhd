@@ -2,6 +2,9 @@
 -- FILE        :	mcfg32wm_fsm.vhd
 -- DESCRIPTION :	Finite State Machine for serial interface
 --							addresses 32 words, with MIMO enable.
+--							Instruction bit 14 selects burst mode: data words
+--							keep following the instruction with an
+--							auto-incrementing address until sen goes high.
 -- DATE        :	Mar 22, 2013
 -- AUTHOR(s)   :	Lime Microsystems
 -- REVISIONS   :
@@ -26,6 +29,7 @@ entity mcfg32wm_fsm is
 		dout_reg_sen : out std_logic;			         -- Data out register shift enable
 		dout_reg_len : out std_logic;			         -- Data out register load enable
 		mem_we       : out std_logic;				     -- Memory write enable
+		inst_reg_inc : out std_logic;				     -- Instruction register address increment (burst)
 		oe           : out std_logic				     -- Output enable
 	);
 end mcfg32wm_fsm;
@@ -87,6 +91,8 @@ begin
 
 	state_machine: process (state, sen, inst_reg, address, mimo_en)
 	begin
+		-- Only asserted at the end of a burst data word
+		inst_reg_inc <= '0';
 		case state is	
 			when s0 =>
 				inst_reg_en <= not sen; 
@@ -234,13 +240,13 @@ begin
 			when s16 =>
 				-- Instruction register loaded
 				inst_reg_en <= '0';
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '1';
@@ -257,13 +263,13 @@ begin
 			when s17 =>
 				-- 1 data bit in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -280,13 +286,13 @@ begin
 			when s18 =>
 				-- 2 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -303,13 +309,13 @@ begin
 			when s19 =>
 				-- 3 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -326,13 +332,13 @@ begin
 			when s20 =>
 				-- 4 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -349,13 +355,13 @@ begin
 			when s21 =>
 				-- 5 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -372,13 +378,13 @@ begin
 			when s22 =>
 				-- 6 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -395,13 +401,13 @@ begin
 			when s23 =>
 				-- 7 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -418,13 +424,13 @@ begin
 			when s24 =>
 				-- 8 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -441,13 +447,13 @@ begin
 			when s25 =>
 				-- 9 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -464,13 +470,13 @@ begin
 			when s26 =>
 				-- 10 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -487,13 +493,13 @@ begin
 			when s27 =>
 				-- 11 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -510,13 +516,13 @@ begin
 			when s28 =>
 				-- 12 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -533,13 +539,13 @@ begin
 			when s29 =>
 				-- 13 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -556,13 +562,13 @@ begin
 			when s30 =>
 				-- 14 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -579,13 +585,13 @@ begin
 			when s31 =>
 				-- 15 data bits in/out
 				inst_reg_en <= '0';	
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					din_reg_en <= '1';
 					dout_reg_sen <= '0';
 					dout_reg_len <= '0';
 					mem_we <= '1';--//--buvo 0
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					din_reg_en <= '0';
 					dout_reg_sen <= '1';
 					dout_reg_len <= '0';
@@ -598,18 +604,24 @@ begin
 					mem_we <= '0';
 					oe <= '0';
 				end if;
-				next_state <= s32;
+				-- Burst cycle: continue with next data word at incremented address
+				if inst_reg(14) = '1' and inst_reg(13 downto 5) = address(8 downto 0) and mimo_en = '1' then
+					inst_reg_inc <= '1';
+					next_state <= s16;
+				else
+					next_state <= s32;
+				end if;
 				--next_state <= s0;
 			when s32 =>
 				-- 16 data bits in/out
 				inst_reg_en <= not sen; --'1'; 
 				din_reg_en <= '0';
 				dout_reg_len <= '0';
-				if    inst_reg(14 downto 5) = address and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
+				if    inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '1' and mimo_en = '1' then -- Write cycle
 					mem_we <= '0';--//--buvo 1
 					dout_reg_sen <= '0';
 					oe <= '0';
-				elsif inst_reg(14 downto 5) = address and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
+				elsif inst_reg(13 downto 5) = address(8 downto 0) and inst_reg(15) = '0' and mimo_en = '1' then -- Read cycle
 					mem_we <= '0';
 					dout_reg_sen <= '0'; --0
 					oe <= '1';
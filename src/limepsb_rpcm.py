@@ -32,6 +32,9 @@ from litex.soc.cores.clock import *
 from litex.soc.cores.spi import SPIMaster
 
 from limepsb_rpcm_platform import Platform
+from vhd2v_cache import enable_vhd2v_cache, VHD2V_CACHE_DIR
+from build_utils import run_build_script, seed_sweep, build_report, write_build_report
+from pps_events import PPSEvents
 
 from hdl.gpsdocfg.src.gpsdocfg import GPSDOCFG
 
@@ -83,7 +86,11 @@ class _CRG(LiteXModule):
 
 # BaseSoC ------------------------------------------------------------------------------------------
 class BaseSoC(SoCMini):
-    def __init__(self, sys_clk_freq=6e6, **kwargs):
+    def __init__(self, sys_clk_freq=6e6, hist_depth=256, with_data_ready=False, with_native_gpsdocfg=False,
+        dac_update_mode="continuous", dac_spi_freq=1e6, dac_spi_mode=2, pps_status_latency=100e-3, **kwargs):
+        assert dac_update_mode in ["continuous", "change"]
+        assert dac_spi_mode in [0, 1, 2, 3]
+        assert dac_spi_freq <= sys_clk_freq/2
         platform = Platform()
 
         # SoCMini ----------------------------------------------------------------------------------
@@ -142,7 +149,7 @@ class BaseSoC(SoCMini):
 
         # GPSDOCFG ---------------------------------------------------------------------------------
 
-        self.gpsdocfg = GPSDOCFG(spi_pads=rpi_spi1_pads)
+        self.gpsdocfg = GPSDOCFG(spi_pads=rpi_spi1_pads, native=with_native_gpsdocfg)
         self.gpsdocfg.add_sources()
 
         # TDD Redirection --------------------------------------------------------------------------
@@ -217,6 +224,9 @@ class BaseSoC(SoCMini):
 
         self.ppsdo = ppsdo = PPSDO()
         self.ppsdo.add_sources()
+
+        dac_tuned_val = Signal(16) # DAC tuned value (with warm start offset, see below).
+
         self.comb += [
             # Control.
             ppsdo.enable.eq(self.gpsdocfg.config.en),
@@ -224,15 +234,118 @@ class BaseSoC(SoCMini):
             # PPS.
             ppsdo.pps.eq(pps),
 
-            # UART.
+            # UART (TX on FPGA_GPIO0 unless used for Data Ready).
             ppsdo.uart.rx.eq(uart_pads.rx),
-            uart_pads.tx.eq(ppsdo.uart.tx),
 
             # Core Config.
-            self.gpsdocfg.config.connect(ppsdo.config, omit={"en", "clk_sel", "tpulse_sel", "rpi_sync_in_dir"}),
+            self.gpsdocfg.config.connect(ppsdo.config, omit={"en", "clk_sel", "tpulse_sel", "rpi_sync_in_dir", "hist_pop", "dac_init_en", "dac_init"}),
 
-            # Core Status.
-            self.ppsdo.status.connect(self.gpsdocfg.status),
+            # Core Status (DAC tuned value after warm start offset).
+            self.ppsdo.status.connect(self.gpsdocfg.status, omit={"dac_tuned_val"}),
+            self.gpsdocfg.status.dac_tuned_val.eq(dac_tuned_val),
+            self.gpsdocfg.status.dac_init_cap.eq(1),
+        ]
+
+        # Warm Start -------------------------------------------------------------------------------
+
+        # The PPSDO core has no start-up DAC input: the warm start (CONTROL DAC_INIT_EN, DAC_INIT) is
+        # done on its output instead. Until the core has been enabled for 2 sys cycles (start-up DAC
+        # value loaded), the offset tracks DAC_INIT - core DAC value (0 when DAC_INIT_EN is cleared),
+        # then it is frozen until the next enable. The DAC starts at DAC_INIT and the loop regulates
+        # from there, its corrections being added to DAC_INIT (saturated to the DAC range). The offset
+        # value drives the SPI DAC, DAC_TUNED_VAL and the history.
+        dac_offset      = Signal((17, True))
+        dac_offset_next = Signal((17, True))
+        dac_sum         = Signal((18, True))
+        dac_en_d        = Signal(2)
+        self.comb += [
+            dac_offset_next.eq(Mux(self.gpsdocfg.config.dac_init_en, self.gpsdocfg.config.dac_init - ppsdo.status.dac_tuned_val, 0)),
+            dac_sum.eq(ppsdo.status.dac_tuned_val + Mux(dac_en_d[1], dac_offset, dac_offset_next)),
+            If(dac_sum < 0,
+                dac_tuned_val.eq(0)
+            ).Elif(dac_sum > 0xFFFF,
+                dac_tuned_val.eq(0xFFFF)
+            ).Else(
+                dac_tuned_val.eq(dac_sum[:16])
+            )
+        ]
+        self.sync += [
+            dac_en_d.eq(Cat(self.gpsdocfg.config.en, dac_en_d[0])),
+            If(~dac_en_d[1],
+                dac_offset.eq(dac_offset_next)
+            )
+        ]
+
+        # PPS Events -------------------------------------------------------------------------------
+
+        # Once per PPS, when the core has published the new second's status record (pps_status_latency
+        # after the PPS edge): SEQ increment (the host polls this single register and only reads the
+        # record on change), optional 10us Data Ready pulse on FPGA_GPIO0 (the host waits on a GPIO
+        # edge instead of sleep-polling; shared with the PPSDO UART TX which is then disconnected) and
+        # telemetry history entry (1s error, DAC value, state, accuracy, pps_active) stored in an
+        # EBR-backed FIFO read through gpsdocfg (HIST_DATA0-3) and popped by writing HIST_LEVEL.
+        self.pps_events = pps_events = PPSEvents(
+            pps             = pps,
+            # Entry: HIST_DATA0/1: 1s error, HIST_DATA2: DAC value, HIST_DATA3: STATUS register layout.
+            record          = Cat(
+                ppsdo.status.one_s_error,
+                dac_tuned_val,
+                ppsdo.status.state,
+                ppsdo.status.accuracy,
+                ppsdo.status.pps_active,
+            ),
+            sys_clk_freq    = sys_clk_freq,
+            status_latency  = pps_status_latency,
+            hist_depth      = hist_depth,
+            with_data_ready = with_data_ready,
+        )
+        self.comb += [
+            pps_events.hist_pop.eq(self.gpsdocfg.config.hist_pop),
+            self.gpsdocfg.status.seq.eq(pps_events.seq),
+            self.gpsdocfg.status.hist_level.eq(pps_events.hist_level),
+            self.gpsdocfg.status.hist_data.eq(pps_events.hist_data),
+        ]
+        if with_data_ready:
+            self.comb += uart_pads.tx.eq(pps_events.data_ready)
+        else:
+            self.comb += uart_pads.tx.eq(ppsdo.uart.tx)
+
+        # PPS Timestamp ----------------------------------------------------------------------------
+
+        # Free-running 64-bit rf clock counter latched on each PPS rising edge, along with the rf
+        # cycles elapsed since the previous PPS (32.55ns resolution at 30.72MHz). The latched values
+        # are only updated once per second and cross to sys with a toggle handshake: sys copies them
+        # when the resynchronized toggle changes, so gpsdocfg reads never see a partial update. The
+        # count is 0 on the first PPS after reset (no previous PPS to count from).
+        pps_time_rf      = Signal(64)
+        pps_time_latch   = Signal(64)
+        pps_count_latch  = Signal(32)
+        pps_rf           = Signal()
+        pps_rf_d         = Signal()
+        pps_seen_rf      = Signal()
+        pps_toggle_rf    = Signal()
+        pps_toggle_sys   = Signal()
+        pps_toggle_sys_d = Signal()
+        self.specials += [
+            MultiReg(pps, pps_rf, odomain="rf"),
+            MultiReg(pps_toggle_rf, pps_toggle_sys),
+        ]
+        self.sync.rf += [
+            pps_time_rf.eq(pps_time_rf + 1),
+            pps_rf_d.eq(pps_rf),
+            If(pps_rf & ~pps_rf_d,
+                pps_seen_rf.eq(1),
+                pps_time_latch.eq(pps_time_rf),
+                pps_count_latch.eq(Mux(pps_seen_rf, pps_time_rf - pps_time_latch, 0)),
+                pps_toggle_rf.eq(~pps_toggle_rf),
+            )
+        ]
+        self.sync += [
+            pps_toggle_sys_d.eq(pps_toggle_sys),
+            If(pps_toggle_sys != pps_toggle_sys_d,
+                self.gpsdocfg.status.pps_time.eq(pps_time_latch),
+                self.gpsdocfg.status.pps_count.eq(pps_count_latch),
+            )
         ]
 
         # SPI DAC Control --------------------------------------------------------------------------
@@ -241,19 +354,55 @@ class BaseSoC(SoCMini):
             pads         = None,
             data_width   = 24,
             sys_clk_freq = sys_clk_freq,
-            spi_clk_freq = 1e6,
+            spi_clk_freq = dac_spi_freq,
             with_csr     = False,
         )
-        self.comb += [
+        if dac_update_mode == "continuous":
             # Continuous Update.
-            self.spi_dac.start.eq(1),
+            self.comb += self.spi_dac.start.eq(1)
+        else:
+            # Change-driven Update: a frame is started when dac_tuned_val differs from the last
+            # transferred value (or after reset/re-enable, since the RPI may have written the DAC
+            # directly while disabled). A change is transferred at most one frame after the frame in
+            # progress: latency <= 2 x (24 + 3) SPI clock periods.
+            dac_last    = Signal(16)
+            dac_pending = Signal(reset=1)
+            en_last     = Signal(reset=1)
+            dac_idle    = self.spi_dac.fsm.ongoing("IDLE")
+            self.comb += self.spi_dac.start.eq(dac_pending | (dac_tuned_val != dac_last))
+            self.sync += [
+                en_last.eq(self.gpsdocfg.config.en),
+                If(self.gpsdocfg.config.en & ~en_last,
+                    dac_pending.eq(1)
+                ).Elif(self.spi_dac.start & dac_idle,
+                    dac_pending.eq(0)
+                ),
+                If(self.spi_dac.start & dac_idle,
+                    dac_last.eq(dac_tuned_val)
+                ),
+            ]
+        self.comb += [
             self.spi_dac.length.eq(24),
             # Power-down control bits (PD1 PD0).
             self.spi_dac.mosi[16:18].eq(0b00),
             # 16-bit DAC value.
-            self.spi_dac.mosi[0:16].eq(self.ppsdo.status.dac_tuned_val),
-            # Connect to pads.
-            spi_dac_pads.clk.eq(~spi_dac.pads.clk),
+            self.spi_dac.mosi[0:16].eq(dac_tuned_val),
+        ]
+
+        # SPI mode (CPOL/CPHA): SPIMaster generates mode 0 (MOSI updated on SCLK falling edges, bit
+        # period starting with SCLK low). CPOL inverts SCLK; CPHA inverts it during the transfer
+        # only (launch edge at the start of each bit, the first one with CS_N falling; sample edge in
+        # the middle), keeping the idle level outside. Pads are registered together (glitch-free,
+        # same relative timing).
+        dac_run = self.spi_dac.fsm.ongoing("RUN")
+        dac_clk = {
+            0 : spi_dac.pads.clk,            # CPOL=0, CPHA=0.
+            1 : dac_run & ~spi_dac.pads.clk, # CPOL=0, CPHA=1.
+            2 : ~spi_dac.pads.clk,           # CPOL=1, CPHA=0.
+            3 : ~dac_run | spi_dac.pads.clk, # CPOL=1, CPHA=1.
+        }[dac_spi_mode]
+        self.sync += [
+            spi_dac_pads.clk.eq(dac_clk),
             spi_dac_pads.cs_n.eq(spi_dac.pads.cs_n),
             spi_dac_pads.mosi.eq(spi_dac.pads.mosi),
         ]
@@ -282,16 +431,53 @@ class BaseSoC(SoCMini):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=Platform, description="LiteX SoC on LimePSB RPCM Board.")
-    parser.add_argument("--sys-clk-freq", default=6e6, help="System clock frequency (default: 6MHz)")
+    parser.add_argument("--sys-clk-freq",    default=6e6,         help="System clock frequency (default: 6MHz)")
+    parser.add_argument("--with-data-ready", action="store_true", help="Output Data Ready pulse on FPGA_GPIO0 (replaces PPSDO UART TX)")
+    parser.add_argument("--pps-status-latency", default=100e-3, type=float, help="PPSDO core status update delay after PPS for SEQ/Data Ready/history (default: 100ms)")
+    parser.add_argument("--native-gpsdocfg", action="store_true", help="Use migen gpsdocfg implementation instead of the VHDL one")
+    parser.add_argument("--dac-update-mode", default="continuous", choices=["continuous", "change"], help="SPI DAC update mode: continuous refresh or on dac_tuned_val change")
+    parser.add_argument("--dac-spi-freq",    default=1e6,          help="SPI DAC clock frequency (default: 1MHz, up to sys_clk_freq/2)")
+    parser.add_argument("--dac-spi-mode",    default=2, type=int,  choices=[0, 1, 2, 3], help="SPI DAC mode (CPOL/CPHA, default: 2)")
+    parser.add_argument("--vhd2v-cache-dir",  default=VHD2V_CACHE_DIR, help="VHDL-to-Verilog conversion cache directory")
+    parser.add_argument("--vhd2v-cache-size", default=256, type=int,   help="VHDL-to-Verilog conversion cache size limit (MB)")
+    parser.add_argument("--no-vhd2v-cache",   action="store_true",     help="Always rerun VHDL-to-Verilog conversions")
+    parser.add_argument("--seed-sweep",       default=0,    type=int,    help="Build with N place-and-route seeds and keep the best timing")
+    parser.add_argument("--jobs",             default=None, type=int,    help="Parallel place-and-route jobs for --seed-sweep (default: CPU count)")
+    parser.add_argument("--build-report",     default=None,              help="Write Fmax/utilization build report to JSON file (of this --build/--seed-sweep, or of the previous one)")
     args = parser.parse_args()
 
     # SoC.
     soc = BaseSoC(
-        sys_clk_freq  = int(float(args.sys_clk_freq)),
+        sys_clk_freq         = int(float(args.sys_clk_freq)),
+        with_data_ready      = args.with_data_ready,
+        with_native_gpsdocfg = args.native_gpsdocfg,
+        dac_update_mode      = args.dac_update_mode,
+        dac_spi_freq         = int(float(args.dac_spi_freq)),
+        dac_spi_mode         = args.dac_spi_mode,
+        pps_status_latency   = args.pps_status_latency,
         **soc_core_argdict(args)
     )
+    if not args.no_vhd2v_cache:
+        enable_vhd2v_cache(soc, cache_dir=args.vhd2v_cache_dir, max_size=args.vhd2v_cache_size*1e6)
     builder = Builder(soc, **parser.builder_argdict)
-    builder.build(run=args.build)
+    if args.seed_sweep:
+        builder.build(run=False)
+        seed_sweep(builder.gateware_dir, seeds=range(1, args.seed_sweep + 1), jobs=args.jobs)
+    elif args.build and args.build_report:
+        # Script build keeping the nextpnr log for the report.
+        builder.build(run=False)
+        run_build_script(builder.gateware_dir)
+    else:
+        builder.build(run=args.build)
+
+    # Build report (from the logs of this build, or of the previous one without --build).
+    if args.build_report:
+        write_build_report(args.build_report, build_report(builder.gateware_dir, domains={
+            "sys"      : int(float(args.sys_clk_freq)),
+            "rf"       : 30.72e6,
+            "clk10"    : 10e6,
+            "clk30p72" : 30.72e6,
+        }))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,101 @@
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Per-PPS events of the LimePSB-RPCM GPSDO: sample sequence counter, Data Ready and telemetry history.
+
+from migen import *
+from migen.genlib.cdc  import MultiReg
+from migen.genlib.fifo import SyncFIFOBuffered
+
+from litex.gen import *
+
+# PPS Events ---------------------------------------------------------------------------------------
+
+class PPSEvents(LiteXModule):
+    """
+    Per-PPS events, driven by a one sys cycle `strobe` issued `status_latency` seconds after the
+    rising edge of the resynchronized `pps`.
+
+    The PPSDO core publishes the new second's status record (errors, DAC value, state) some time
+    after the PPS edge (regulation step), even when identical to the previous one (steady state):
+    the strobe is delayed until it is published so that `record` (the 64-bit history entry) and any
+    host read triggered by SEQ or Data Ready see the new second and not the previous one.
+
+    - `seq`: incremented on each strobe.
+    - `data_ready`: 10us pulse on each strobe (with_data_ready).
+    - `hist_*`: EBR-backed FIFO of `record` pushed on each strobe, the oldest entry being dropped
+      when full; the head is popped on each `hist_pop` toggle (gpsdocfg HIST_LEVEL write).
+    """
+    def __init__(self, pps, record, sys_clk_freq, status_latency=100e-3, hist_depth=256, with_data_ready=False):
+        self.strobe     = Signal()
+        self.seq        = Signal(16)
+        self.data_ready = Signal()
+        self.hist_pop   = Signal()
+        self.hist_level = Signal(16)
+        self.hist_data  = Signal(64)
+
+        # # #
+
+        # PPS Strobe.
+        # -----------
+        pps_sys    = Signal()
+        pps_sys_d  = Signal()
+        pps_delay  = max(int(sys_clk_freq*status_latency), 1)
+        pps_timer  = Signal(max=pps_delay + 1)
+        self.specials += MultiReg(pps, pps_sys)
+        self.sync += [
+            pps_sys_d.eq(pps_sys),
+            self.strobe.eq(0),
+            If(pps_sys & ~pps_sys_d,
+                pps_timer.eq(pps_delay)
+            ).Elif(pps_timer != 0,
+                pps_timer.eq(pps_timer - 1),
+                self.strobe.eq(pps_timer == 1),
+            )
+        ]
+
+        # Sample Sequence Counter.
+        # ------------------------
+        self.sync += If(self.strobe, self.seq.eq(self.seq + 1))
+
+        # Data Ready.
+        # -----------
+        if with_data_ready:
+            data_ready_cycles = int(sys_clk_freq*10e-6)
+            data_ready_count  = Signal(max=data_ready_cycles + 1)
+            self.sync += [
+                If(self.strobe,
+                    data_ready_count.eq(data_ready_cycles)
+                ).Elif(data_ready_count != 0,
+                    data_ready_count.eq(data_ready_count - 1)
+                )
+            ]
+            self.comb += self.data_ready.eq(data_ready_count != 0)
+
+        # Telemetry History.
+        # ------------------
+        self.hist = hist = SyncFIFOBuffered(width=64, depth=hist_depth)
+        hist_push  = Signal()
+        hist_pop   = Signal()
+        hist_pop_d = Signal()
+        self.specials += MultiReg(self.hist_pop, hist_pop)
+        self.sync += [
+            hist_pop_d.eq(hist_pop),
+            If(self.strobe,
+                hist_push.eq(1)
+            ).Elif(hist.we,
+                hist_push.eq(0)
+            )
+        ]
+        self.comb += [
+            hist.din.eq(record),
+            hist.we.eq(hist_push & hist.writable),
+            # Pop on host request (pop toggle change) or to make room for a new entry when full.
+            hist.re.eq((hist_pop != hist_pop_d) | (hist_push & ~hist.writable)),
+            self.hist_level.eq(hist.level),
+            self.hist_data.eq(Mux(hist.readable, hist.dout, 0)),
+        ]
@@ -0,0 +1,138 @@
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Content-hash cache for LiteX VHD2VConverter conversions.
+
+import os
+import hashlib
+import shutil
+import functools
+import subprocess
+
+from migen import Instance
+
+from litex.build.vhd2v_converter import VHD2VConverter
+
+# Constants ----------------------------------------------------------------------------------------
+
+VHD2V_CACHE_DIR      = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "limepsb_rpcm", "vhd2v")
+VHD2V_CACHE_MAX_SIZE = 256e6 # Bytes.
+
+# Helpers ------------------------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def ghdl_version():
+    try:
+        s = subprocess.run(["ghdl", "--version"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return ""
+    return s.stdout.splitlines()[0] if s.stdout else ""
+
+def file_digest(filename):
+    with open(filename, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# Cached VHD2V Converter ---------------------------------------------------------------------------
+
+class CachedVHD2VConverter(VHD2VConverter):
+    """
+    VHD2VConverter reusing previous GHDL conversions.
+
+    The converted Verilog is looked up by a hash of what VHD2VConverter.do_finalize would pass to
+    GHDL (options, generics, top entity and instance name), the content of the sources and
+    libraries and the GHDL version, computed before the conversion. On a hit GHDL is not run: the
+    cached file is added to the platform along with the Instance. On a miss the upstream conversion
+    runs and its output is stored; entries are evicted oldest first above `max_size`.
+    """
+    cache_dir      = VHD2V_CACHE_DIR
+    cache_max_size = VHD2V_CACHE_MAX_SIZE
+
+    def cache_entry(self, inst_name, generics):
+        h = hashlib.sha256()
+        for arg in [inst_name, self._top_entity, *self._ghdl_opts, *generics, ghdl_version()]:
+            h.update(str(arg).encode() + b"\0")
+        for filename in self._sources:
+            h.update(file_digest(filename).encode())
+        for work_pkg, filename in self._libraries:
+            h.update(work_pkg.encode() + b"\0" + file_digest(filename).encode())
+        return os.path.join(self.cache_dir, h.hexdigest() + ".v")
+
+    def do_finalize(self):
+        # Platform able to synthesize VHDL: no conversion.
+        if self._platform.support_mixed_language and not self._force_convert:
+            return VHD2VConverter.do_finalize(self)
+
+        # Instance name (suffixed when the core is already instantiated), generics and ports.
+        inst_name = self._top_entity
+        v_list    = [f for f, _, _ in self._platform.sources if self._top_entity in f]
+        if v_list:
+            inst_name += f"_{len(v_list)}"
+        generics = []
+        if self._params:
+            ip_params = {}
+            for k, v in self._params.items():
+                if k.startswith("p_"):
+                    generics.append("-g" + k[2:] + "=" + str(v))
+                else:
+                    ip_params[k] = v
+        else:
+            ip_params = []
+            for item in self._instance.items:
+                if isinstance(item, Instance.Parameter):
+                    generics.append("-g" + item.name + "=" + str(item.value.value))
+                else:
+                    ip_params.append(item)
+
+        if self._build_dir is None:
+            self._build_dir = os.path.join(os.path.abspath(self._platform.output_dir), "vhd2v")
+        verilog_out = os.path.join(self._build_dir, f"{inst_name}.v")
+        entry       = self.cache_entry(inst_name, generics)
+
+        # Miss: upstream conversion, then store its output.
+        if not os.path.exists(entry):
+            VHD2VConverter.do_finalize(self)
+            self.cache_store(entry, verilog_out)
+            return
+
+        # Hit.
+        os.makedirs(self._build_dir, exist_ok=True)
+        shutil.copyfile(entry, verilog_out)
+        os.utime(entry)
+        self._platform.add_source(verilog_out)
+        if self._add_instance:
+            if self._instance:
+                delattr(self, "_instance")
+                self.specials += Instance(inst_name, *ip_params)
+            else:
+                self.specials += Instance(inst_name, **ip_params)
+
+    def cache_store(self, entry, filename):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        shutil.copyfile(filename, tmp)
+        os.replace(tmp, entry)
+
+        # Evict least recently used entries.
+        entries = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith(".v")]
+        entries.sort(key=os.path.getmtime)
+        size = sum(os.path.getsize(f) for f in entries)
+        while size > self.cache_max_size and len(entries) > 1:
+            f = entries.pop(0)
+            size -= os.path.getsize(f)
+            os.remove(f)
+
+def enable_vhd2v_cache(module, cache_dir=VHD2V_CACHE_DIR, max_size=VHD2V_CACHE_MAX_SIZE):
+    """Switch every VHD2VConverter of a module hierarchy (gpsdocfg, PPSDO core...) to the cached one."""
+    converters = 0
+    for name, submodule in module._submodules:
+        if isinstance(submodule, VHD2VConverter):
+            submodule.__class__      = CachedVHD2VConverter
+            submodule.cache_dir      = cache_dir
+            submodule.cache_max_size = max_size
+            converters += 1
+        converters += enable_vhd2v_cache(submodule, cache_dir, max_size)
+    return converters
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# ADEV/MDEV/TDEV analysis of LimePSB-RPCM GPSDO recordings (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import argparse
+
+import numpy as np
+
+from gpsdo_record import load_records
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def errors_to_frequency(errors, clk_freq_mhz=30.72):
+    """Convert 1s PPSDO counter errors (clock cycles per second) to fractional frequency."""
+    return np.asarray(errors, dtype=np.float64) / (clk_freq_mhz * 1e6)
+
+def octave_taus(n):
+    """Octave-spaced averaging factors usable for n fractional-frequency samples (MDEV needs 3m)."""
+    m = 1
+    while 3*m <= n:
+        yield m
+        m *= 2
+
+# Deviation Accumulator ----------------------------------------------------------------------------
+
+class DeviationAccumulator:
+    """
+    Streaming overlapping ADEV/MDEV/TDEV estimator.
+
+    Fractional-frequency chunks are integrated to phase; each chunk is processed with cumulative
+    sums (O(N) per tau) and only the last 3*max(m) phase points are kept between chunks, so
+    arbitrarily long inputs are analyzed in bounded memory.
+    """
+    def __init__(self, ms, tau0=1.0):
+        self.ms        = sorted(ms)
+        self.tau0      = tau0
+        self.phase     = np.zeros(1) # Phase tail (s), x[0] = 0.
+        self.offset    = 0           # Global index of phase[0].
+        self.adev_next = {m: 0   for m in self.ms}
+        self.adev_sum  = {m: 0.0 for m in self.ms}
+        self.adev_n    = {m: 0   for m in self.ms}
+        self.mdev_next = {m: 0   for m in self.ms}
+        self.mdev_sum  = {m: 0.0 for m in self.ms}
+        self.mdev_n    = {m: 0   for m in self.ms}
+
+    def update(self, y):
+        """Add a chunk of fractional-frequency samples."""
+        if len(y) == 0 or not self.ms:
+            return
+        x = np.concatenate([self.phase, self.phase[-1] + np.cumsum(y)*self.tau0])
+        s = np.concatenate([[0.0], np.cumsum(x)])
+        n = len(x)
+        for m in self.ms:
+            # ADEV: phase second differences x[i+2m] - 2x[i+m] + x[i].
+            i = self.adev_next[m] - self.offset
+            if i < n - 2*m:
+                d = x[i + 2*m:] - 2*x[i + m:n - m] + x[i:n - 2*m]
+                self.adev_sum[m]  += np.dot(d, d)
+                self.adev_n[m]    += len(d)
+                self.adev_next[m]  = self.offset + n - 2*m
+            # MDEV: same on m-sample phase sums, from cumulative sum differences.
+            i = self.mdev_next[m] - self.offset
+            if i <= n - 3*m:
+                j = np.arange(i, n - 3*m + 1)
+                d = s[j + 3*m] - 3*s[j + 2*m] + 3*s[j + m] - s[j]
+                self.mdev_sum[m]  += np.dot(d, d)
+                self.mdev_n[m]    += len(d)
+                self.mdev_next[m]  = self.offset + n - 3*m + 1
+        # Keep the phase tail still needed by pending starts.
+        keep         = min(n, 3*self.ms[-1])
+        self.offset += n - keep
+        self.phase   = x[n - keep:]
+
+    def result(self):
+        """Return {m: (tau, adev, mdev, tdev, n)} for every tau with data."""
+        r = {}
+        for m in self.ms:
+            if self.mdev_n[m] == 0:
+                continue
+            tau  = m*self.tau0
+            adev = np.sqrt(self.adev_sum[m] / (2 * tau**2 * self.adev_n[m]))
+            mdev = np.sqrt(self.mdev_sum[m] / (2 * m**2 * tau**2 * self.mdev_n[m]))
+            tdev = tau / np.sqrt(3) * mdev
+            r[m] = (tau, adev, mdev, tdev, self.mdev_n[m])
+        return r
+
+# Analysis -----------------------------------------------------------------------------------------
+
+def deviations(y, ms=None, tau0=1.0, chunk_size=1 << 20):
+    """ADEV/MDEV/TDEV of a fractional-frequency array (NumPy array or memmap), chunk by chunk."""
+    if ms is None:
+        ms = list(octave_taus(len(y)))
+    acc = DeviationAccumulator(ms, tau0)
+    for start in range(0, len(y), chunk_size):
+        acc.update(np.asarray(y[start:start + chunk_size], dtype=np.float64))
+    return acc.result()
+
+def new_samples(records, chunk_size=1 << 20):
+    """
+    Yield (chunk, mask) of the records holding a new PPS sample (SEQ change), chunk by chunk.
+
+    Repeated polls of the same sample are skipped on SEQ, which requires gateware incrementing SEQ
+    on each PPS: with older gateware (SEQ only incremented on status record changes), identical
+    consecutive records are dropped (see recording_gaps()).
+    """
+    last = None
+    for start in range(0, len(records), chunk_size):
+        chunk   = records[start:start + chunk_size]
+        seq     = np.asarray(chunk["seq"])
+        new     = np.empty(len(seq), dtype=bool)
+        new[0]  = seq[0] != last
+        new[1:] = seq[1:] != seq[:-1]
+        last    = seq[-1]
+        yield chunk, new
+
+def recording_deviations(filename, clk_freq_mhz=30.72, ms=None, chunk_size=1 << 20):
+    """ADEV/MDEV/TDEV of the 1s errors of a gpsdo_record recording, one new PPS sample per SEQ change."""
+    records = load_records(filename)
+    if ms is None:
+        ms = list(octave_taus(len(records)))
+    acc = DeviationAccumulator(ms)
+    for chunk, new in new_samples(records, chunk_size):
+        acc.update(errors_to_frequency(chunk["error_1s"][new], clk_freq_mhz))
+    return acc.result()
+
+def recording_gaps(filename, max_interval=1.5, chunk_size=1 << 20):
+    """
+    Number of intervals longer than `max_interval` seconds (record timestamps) between new PPS
+    samples: missed samples (recording stopped, polls too slow or SEQ not incremented on each PPS).
+    """
+    records = load_records(filename)
+    gaps    = 0
+    last    = None
+    for chunk, new in new_samples(records, chunk_size):
+        t = np.asarray(chunk["timestamp"][new])
+        if len(t) == 0:
+            continue
+        if last is not None:
+            t = np.concatenate([[last], t])
+        gaps += int(np.count_nonzero(np.diff(t) > max_interval))
+        last  = t[-1]
+    return gaps
+
+# Main ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="GPSDO ADEV/MDEV/TDEV analysis")
+    parser.add_argument("filename",                                    help="Recording file (from test_gpsdo.py --record)")
+    parser.add_argument("--clk-freq",   default=30.72,   type=float,   help="Clock frequency in MHz (10 or 30.72)")
+    parser.add_argument("--chunk-size", default=1 << 20, type=int,     help="Samples processed per chunk")
+    parser.add_argument("--max-tau",    default=None,    type=int,     help="Largest averaging time (s)")
+    args = parser.parse_args()
+
+    ms = None
+    if args.max_tau is not None:
+        ms = [1 << k for k in range(args.max_tau.bit_length()) if (1 << k) <= args.max_tau]
+    result = recording_deviations(args.filename, args.clk_freq, ms, args.chunk_size)
+    gaps   = recording_gaps(args.filename, chunk_size=args.chunk_size)
+    if gaps:
+        print(f"Warning: {gaps} gaps > 1.5s between new PPS samples (missed samples: recording "
+              f"interrupted, polls too slow or gateware not incrementing SEQ on each PPS).")
+
+    print(f"{'Tau (s)':>10} {'ADEV':>12} {'MDEV':>12} {'TDEV (s)':>12} {'N':>10}")
+    for tau, adev, mdev, tdev, n in result.values():
+        print(f"{tau:10.0f} {adev:12.4e} {mdev:12.4e} {tdev:12.4e} {n:10d}")
+
+if __name__ == "__main__":
+    main()
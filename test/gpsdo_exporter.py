@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Prometheus/OpenMetrics exporter for LimePSB-RPCM GPSDOs (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import time
+import threading
+import argparse
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from test_gpsdo import *
+from gpsdo_fleet import GPSDOFleet, parse_board
+
+# Metrics ------------------------------------------------------------------------------------------
+
+# Sample metrics: (name, type, help, value from sample).
+SAMPLE_METRICS = [
+    ("gpsdo_enabled",                 "gauge", "GPSDO regulation enabled (CONTROL EN).",         lambda s: int(s["enabled"])),
+    ("gpsdo_error_1s",                "gauge", "1s interval frequency error (clock cycles).",    lambda s: s["error_1s"]),
+    ("gpsdo_error_10s",               "gauge", "10s interval frequency error (clock cycles).",   lambda s: s["error_10s"]),
+    ("gpsdo_error_100s",              "gauge", "100s interval frequency error (clock cycles).",  lambda s: s["error_100s"]),
+    ("gpsdo_dac_tuned_value",         "gauge", "VCTCXO DAC tuned value.",                        lambda s: s["dac"]),
+    ("gpsdo_state",                   "gauge", "Regulation state (0: coarse tune, 1: fine tune).", lambda s: get_field(s["status"], STATUS_STATE_OFFSET,    STATUS_STATE_SIZE)),
+    ("gpsdo_accuracy",                "gauge", "Regulation accuracy (0: lowest - 3: highest).",  lambda s: get_field(s["status"], STATUS_ACCURACY_OFFSET, STATUS_ACCURACY_SIZE)),
+    ("gpsdo_tpulse_active",           "gauge", "1PPS timepulse active.",                         lambda s: get_field(s["status"], STATUS_TPULSE_OFFSET,   STATUS_TPULSE_SIZE)),
+    ("gpsdo_seq",                     "gauge", "Status record sequence counter.",                lambda s: s["seq"]),
+]
+
+def format_labels(labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+# Exporter -----------------------------------------------------------------------------------------
+
+class GPSDOExporter:
+    """
+    Cached GPSDO metrics.
+
+    The boards are sampled by a GPSDOFleet once per `period` (one PPS interval by default) in a
+    background thread; scrapes are served from the last snapshot and never access SPI, whatever the
+    number of scrapers. Exporter metrics: SPI read latency, read errors/stalls and sample age
+    (staleness) per board.
+    """
+    def __init__(self, fleet):
+        self.fleet   = fleet
+        self.lock    = threading.Lock()
+        self.tick    = None
+        self.boards  = {}
+        self.stats   = {name: {"latency": None, "latency_sum": 0.0, "reads": 0, "errors": 0, "stalls": 0} for name in fleet.drivers}
+        self.scrapes = 0
+        self.thread  = None
+
+    def update(self, tick, snapshot):
+        with self.lock:
+            self.tick   = tick
+            self.boards = snapshot
+            for name, board in snapshot.items():
+                stats = self.stats[name]
+                if board["state"] == "ok" and board["age"] == 0:
+                    stats["latency"]      = board["sample"]["latency"]
+                    stats["latency_sum"] += board["sample"]["latency"]
+                    stats["reads"]       += 1
+                stats["errors"] += board["state"] == "error"
+                stats["stalls"] += board["state"] == "stalled"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.fleet.run, kwargs={"callback": self.update}, daemon=True)
+        self.thread.start()
+
+    def render(self, now=None):
+        """Metrics in Prometheus text exposition format."""
+        now = time.time() if now is None else now
+        with self.lock:
+            self.scrapes += 1
+            boards  = dict(self.boards)
+            stats   = {name: dict(s) for name, s in self.stats.items()}
+            scrapes = self.scrapes
+
+        lines = []
+        def metric(name, type, help, values):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            for labels, value in values:
+                lines.append(f"{name}{format_labels(labels)} {value}")
+
+        # Sample metrics (only for boards with a sample).
+        sampled = {name: board for name, board in boards.items() if board["sample"] is not None}
+        for name, type, help, value in SAMPLE_METRICS:
+            metric(name, type, help, [({"board": b}, value(board["sample"])) for b, board in sampled.items()])
+
+        # Exporter metrics.
+        metric("gpsdo_up", "gauge", "Last SPI read of the board succeeded.",
+            [({"board": b}, int(board["state"] == "ok")) for b, board in boards.items()])
+        metric("gpsdo_sample_age_seconds", "gauge", "Age of the cached sample (staleness).",
+            [({"board": b}, f"{now - board['sample']['read_time']:.3f}") for b, board in sampled.items()])
+        metric("gpsdo_spi_latency_seconds", "gauge", "Duration of the last SPI sample read.",
+            [({"board": b}, f"{s['latency']:.6f}") for b, s in stats.items() if s["latency"] is not None])
+        lines.append("# HELP gpsdo_spi_read_seconds SPI sample read duration.")
+        lines.append("# TYPE gpsdo_spi_read_seconds summary")
+        for b, s in stats.items():
+            lines.append(f"gpsdo_spi_read_seconds_sum{format_labels({'board': b})} {s['latency_sum']:.6f}")
+            lines.append(f"gpsdo_spi_read_seconds_count{format_labels({'board': b})} {s['reads']}")
+        metric("gpsdo_spi_errors_total", "counter", "SPI sample reads failed.",
+            [({"board": b}, s["errors"]) for b, s in stats.items()])
+        metric("gpsdo_spi_stalls_total", "counter", "Sampling ticks missed by a stalled SPI read.",
+            [({"board": b}, s["stalls"]) for b, s in stats.items()])
+        metric("gpsdo_exporter_scrapes_total", "counter", "Scrapes served from the cache.", [({}, scrapes)])
+        return "\n".join(lines) + "\n"
+
+# HTTP Server --------------------------------------------------------------------------------------
+
+def serve(exporter, address="", port=9469):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = exporter.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((address, port), Handler)
+    server.serve_forever()
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LimePSB-RPCM GPSDO Prometheus exporter")
+    parser.add_argument("--board",   action="append", default=[], metavar="[NAME=]BUS.DEVICE",
+        help="GPSDO board on spidev BUS.DEVICE, may be repeated (default: 1.1)")
+    parser.add_argument("--address", default="",       help="HTTP listen address (default: all)")
+    parser.add_argument("--port",    default=9469,  type=int,   help="HTTP listen port")
+    parser.add_argument("--period",  default=1.0,   type=float, help="Snapshot refresh period (seconds, default: one PPS)")
+    parser.add_argument("--sim",     default=0,     type=int,   help="Use N simulated gpsdocfg backends instead of spidev")
+    args = parser.parse_args()
+
+    drivers = {}
+    if args.sim:
+        from gpsdo_sim import SimTransport
+        for n in range(args.sim):
+            drivers[f"sim{n}"] = GPSDODriver(transport=SimTransport(), cache=False)
+    else:
+        for spec in args.board or ["1.1"]:
+            name, bus, device = parse_board(spec)
+            drivers[name]     = GPSDODriver(spi_bus=bus, spi_device=device, cache=False)
+
+    fleet    = GPSDOFleet(drivers, period=args.period)
+    exporter = GPSDOExporter(fleet)
+    exporter.start()
+    print(f"Serving metrics on http://{args.address or '0.0.0.0'}:{args.port}/metrics")
+    try:
+        serve(exporter, args.address, args.port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fleet.close()
+
+if __name__ == "__main__":
+    main()
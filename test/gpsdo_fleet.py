@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Multi-board manager for LimePSB-RPCM GPSDOs (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import json
+import math
+import time
+import argparse
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from test_gpsdo import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def parse_board(spec):
+    """Board spec: [NAME=]BUS.DEVICE (e.g. rack0=1.1); returns (name, bus, device)."""
+    name, _, location = spec.rpartition("=")
+    bus, device       = (int(v) for v in location.split("."))
+    return name or f"spi{bus}.{device}", bus, device
+
+# GPSDO Fleet --------------------------------------------------------------------------------------
+
+class GPSDOFleet:
+    """
+    Concurrent sampling of several GPSDO boards.
+
+    Every `period` seconds (ticks aligned on multiples of `period` of the wall clock, so several
+    processes/hosts sample on the same schedule) one get_sample() per board is run on a thread pool
+    with one worker per board. Samples not completed `timeout` seconds after the tick mark the board
+    as stalled; a stalled board is not sampled again before its pending read returns, so the other
+    boards keep their schedule. Errors (SPI exceptions) are reported per board.
+    """
+    def __init__(self, drivers, period=1.0, timeout=None):
+        self.drivers  = dict(drivers)
+        self.period   = period
+        self.timeout  = 0.5 * period if timeout is None else timeout
+        self.executor = ThreadPoolExecutor(max_workers=len(self.drivers), thread_name_prefix="gpsdo-fleet")
+        self.pending  = {}
+        self.boards   = {name: {"state": "unknown", "time": None, "sample": None, "error": None} for name in self.drivers}
+
+    def next_tick(self, now=None):
+        now = time.time() if now is None else now
+        return math.floor(now / self.period + 1) * self.period
+
+    def _read(self, name):
+        start  = time.perf_counter()
+        sample = self.drivers[name].get_sample()
+        sample["latency"]   = time.perf_counter() - start
+        sample["read_time"] = time.time()
+        return sample
+
+    def sample(self, tick=None):
+        """Sample all boards (not already stalled) for `tick`; returns the aggregated snapshot."""
+        tick = time.time() if tick is None else tick
+        submitted = []
+        for name in self.drivers:
+            if name not in self.pending:
+                self.pending[name] = self.executor.submit(self._read, name)
+                submitted.append(self.pending[name])
+        # Only wait for this tick's reads, reads of stalled boards are just polled.
+        wait(submitted, timeout=max(0.0, tick + self.timeout - time.time()))
+
+        for name, future in list(self.pending.items()):
+            board = self.boards[name]
+            if not future.done():
+                board["state"] = "stalled"
+                continue
+            del self.pending[name]
+            try:
+                sample = future.result()
+            except Exception as e:
+                board.update(state="error", error=str(e))
+                continue
+            # Late completion of a stalled read: board is alive again but the sample is stale.
+            if sample["read_time"] < tick:
+                board.update(state="recovered", error=None)
+                continue
+            board.update(state="ok", time=tick, sample=sample, error=None)
+        return self.snapshot(tick)
+
+    def snapshot(self, now=None):
+        """Aggregated table: {board: state, age of the last sample (s), last sample, error}."""
+        now = time.time() if now is None else now
+        return {name: {
+            "state"  : board["state"],
+            "age"    : None if board["time"] is None else now - board["time"],
+            "sample" : board["sample"],
+            "error"  : board["error"],
+        } for name, board in self.boards.items()}
+
+    def run(self, num=0, callback=None):
+        """Sample `num` ticks (0: forever), calling `callback(tick, snapshot)` after each one."""
+        count = 0
+        while num == 0 or count < num:
+            tick = self.next_tick()
+            time.sleep(max(0.0, tick - time.time()))
+            snapshot = self.sample(tick)
+            if callback is not None:
+                callback(tick, snapshot)
+            count += 1
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for driver in self.drivers.values():
+            driver.close()
+
+# Output -------------------------------------------------------------------------------------------
+
+def format_table(tick, snapshot):
+    lines = [
+        f"{time.strftime('%H:%M:%S', time.localtime(tick))}",
+        "Board        | State     | Age (s) | Seq   | 1s Error | 10s Error | 100s Error | DAC Value | State        | Accuracy",
+    ]
+    for name, board in snapshot.items():
+        sample = board["sample"]
+        age    = "-" if board["age"] is None else f"{board['age']:.1f}"
+        if sample is None:
+            lines.append(f"{name:12} | {board['state']:9} | {age:>7} | " + (board["error"] or ""))
+            continue
+        status = decode_status(sample["status"])
+        lines.append(f"{name:12} | {board['state']:9} | {age:>7} | {sample['seq']:5d} | {sample['error_1s']:8d} | "
+                     f"{sample['error_10s']:9d} | {sample['error_100s']:10d} | 0x{sample['dac']:04X}    | "
+                     f"{status['state']:12} | {status['accuracy']}")
+    return "\n".join(lines)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LimePSB-RPCM GPSDO fleet manager")
+    parser.add_argument("--board",   action="append", default=[], metavar="[NAME=]BUS.DEVICE",
+        help="GPSDO board on spidev BUS.DEVICE, may be repeated (default: 1.1)")
+    parser.add_argument("--period",  default=1.0,  type=float, help="Sampling period (seconds)")
+    parser.add_argument("--timeout", default=None, type=float, help="Per-tick read timeout before a board is reported stalled (seconds, default: period/2)")
+    parser.add_argument("--num",     default=0,    type=int,   help="Number of ticks (0 for infinite)")
+    parser.add_argument("--log",     default=None,             help="Append snapshots as JSON lines to file")
+    parser.add_argument("--quiet",   action="store_true",      help="Disable console output")
+    parser.add_argument("--sim",     default=0,    type=int,   help="Use N simulated gpsdocfg backends instead of spidev")
+    args = parser.parse_args()
+
+    drivers = {}
+    if args.sim:
+        from gpsdo_sim import SimTransport
+        for n in range(args.sim):
+            drivers[f"sim{n}"] = GPSDODriver(transport=SimTransport(), cache=False)
+    else:
+        for spec in args.board or ["1.1"]:
+            name, bus, device = parse_board(spec)
+            drivers[name]     = GPSDODriver(spi_bus=bus, spi_device=device, cache=False)
+
+    log   = None if args.log is None else open(args.log, "a")
+    fleet = GPSDOFleet(drivers, period=args.period, timeout=args.timeout)
+
+    def report(tick, snapshot):
+        if not args.quiet:
+            print(format_table(tick, snapshot))
+        if log is not None:
+            log.write(json.dumps({"time": tick, "boards": snapshot}) + "\n")
+            log.flush()
+
+    try:
+        fleet.run(num=args.num, callback=report)
+    except KeyboardInterrupt:
+        print("\nMonitoring stopped.")
+    finally:
+        fleet.close()
+        if log is not None:
+            log.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Lock-time benchmark for LimePSB-RPCM GPSDOs (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import sys
+import json
+import math
+import time
+import argparse
+import statistics
+
+from test_gpsdo import *
+
+# Constants ----------------------------------------------------------------------------------------
+
+# Decoded (get_status) fine tune state and highest accuracy.
+FINE_TUNE        = decode_status(1 << STATUS_STATE_OFFSET)["state"]
+HIGHEST_ACCURACY = decode_status(3 << STATUS_ACCURACY_OFFSET)["accuracy"]
+
+# Lock Measurement ---------------------------------------------------------------------------------
+
+def measure_lock(driver, clk_freq_mhz=30.72, ppm=0.1, dac_init=None, timeout=1800.0, poll=0.5, timescale=1.0):
+    """
+    Enable the GPSDO and record the state/accuracy transitions until the highest accuracy.
+
+    Times are seconds since enable, scaled by `timescale` (simulated seconds per wall-clock second
+    for accelerated sim backends; `timeout`/`poll` are in the same scaled seconds). Returns the
+    transitions, the fine tune time, the lock (highest accuracy) time (None if not reached) and
+    whether the GPSDO was warm started.
+    """
+    warm_start  = enable_gpsdo(driver, clk_freq_mhz=clk_freq_mhz, ppm=ppm, dac_init=dac_init)
+    start       = time.monotonic()
+    last        = None
+    transitions = []
+    fine_time   = None
+    lock_time   = None
+    while True:
+        status = driver.get_status()
+        now    = (time.monotonic() - start) * timescale
+        if (status["state"], status["accuracy"]) != last:
+            last = (status["state"], status["accuracy"])
+            transitions.append({"time": now, "state": status["state"], "accuracy": status["accuracy"]})
+        if fine_time is None and status["state"] == FINE_TUNE:
+            fine_time = now
+        if status["accuracy"] == HIGHEST_ACCURACY:
+            lock_time = now
+            break
+        if now >= timeout:
+            break
+        time.sleep(poll / timescale)
+    return {"transitions": transitions, "fine_time": fine_time, "lock_time": lock_time, "warm_start": warm_start}
+
+def run_lock_bench(driver, cycles=10, reset_delay=2.0, timescale=1.0, **kwargs):
+    """Repeat disable/`reset_delay`/measure_lock cycles; returns the per-cycle results."""
+    results = []
+    for cycle in range(cycles):
+        disable_gpsdo(driver)
+        time.sleep(reset_delay / timescale)
+        result = measure_lock(driver, timescale=timescale, **kwargs)
+        lock   = "no lock" if result["lock_time"] is None else f"lock in {result['lock_time']:.1f}s"
+        print(f"Cycle {cycle + 1}/{cycles}: {lock} ({len(result['transitions'])} transitions).")
+        results.append(result)
+    return results
+
+def lock_statistics(results):
+    """Median/p95/min/max fine tune and lock times (locked cycles) and number of failures to lock."""
+    def distribution(values):
+        if not values:
+            return None
+        values = sorted(values)
+        return {
+            "median" : statistics.median(values),
+            "p95"    : values[math.ceil(0.95 * len(values)) - 1], # Nearest rank.
+            "min"    : values[0],
+            "max"    : values[-1],
+        }
+    return {
+        "cycles"    : len(results),
+        "failures"  : sum(r["lock_time"] is None for r in results),
+        "fine_time" : distribution([r["fine_time"] for r in results if r["fine_time"] is not None]),
+        "lock_time" : distribution([r["lock_time"] for r in results if r["lock_time"] is not None]),
+    }
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="GPSDO lock-time benchmark (repeated enable cycles)")
+    parser.add_argument("--cycles",      default=10,     type=int,   help="Number of enable cycles")
+    parser.add_argument("--reset-delay", default=2.0,    type=float, help="Delay after disable before each enable (seconds)")
+    parser.add_argument("--timeout",     default=1800.0, type=float, help="Lock timeout per cycle (seconds)")
+    parser.add_argument("--poll",        default=0.5,    type=float, help="Status poll interval (seconds)")
+    parser.add_argument("--clk-freq",    default=30.72,  type=float, help="Clock frequency in MHz (10 or 30.72)")
+    parser.add_argument("--ppm",         default=0.1,    type=float, help="Tolerance in ppm")
+    parser.add_argument("--dac-init",    default=None,   type=lambda v: int(v, 0), help="Warm start each cycle from this DAC value")
+    parser.add_argument("--speed",       default=500000, type=int,   help="SPI clock frequency (Hz)")
+    parser.add_argument("--sim",         action="store_true",        help="Use simulated gpsdocfg backend (regulation loop model) instead of spidev")
+    parser.add_argument("--speedup",     default=100.0,  type=float, help="Simulated seconds per wall-clock second (for --sim)")
+    parser.add_argument("--offset-ppm",  default=0.5,    type=float, help="Simulated VCTCXO frequency offset (ppm, for --sim)")
+    parser.add_argument("--json",        default=None,               help="Write results to JSON file")
+    args = parser.parse_args()
+
+    timescale = 1.0
+    if args.sim:
+        from gpsdo_sim import GPSDOCFGModel, SimTransport
+        from gpsdo_loop_sim import LoopPPSDOModel
+        timescale = args.speedup
+        ppsdo     = LoopPPSDOModel(offset_ppm=args.offset_ppm, speedup=args.speedup)
+        driver    = GPSDODriver(transport=SimTransport(GPSDOCFGModel(ppsdo), speed=args.speed))
+    else:
+        driver = GPSDODriver(speed=args.speed)
+    # Warm start measurements need gateware with DAC_INIT support (enable_gpsdo would cold start).
+    if args.dac_init is not None and not driver.has_warm_start():
+        driver.close()
+        sys.exit("Warm start not supported by the gateware (STATUS DAC_INIT_CAP=0), can't benchmark --dac-init.")
+    try:
+        results = run_lock_bench(driver,
+            cycles       = args.cycles,
+            reset_delay  = args.reset_delay,
+            timescale    = timescale,
+            clk_freq_mhz = args.clk_freq,
+            ppm          = args.ppm,
+            dac_init     = args.dac_init,
+            timeout      = args.timeout,
+            poll         = args.poll)
+    except KeyboardInterrupt:
+        print("\nBenchmark stopped.")
+        return
+    finally:
+        driver.close()
+
+    stats = lock_statistics(results)
+    print(f"Cycles: {stats['cycles']}, failures to lock: {stats['failures']}.")
+    for name in ["fine_time", "lock_time"]:
+        d = stats[name]
+        if d is not None:
+            print(f"{name:9}: median {d['median']:7.1f}s, p95 {d['p95']:7.1f}s, min {d['min']:7.1f}s, max {d['max']:7.1f}s")
+
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump({
+                "time"        : time.time(),
+                "backend"     : "sim" if args.sim else "spidev",
+                "clk_freq"    : args.clk_freq,
+                "ppm"         : args.ppm,
+                "dac_init"    : args.dac_init,
+                "reset_delay" : args.reset_delay,
+                "timeout"     : args.timeout,
+                "stats"       : stats,
+                "cycles"      : results,
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Offline PPSDO regulation loop simulator for LimePSB-RPCM (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import sys
+import json
+import random
+import argparse
+import itertools
+
+from concurrent.futures import ProcessPoolExecutor
+
+from gpsdo_sim import *
+
+# Constants ----------------------------------------------------------------------------------------
+
+# Regulation loop states (STATUS STATE field).
+LOOP_COARSE = 0
+LOOP_FINE   = 1
+
+# Oscillator Traces --------------------------------------------------------------------------------
+
+def synthetic_trace(duration, offset_ppm=0.5, noise_ppb=1.0, walk_ppb=0.01, drift_ppb_per_hour=0.0, seed=None):
+    """Free-running VCTCXO fractional frequency per second: offset + drift + random walk + white noise."""
+    rng   = random.Random(seed)
+    walk  = 0.0
+    trace = []
+    for t in range(duration):
+        walk += rng.gauss(0.0, walk_ppb)
+        trace.append(offset_ppm * 1e-6 + (drift_ppb_per_hour * t / 3600 + walk + rng.gauss(0.0, noise_ppb)) * 1e-9)
+    return trace
+
+def recorded_trace(filename, clk_freq_mhz=30.72, dac_gain_ppb=0.15):
+    """Free-running fractional frequency per second from a gpsdo_record recording (DAC pulling removed)."""
+    from gpsdo_record import load_records
+    records = load_records(filename)
+    trace   = []
+    last    = None
+    for record in records:
+        # One entry per new PPS sample.
+        if record["seq"] == last:
+            continue
+        last = record["seq"]
+        y    = record["error_1s"] / (clk_freq_mhz * 1e6)
+        trace.append(float(y) - (int(record["dac"]) - 0x8000) * dac_gain_ppb * 1e-9)
+    return trace
+
+# Trace PPSDO Model --------------------------------------------------------------------------------
+
+class TracePPSDOModel(PPSDOModel):
+    """PPSDOModel driven by an oscillator trace (one fractional frequency per PPS) and stepped manually."""
+    def __init__(self, trace, dac=0x8000, dac_gain_ppb=0.15):
+        PPSDOModel.__init__(self, dac=dac, dac_gain_ppb=dac_gain_ppb, clock=lambda: 0.0)
+        self.trace = trace
+
+    def frequency(self, clk_sel):
+        y  = self.trace[(self.ticks - 1) % len(self.trace)]
+        y += (self.dac - 0x8000) * self.dac_gain_ppb * 1e-9
+        return CLK_SEL_FREQS[clk_sel] * (1 + y)
+
+# Regulation Loop ----------------------------------------------------------------------------------
+
+class RegulationLoop:
+    """
+    Behavioural model of the PPSDO coarse/fine regulation loop.
+
+    Coarse tune solves the two-point line equation (DAC, 1s error) for a zero 1s error until it is
+    within one_s_tol. Fine tune then corrects the DAC from the 10s error when outside ten_s_tol and
+    from the 100s error otherwise (scaled by `fine_gain`), using only intervals measured entirely
+    after the last DAC update; a 1s error above `relock` * one_s_tol falls back to coarse tune.
+    Errors of the `settle` seconds following a DAC update are ignored (VCTCXO settling).
+
+    A warm start (DAC_INIT) provides the `slope`: fine tune is entered as soon as the 1s error from
+    the initial DAC value is within one_s_tol.
+    """
+    def __init__(self, coarse_step=0x0800, fine_gain=1.0, relock=4, settle=2, slope=None):
+        self.coarse_step = coarse_step
+        self.fine_gain   = fine_gain
+        self.relock      = relock
+        self.settle      = settle
+        self.state       = LOOP_COARSE
+        self.points      = []      # Last (DAC, 1s error) coarse points.
+        self.slope       = slope   # Hz per DAC LSB.
+        self.last_update = -settle # Tick of the last DAC update.
+
+    def set_dac(self, ppsdo, dac):
+        dac = min(max(int(round(dac)), 0), 0xFFFF)
+        if dac != ppsdo.dac:
+            ppsdo.dac        = dac
+            self.last_update = ppsdo.uptime
+
+    def update(self, ppsdo, config):
+        """Process the errors of the last PPS tick, updating ppsdo.dac."""
+        ticks = ppsdo.uptime
+        error = ppsdo.one_s_error
+        if ticks - self.last_update <= self.settle:
+            return
+
+        # Coarse Tune.
+        if self.state == LOOP_COARSE:
+            if abs(error) <= config["one_s_tol"] and self.slope is not None:
+                self.state = LOOP_FINE
+                return
+            self.points = (self.points + [(ppsdo.dac, error)])[-2:]
+            if len(self.points) < 2 or self.points[0][0] == self.points[1][0]:
+                step = -self.coarse_step if error > 0 else self.coarse_step
+                self.set_dac(ppsdo, ppsdo.dac + step)
+                return
+            (d0, e0), (d1, e1) = self.points
+            if e0 != e1:
+                self.slope = (e1 - e0) / (d1 - d0)
+            if self.slope is None or self.slope == 0:
+                self.set_dac(ppsdo, ppsdo.dac + self.coarse_step)
+                return
+            self.set_dac(ppsdo, d1 - e1 / self.slope)
+            return
+
+        # Fine Tune.
+        if abs(error) > self.relock * config["one_s_tol"]:
+            self.state  = LOOP_COARSE
+            self.points = []
+            return
+        since = ticks - self.last_update - self.settle
+        if ticks % 100 == 0 and since >= 100:
+            self.set_dac(ppsdo, ppsdo.dac - self.fine_gain * ppsdo.hundred_s_error / 100 / self.slope)
+        elif ticks % 10 == 0 and since >= 10 and abs(ppsdo.ten_s_error) > config["ten_s_tol"]:
+            self.set_dac(ppsdo, ppsdo.dac - self.fine_gain * ppsdo.ten_s_error / 10 / self.slope)
+
+# Loop PPSDO Model ---------------------------------------------------------------------------------
+
+class LoopPPSDOModel(PPSDOModel):
+    """
+    PPSDOModel regulated by a RegulationLoop, for SimTransport backends (real-time or accelerated).
+
+    The loop is restarted on each enable: from mid-scale DAC on a cold start, from DAC_INIT (with the
+    nominal DAC slope) on a warm start.
+    """
+    def __init__(self, loop_args=None, **kwargs):
+        PPSDOModel.__init__(self, **kwargs)
+        self.loop_args = {} if loop_args is None else dict(loop_args)
+        self.loop      = None
+
+    def step(self, config):
+        if not (self.pps_active and config["en"]):
+            self.loop = None
+        elif self.loop is None:
+            slope = None
+            if config.get("dac_init_en") and self.warm_start:
+                slope = self.dac_gain_ppb * 1e-9 * CLK_SEL_FREQS[config["clk_sel"]]
+            else:
+                self.dac = 0x8000
+            self.loop = RegulationLoop(slope=slope, **self.loop_args)
+        PPSDOModel.step(self, config)
+        if self.loop is not None:
+            self.loop.update(self, config)
+
+# Simulation ---------------------------------------------------------------------------------------
+
+def simulate(config, trace, duration=None, dac=0x8000, dac_gain_ppb=0.15, coarse_step=0x0800,
+    fine_gain=1.0, relock=4, settle=2, hold=100, dac_init=None):
+    """
+    Run the loop on a trace and return lock time and steady-state statistics.
+
+    Lock is the first tick of `hold` consecutive seconds at the highest accuracy (3); steady-state
+    errors are the 1s/100s errors (ppb) after lock. With `dac_init`, the loop is warm started from
+    this DAC value with the nominal DAC slope.
+    """
+    config = dict(config, en=1, dac_init_en=int(dac_init is not None), dac_init=dac_init or 0)
+    freq   = CLK_SEL_FREQS[config["clk_sel"]]
+    slope  = None if dac_init is None else dac_gain_ppb * 1e-9 * freq
+    ppsdo  = TracePPSDOModel(trace, dac=dac, dac_gain_ppb=dac_gain_ppb)
+    loop   = RegulationLoop(coarse_step=coarse_step, fine_gain=fine_gain, relock=relock, settle=settle, slope=slope)
+    duration = len(trace) if duration is None else duration
+
+    lock        = None
+    run         = 0
+    unlocks     = 0
+    errors      = []
+    errors_100s = []
+    for tick in range(duration):
+        ppsdo.ticks += 1
+        ppsdo.step(config)
+        loop.update(ppsdo, config)
+        # Accuracy is only meaningful once the 100s interval has been measured.
+        locked = ppsdo.accuracy == 3 and loop.state == LOOP_FINE and ppsdo.ticks >= 100
+        if lock is None:
+            run = run + 1 if locked else 0
+            if run >= hold:
+                lock = ppsdo.ticks - hold + 1
+        else:
+            unlocks += int(run > 0 and not locked)
+            run      = int(locked)
+        if lock is not None:
+            errors.append(ppsdo.one_s_error / freq * 1e9)
+            if ppsdo.ticks % 100 == 0:
+                errors_100s.append(ppsdo.hundred_s_error / (100 * freq) * 1e9)
+
+    rms = lambda values: (sum(v*v for v in values) / len(values)) ** 0.5 if values else None
+    return {
+        "lock_time"     : lock,
+        "unlocks"       : unlocks,
+        "rms_1s_ppb"    : rms(errors),
+        "rms_100s_ppb"  : rms(errors_100s),
+        "dac"           : ppsdo.dac,
+    }
+
+# Parameter Sweep ----------------------------------------------------------------------------------
+
+def _run_point(point):
+    params, trace_args = point
+    if "filename" in trace_args:
+        trace = recorded_trace(**trace_args)
+    else:
+        trace = synthetic_trace(**trace_args)
+    config = gpsdo_config(params["clk_freq"], params["ppm"])
+    config["ten_s_tol"]     = round(config["ten_s_tol"]     * params["ten_s_scale"])
+    config["hundred_s_tol"] = round(config["hundred_s_tol"] * params["hundred_s_scale"])
+    result = simulate(config, trace,
+        duration    = params["duration"],
+        coarse_step = params["coarse_step"],
+        fine_gain   = params["fine_gain"],
+        settle      = params["settle"])
+    return dict(params, **result)
+
+def sweep(grid, trace_args, seeds=1, workers=None):
+    """
+    Run every combination of the `grid` parameter lists (and trace seeds) across a process pool.
+
+    A recorded trace (`filename`) is the same for every seed: it is only run once (seed 0).
+    """
+    names  = list(grid)
+    points = []
+    if "filename" in trace_args:
+        seeds = 1
+    for values in itertools.product(*grid.values()):
+        for seed in range(seeds):
+            params = dict(zip(names, values), seed=seed)
+            args   = dict(trace_args)
+            if "filename" not in args:
+                args.update(duration=params["duration"], seed=seed)
+            points.append((params, args))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_run_point, points, chunksize=max(1, len(points) // 64)))
+
+# Main ----------------------------------------------------------------------------------------------
+
+def main():
+    floats = lambda s: [float(v) for v in s.split(",")]
+    ints   = lambda s: [int(v, 0) for v in s.split(",")]
+    parser = argparse.ArgumentParser(description="Offline PPSDO regulation loop simulator / tolerance sweeps")
+    parser.add_argument("--clk-freq",        default=30.72,  type=float,  help="Clock frequency in MHz (10 or 30.72)")
+    parser.add_argument("--ppm",             default=[0.1],  type=floats, help="Tolerances in ppm (comma separated)")
+    parser.add_argument("--ten-s-scale",     default=[1.0],  type=floats, help="10s tolerance scales (comma separated)")
+    parser.add_argument("--hundred-s-scale", default=[1.0],  type=floats, help="100s tolerance scales (comma separated)")
+    parser.add_argument("--fine-gain",       default=[1.0],  type=floats, help="Fine tune gains (comma separated)")
+    parser.add_argument("--coarse-step",     default=[0x0800], type=ints, help="Coarse tune first DAC steps (comma separated)")
+    parser.add_argument("--settle",          default=2,      type=int,    help="Seconds ignored after each DAC update")
+    parser.add_argument("--duration",        default=3600,   type=int,    help="Simulated duration (seconds)")
+    parser.add_argument("--seeds",           default=1,      type=int,    help="Synthetic traces per configuration (ignored with --trace)")
+    parser.add_argument("--trace",           default=None,                help="Replay a gpsdo_record recording instead of synthetic traces")
+    parser.add_argument("--offset-ppm",      default=0.5,    type=float,  help="Synthetic VCTCXO frequency offset (ppm)")
+    parser.add_argument("--noise-ppb",       default=1.0,    type=float,  help="Synthetic white frequency noise (ppb)")
+    parser.add_argument("--walk-ppb",        default=0.01,   type=float,  help="Synthetic random walk frequency noise (ppb/s)")
+    parser.add_argument("--workers",         default=None,   type=int,    help="Worker processes (default: CPU count)")
+    parser.add_argument("--json",            default=None,                help="Write results to JSON file")
+    args = parser.parse_args()
+
+    grid = {
+        "clk_freq"        : [args.clk_freq],
+        "ppm"             : args.ppm,
+        "ten_s_scale"     : args.ten_s_scale,
+        "hundred_s_scale" : args.hundred_s_scale,
+        "fine_gain"       : args.fine_gain,
+        "coarse_step"     : args.coarse_step,
+        "settle"          : [args.settle],
+        "duration"        : [args.duration],
+    }
+    if args.trace is not None:
+        trace_args = {"filename": args.trace, "clk_freq_mhz": args.clk_freq}
+        if args.seeds > 1:
+            print(f"--seeds {args.seeds} ignored with --trace (same recorded trace for every seed).", file=sys.stderr)
+    else:
+        trace_args = {"offset_ppm": args.offset_ppm, "noise_ppb": args.noise_ppb, "walk_ppb": args.walk_ppb}
+    results = sweep(grid, trace_args, seeds=args.seeds, workers=args.workers)
+
+    # Best configurations first (locked, then by lock time).
+    results.sort(key=lambda r: (r["lock_time"] is None, r["lock_time"] or 0))
+    fmt = lambda v: "-" if v is None else f"{v:.3f}"
+    print("PPM     | 10s Scale | 100s Scale | Fine Gain | Coarse Step | Seed | Lock (s) | Unlocks | RMS 1s (ppb) | RMS 100s (ppb)")
+    for r in results:
+        lock = "-" if r["lock_time"] is None else str(r["lock_time"])
+        print(f"{r['ppm']:7.3f} | {r['ten_s_scale']:9.2f} | {r['hundred_s_scale']:10.2f} | {r['fine_gain']:9.2f} | "
+              f"0x{r['coarse_step']:04X}      | {r['seed']:4d} | {lock:>8} | {r['unlocks']:7d} | {fmt(r['rms_1s_ppb']):>12} | {fmt(r['rms_100s_ppb']):>14}")
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# asyncio monitoring engine for LimePSB-RPCM GPSDO (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import json
+import math
+import time
+import asyncio
+import argparse
+
+from concurrent.futures import ThreadPoolExecutor
+
+from test_gpsdo import *
+
+# Fields -------------------------------------------------------------------------------------------
+
+# Monitored fields: registers to read and decoder (from {address: value}).
+FIELDS = {
+    "enabled"    : ([REG_CONTROL],                          lambda r: bool(r[REG_CONTROL] & 0x0001)),
+    "error_1s"   : ([REG_PPS_1S_ERR_L,   REG_PPS_1S_ERR_H],   lambda r: to_signed_32bit(r[REG_PPS_1S_ERR_L],   r[REG_PPS_1S_ERR_H])),
+    "error_10s"  : ([REG_PPS_10S_ERR_L,  REG_PPS_10S_ERR_H],  lambda r: to_signed_32bit(r[REG_PPS_10S_ERR_L],  r[REG_PPS_10S_ERR_H])),
+    "error_100s" : ([REG_PPS_100S_ERR_L, REG_PPS_100S_ERR_H], lambda r: to_signed_32bit(r[REG_PPS_100S_ERR_L], r[REG_PPS_100S_ERR_H])),
+    "dac"        : ([REG_DAC_TUNED_VAL],                    lambda r: r[REG_DAC_TUNED_VAL]),
+    "status"     : ([REG_STATUS],                           lambda r: decode_status(r[REG_STATUS])),
+    "seq"        : ([REG_SEQ],                              lambda r: r[REG_SEQ]),
+}
+
+# Default polling rates (Hz).
+DEFAULT_RATES = {
+    "enabled"    : 1.0,
+    "error_1s"   : 1.0,
+    "error_10s"  : 0.1,
+    "error_100s" : 0.01,
+    "dac"        : 1.0,
+    "status"     : 10.0,
+}
+
+# Async Monitor ------------------------------------------------------------------------------------
+
+class AsyncGPSDOMonitor:
+    """
+    asyncio GPSDO monitor.
+
+    Each field is polled at its own rate; fields due at the same time are read in one batched
+    driver.read_many() call, run in a single-thread executor (SPI accesses stay serialized). Each
+    sample is published once to every subscriber queue, a final None marks the end of the stream.
+    """
+    def __init__(self, driver, rates=DEFAULT_RATES, queue_size=256):
+        for field in rates:
+            if field not in FIELDS:
+                raise ValueError(f"Unknown field {field}, expected one of {', '.join(FIELDS)}.")
+        self.driver      = driver
+        self.rates       = dict(rates)
+        self.queue_size  = queue_size
+        self.subscribers = []
+        self.executor    = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpsdo-spi")
+
+    def subscribe(self):
+        """Return a new queue receiving every published sample."""
+        queue = asyncio.Queue(self.queue_size)
+        self.subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.remove(queue)
+
+    def publish(self, sample):
+        for queue in self.subscribers:
+            # Drop the oldest sample for slow consumers rather than stalling the poller.
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(sample)
+
+    async def sample(self, fields):
+        """Read the given fields in a single batched transfer."""
+        regs = sorted({address for field in fields for address in FIELDS[field][0]})
+        # Status registers are served from the snapshot latched by PPS_1S_ERR_L: read it first.
+        if any(REG_PPS_1S_ERR_H <= address <= REG_STATUS for address in regs):
+            regs = sorted(set(regs) | {REG_PPS_1S_ERR_L})
+        loop   = asyncio.get_running_loop()
+        values = await loop.run_in_executor(self.executor, self.driver.read_many, regs)
+        values = dict(zip(regs, values))
+        return {
+            "time"   : time.time(),
+            "fields" : {field: FIELDS[field][1](values) for field in fields},
+        }
+
+    async def run(self, duration=None):
+        loop  = asyncio.get_running_loop()
+        start = loop.time()
+        due   = {field: start for field in self.rates}
+        try:
+            while duration is None or loop.time() - start < duration:
+                now    = loop.time()
+                fields = [field for field, t in due.items() if t <= now]
+                if not fields:
+                    await asyncio.sleep(min(due.values()) - now)
+                    continue
+                # Keep each field on its own schedule, skipping missed periods.
+                for field in fields:
+                    period     = 1 / self.rates[field]
+                    due[field] += period * (math.floor((now - due[field]) / period) + 1)
+                self.publish(await self.sample(fields))
+        finally:
+            self.publish(None)
+
+    def close(self):
+        self.executor.shutdown()
+
+# Consumers ----------------------------------------------------------------------------------------
+
+async def console_consumer(queue):
+    while (sample := await queue.get()) is not None:
+        values = " ".join(f"{field}={value}" for field, value in sample["fields"].items())
+        print(f"{time.strftime('%H:%M:%S', time.localtime(sample['time']))} {values}")
+
+async def file_consumer(queue, filename):
+    with open(filename, "a") as f:
+        while (sample := await queue.get()) is not None:
+            f.write(json.dumps(sample) + "\n")
+            f.flush()
+
+async def metrics_consumer(queue, metrics):
+    while (sample := await queue.get()) is not None:
+        metrics["samples"] += 1
+        for field, value in sample["fields"].items():
+            metrics["counts"][field] = metrics["counts"].get(field, 0) + 1
+            metrics["last"][field]   = value
+
+# Main ----------------------------------------------------------------------------------------------
+
+async def run_async_monitoring(driver, rates, duration=None, log=None, quiet=False):
+    monitor   = AsyncGPSDOMonitor(driver, rates)
+    metrics   = {"samples": 0, "counts": {}, "last": {}}
+    consumers = [metrics_consumer(monitor.subscribe(), metrics)]
+    if not quiet:
+        consumers.append(console_consumer(monitor.subscribe()))
+    if log is not None:
+        consumers.append(file_consumer(monitor.subscribe(), log))
+    try:
+        await asyncio.gather(monitor.run(duration), *consumers)
+    finally:
+        monitor.close()
+    return metrics
+
+def main():
+    parser = argparse.ArgumentParser(description="asyncio GPSDO monitor")
+    parser.add_argument("--rate",     action="append", default=[], metavar="FIELD=HZ",
+        help=f"Polling rate of a field ({', '.join(FIELDS)}), may be repeated")
+    parser.add_argument("--duration", default=None,  type=float, help="Monitoring duration (seconds, default: infinite)")
+    parser.add_argument("--log",      default=None,               help="Append samples as JSON lines to file")
+    parser.add_argument("--quiet",    action="store_true",        help="Disable console output")
+    parser.add_argument("--sim",      action="store_true",        help="Use simulated gpsdocfg backend instead of spidev")
+    args = parser.parse_args()
+
+    rates = dict(DEFAULT_RATES)
+    for rate in args.rate:
+        field, hz = rate.split("=")
+        rates[field] = float(hz)
+    rates = {field: hz for field, hz in rates.items() if hz > 0}
+
+    if args.sim:
+        from gpsdo_sim import SimTransport
+        driver = GPSDODriver(transport=SimTransport(), cache=False)
+    else:
+        driver = GPSDODriver(cache=False)
+    try:
+        metrics = asyncio.run(run_async_monitoring(driver, rates, args.duration, args.log, args.quiet))
+        print(f"{metrics['samples']} samples: " + ", ".join(f"{field}={n}" for field, n in metrics["counts"].items()))
+    except KeyboardInterrupt:
+        print("\nMonitoring stopped.")
+    finally:
+        driver.close()
+
+if __name__ == "__main__":
+    main()
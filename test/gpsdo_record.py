@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Binary recording format for LimePSB-RPCM GPSDO samples (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import os
+import json
+import struct
+import argparse
+
+# Constants ----------------------------------------------------------------------------------------
+
+# File header: magic, version, header size, record size, then JSON record layout (space padded).
+FILE_MAGIC        = b"GPSDOREC"
+FILE_VERSION      = 1
+FILE_HEADER_FMT   = "<8sHHI"
+FILE_HEADER_ALIGN = 64
+
+# Record layout (little-endian, packed), as NumPy dtype descriptors.
+RECORD_FIELDS = [
+    ("timestamp",  "<f8"), # Host UNIX time (s).
+    ("error_1s",   "<i4"), # 1s error.
+    ("error_10s",  "<i4"), # 10s error.
+    ("error_100s", "<i4"), # 100s error.
+    ("dac",        "<u2"), # DAC tuned value.
+    ("status",     "<u2"), # STATUS register.
+    ("seq",        "<u2"), # SEQ register.
+]
+RECORD_FMT = "<" + "".join({"<f8": "d", "<i4": "i", "<u2": "H"}[fmt] for _, fmt in RECORD_FIELDS)
+
+# Helper function to build the file header.
+def make_header(fields=RECORD_FIELDS):
+    layout      = json.dumps({"fields": fields}).encode()
+    size        = struct.calcsize(FILE_HEADER_FMT) + len(layout) + 1
+    size        = (size + FILE_HEADER_ALIGN - 1) // FILE_HEADER_ALIGN * FILE_HEADER_ALIGN
+    record_size = struct.calcsize(RECORD_FMT)
+    header      = struct.pack(FILE_HEADER_FMT, FILE_MAGIC, FILE_VERSION, size, record_size) + layout
+    return header.ljust(size - 1) + b"\n"
+
+# Helper function to parse the file header: returns (fields, header size, record size).
+def read_header(f):
+    magic, version, size, record_size = struct.unpack(FILE_HEADER_FMT, f.read(struct.calcsize(FILE_HEADER_FMT)))
+    if magic != FILE_MAGIC:
+        raise ValueError("Not a GPSDO recording (bad magic).")
+    if version != FILE_VERSION:
+        raise ValueError(f"Unsupported GPSDO recording version {version}.")
+    layout = json.loads(f.read(size - struct.calcsize(FILE_HEADER_FMT)))
+    return [tuple(field) for field in layout["fields"]], size, record_size
+
+# Record Writer ------------------------------------------------------------------------------------
+
+class RecordWriter:
+    """
+    Fixed-width binary GPSDO sample recorder.
+
+    Appends to an existing recording with the same layout, otherwise starts a new file.
+    """
+    def __init__(self, filename):
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            with open(filename, "rb") as f:
+                fields, size, record_size = read_header(f)
+            if fields != RECORD_FIELDS:
+                raise ValueError(f"{filename}: record layout mismatch, can't append.")
+            self.file = open(filename, "r+b")
+            # Drop a partial trailing record (interrupted write).
+            count = (os.path.getsize(filename) - size) // record_size
+            self.file.truncate(size + count * record_size)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(filename, "wb")
+            self.file.write(make_header())
+        self.struct = struct.Struct(RECORD_FMT)
+
+    def write(self, timestamp, sample):
+        """Append a record from a GPSDODriver sample (get_sample())."""
+        self.file.write(self.struct.pack(
+            timestamp,
+            sample["error_1s"],
+            sample["error_10s"],
+            sample["error_100s"],
+            sample["dac"],
+            sample["status"],
+            sample["seq"],
+        ))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+# Record Reader ------------------------------------------------------------------------------------
+
+def load_records(filename):
+    """Memory-map a recording as a NumPy structured array (read-only, no parsing)."""
+    import numpy as np
+    with open(filename, "rb") as f:
+        fields, size, record_size = read_header(f)
+    dtype = np.dtype(fields)
+    if dtype.itemsize != record_size:
+        raise ValueError(f"{filename}: record size mismatch ({dtype.itemsize} vs {record_size}).")
+    count = (os.path.getsize(filename) - size) // record_size
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode="r", offset=size, shape=(count,))
+
+# Main ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="GPSDO recording summary")
+    parser.add_argument("filename", help="Recording file (from test_gpsdo.py --check --record)")
+    args = parser.parse_args()
+
+    records = load_records(args.filename)
+    print(f"{args.filename}: {len(records)} records")
+    if len(records):
+        span = records["timestamp"][-1] - records["timestamp"][0]
+        print(f"Time span  : {span:.1f}s")
+        for name in ["error_1s", "error_10s", "error_100s", "dac"]:
+            values = records[name]
+            print(f"{name:10} : min={values.min()} max={values.max()} mean={values.mean():.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# chrony/ntpd SHM refclock feeder for LimePSB-RPCM GPSDOs (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import os
+import math
+import time
+import ctypes
+import argparse
+import collections
+
+from test_gpsdo import *
+
+# Constants ----------------------------------------------------------------------------------------
+
+# NTP SHM refclock segments: SysV shared memory key 0x4E545030 ("NTP0") + unit.
+NTPSHM_KEY_BASE  = 0x4E545030
+
+# Leap indicator.
+LEAP_NOWARNING   = 0
+LEAP_NOTINSYNC   = 3
+
+IPC_CREAT        = 0o1000
+IPC_RMID         = 0
+
+# Jitter of Data Ready edge samples (kernel GPIO interrupt timestamps, ns).
+EDGE_JITTER_NS   = 1000
+
+# Helper function to get the time_t size (bits) of the system: 64-bit on 64-bit systems and on
+# 32-bit ones built with 64-bit time_t (Python and chrony/ntpd then share it).
+def time_t_bits():
+    if hasattr(ctypes, "c_time_t"):
+        return 8 * ctypes.sizeof(ctypes.c_time_t)
+    try:
+        time.gmtime(2**31)
+    except (OverflowError, OSError):
+        return 32
+    return 64
+
+# NTP SHM Segment ----------------------------------------------------------------------------------
+
+def shm_time_struct(time_t=None):
+    """struct shmTime (ntpd refclock_shm.c, chrony refclock_shm.c) for a `time_t` size in bits."""
+    time_t = {32: ctypes.c_int32, 64: ctypes.c_int64}[time_t or time_t_bits()]
+    class ShmTime(ctypes.Structure):
+        _fields_ = [
+            ("mode",                 ctypes.c_int),
+            ("count",                ctypes.c_int),
+            ("clockTimeStampSec",    time_t),
+            ("clockTimeStampUSec",   ctypes.c_int),
+            ("receiveTimeStampSec",  time_t),
+            ("receiveTimeStampUSec", ctypes.c_int),
+            ("leap",                 ctypes.c_int),
+            ("precision",            ctypes.c_int),
+            ("nsamples",             ctypes.c_int),
+            ("valid",                ctypes.c_int),
+            ("clockTimeStampNSec",   ctypes.c_uint),
+            ("receiveTimeStampNSec", ctypes.c_uint),
+            ("dummy",                ctypes.c_int * 8),
+        ]
+    return ShmTime
+
+class NTPSHM:
+    """
+    NTP SHM refclock segment (unit N: SysV key 0x4E545030 + N).
+
+    Samples are written with the mode 1 protocol: count is incremented before and after the update
+    and valid set last, so readers (chrony/ntpd) discard samples read while being updated. Units 0-1
+    are created root-only (0600) as with ntpd/gpsd, the others 0666. The segment layout follows the
+    system time_t size unless `time_t` (bits) is given.
+    """
+    def __init__(self, unit=0, perm=None, time_t=None):
+        self.libc = libc = ctypes.CDLL(None, use_errno=True)
+        libc.shmget.restype  = ctypes.c_int
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype   = ctypes.c_void_p
+        libc.shmat.argtypes  = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes  = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+        ShmTime   = shm_time_struct(time_t)
+        self.unit = unit
+        self.key  = NTPSHM_KEY_BASE + unit
+        perm      = (0o600 if unit < 2 else 0o666) if perm is None else perm
+        self.id   = libc.shmget(self.key, ctypes.sizeof(ShmTime), IPC_CREAT | perm)
+        if self.id < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"shmget(0x{self.key:08X}): {os.strerror(errno)}")
+        self.addr = libc.shmat(self.id, None, 0)
+        if self.addr in [None, ctypes.c_void_p(-1).value]:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"shmat(0x{self.key:08X}): {os.strerror(errno)}")
+        self.shm  = ShmTime.from_address(self.addr)
+
+    def put(self, clock_ns, receive_ns, leap=LEAP_NOWARNING, precision=-20, nsamples=3):
+        """Publish a sample: reference (`clock_ns`) and system (`receive_ns`) times in ns since epoch."""
+        shm = self.shm
+        shm.valid  = 0
+        shm.count += 1
+        shm.mode                 = 1
+        shm.clockTimeStampSec    = clock_ns // 1000000000
+        shm.clockTimeStampUSec   = (clock_ns % 1000000000) // 1000
+        shm.clockTimeStampNSec   = clock_ns % 1000000000
+        shm.receiveTimeStampSec  = receive_ns // 1000000000
+        shm.receiveTimeStampUSec = (receive_ns % 1000000000) // 1000
+        shm.receiveTimeStampNSec = receive_ns % 1000000000
+        shm.leap                 = leap
+        shm.precision            = precision
+        shm.nsamples             = nsamples
+        shm.count += 1
+        shm.valid  = 1
+
+    def get(self):
+        """Read (and consume) the last sample like chrony/ntpd; None if invalid or being updated."""
+        shm   = self.shm
+        count = shm.count
+        if not shm.valid:
+            return None
+        sample = {
+            "clock_ns"   : shm.clockTimeStampSec   * 1000000000 + shm.clockTimeStampNSec,
+            "receive_ns" : shm.receiveTimeStampSec * 1000000000 + shm.receiveTimeStampNSec,
+            "leap"       : shm.leap,
+            "precision"  : shm.precision,
+        }
+        if shm.mode == 1 and shm.count != count:
+            return None
+        shm.valid = 0
+        return sample
+
+    def close(self, remove=False):
+        self.libc.shmdt(ctypes.c_void_p(self.addr))
+        if remove:
+            self.libc.shmctl(self.id, IPC_RMID, None)
+
+# PPS Clock Fit ------------------------------------------------------------------------------------
+
+class PPSClockFit:
+    """
+    Conversion of the PPS_TIME rf counter (latched by the gateware on each PPS edge) to the system clock.
+
+    Each PPS gives an observation: its PPS_TIME and an estimate of its system time (middle of the
+    bracketing polls or Data Ready edge timestamp minus latency), jittered by the SPI poll window or
+    the interrupt latency. A least-squares fit of the system time against PPS_TIME over the last
+    `size` observations converts each latched PPS_TIME to the system clock with this jitter averaged
+    out (the fit slope follows the rf clock rate as seen by the system clock). The fit restarts when
+    PPS_TIME goes backwards (reset) or an observation is more than `max_residual` seconds off.
+    """
+    def __init__(self, size=16, max_residual=5e-3):
+        self.size         = size
+        self.max_residual = max_residual
+        self.points       = collections.deque(maxlen=size)
+
+    def system_time(self, pps_time):
+        """System time (ns) of `pps_time` from the fit (None with less than 2 observations)."""
+        if len(self.points) < 2:
+            return None
+        # Relative to the last observation (float precision).
+        x0, y0 = self.points[-1]
+        xs     = [x - x0 for x, _ in self.points]
+        ys     = [y - y0 for _, y in self.points]
+        mx     = sum(xs) / len(xs)
+        my     = sum(ys) / len(ys)
+        slope  = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx)**2 for x in xs)
+        return y0 + round(my + slope * (pps_time - x0 - mx))
+
+    def add(self, pps_time, system_ns):
+        """Add an observation; returns the fitted system time (ns) of `pps_time` and the RMS residual (ns)."""
+        if self.points:
+            predicted = self.system_time(pps_time)
+            if pps_time <= self.points[-1][0] or (predicted is not None and abs(predicted - system_ns) > self.max_residual * 1e9):
+                self.points.clear()
+        self.points.append((pps_time, system_ns))
+        if len(self.points) < 2:
+            return system_ns, 0.0
+        residuals = [y - self.system_time(x) for x, y in self.points]
+        return self.system_time(pps_time), math.sqrt(sum(r**2 for r in residuals) / len(residuals))
+
+# SHM Feeder ---------------------------------------------------------------------------------------
+
+class GPSDOSHMFeeder:
+    """
+    Publish the GPSDO PPS to an NTP SHM segment.
+
+    The system time of a PPS is its latched PPS_TIME converted to the system clock (PPSClockFit over
+    the last `fit_size` PPS), from observations taken either:
+
+    - With a Data Ready `edge` (gateware built --with-data-ready, CdevGPIOEdge): kernel timestamp of
+      the Data Ready edge minus `latency` (seconds, the gateware --pps-status-latency). The delay is
+      counted in FPGA sys clock cycles (internal oscillator): its error is a constant offset,
+      calibrate `latency` against the polled mode if needed.
+    - Otherwise, PPS_TIME is polled every `poll` seconds in a window around the expected PPS (one
+      second after the previous one, `window` seconds early) and only every `idle` seconds
+      otherwise: middle of the polls bracketing the PPS_TIME change.
+
+    A Data Ready edge without a new PPS_TIME is skipped. The reference time is the nearest second;
+    the sample is published as soon as the PPS is seen.
+
+    Flags come from the status record read after the previous PPS (so no SPI access delays the
+    publication): no sample without tpulse_active, leap "not in sync" unless enabled in fine tune
+    with `min_accuracy`.
+    """
+    def __init__(self, driver, shm, poll=0.0005, window=0.02, idle=0.01, min_accuracy=3, edge=None, latency=100e-3, fit_size=16):
+        self.driver       = driver
+        self.shm          = shm
+        self.edge         = edge
+        self.latency      = latency
+        self.poll         = poll
+        self.window       = window
+        self.idle         = idle
+        self.min_accuracy = min_accuracy
+        self.clock_fit    = PPSClockFit(size=fit_size)
+        self.stats        = {"samples": 0, "unsynced": 0, "skipped": 0, "stale": 0}
+
+    def leap(self, sample):
+        """Leap indicator from the status record, None if no PPS (no sample published)."""
+        status   = sample["status"]
+        state    = get_field(status, STATUS_STATE_OFFSET,    STATUS_STATE_SIZE)
+        accuracy = get_field(status, STATUS_ACCURACY_OFFSET, STATUS_ACCURACY_SIZE)
+        tpulse   = get_field(status, STATUS_TPULSE_OFFSET,   STATUS_TPULSE_SIZE)
+        if not tpulse:
+            return None
+        if sample["enabled"] and state == 1 and accuracy >= self.min_accuracy:
+            return LEAP_NOWARNING
+        return LEAP_NOTINSYNC
+
+    def wait_pps(self, last_time, expected=None):
+        """Poll PPS_TIME until it differs from `last_time`; returns (pps, before_ns, after_ns)."""
+        before = time.clock_gettime_ns(time.CLOCK_REALTIME)
+        while True:
+            now = time.monotonic()
+            if expected is not None and now < expected - self.window:
+                time.sleep(min(self.idle, expected - self.window - now))
+                continue
+            start = time.clock_gettime_ns(time.CLOCK_REALTIME)
+            pps   = self.driver.get_pps_timestamp()
+            after = time.clock_gettime_ns(time.CLOCK_REALTIME)
+            if pps["time"] != last_time:
+                return pps, before, after
+            before = start
+            time.sleep(self.poll)
+
+    def wait_edge(self):
+        """Wait for a Data Ready edge; returns (pps, edge time in ns minus latency)."""
+        while not self.edge.wait(timeout=2.0):
+            pass
+        return self.driver.get_pps_timestamp(), self.edge.timestamp_ns - round(self.latency * 1e9)
+
+    def run(self, num=0, callback=None):
+        """Publish `num` samples (0: forever), calling `callback(sample)` after each one."""
+        last     = self.driver.get_pps_timestamp()["time"]
+        sample   = self.driver.get_sample()
+        expected = None
+        count    = 0
+        while num == 0 or count < num:
+            if self.edge is not None:
+                pps, observed = self.wait_edge()
+                window        = 0
+                jitter        = EDGE_JITTER_NS
+                # Data Ready edge without a new PPS (PPS_TIME unchanged): no sample.
+                if pps["time"] == last:
+                    self.stats["stale"] += 1
+                    continue
+            else:
+                pps, before, after = self.wait_pps(last, expected)
+                expected = time.monotonic() + 1.0 - (after - before) / 2e9
+                observed = (before + after) // 2
+                window   = after - before
+                jitter   = window / 2
+            last          = pps["time"]
+            receive, rms  = self.clock_fit.add(pps["time"], observed)
+            n             = len(self.clock_fit.points)
+            precision     = math.floor(math.log2(max(max(rms, jitter) / math.sqrt(n), 1) / 1e9))
+            clock         = round(receive / 1e9) * 1000000000
+            leap          = self.leap(sample)
+            if leap is None:
+                self.stats["skipped"] += 1
+            else:
+                self.shm.put(clock, receive, leap=leap, precision=precision)
+                self.stats["samples"]  += 1
+                self.stats["unsynced"] += leap == LEAP_NOTINSYNC
+            if callback is not None:
+                callback({"pps": pps, "clock_ns": clock, "receive_ns": receive, "observed_ns": observed,
+                    "leap": leap, "window_ns": window, "precision": precision})
+            # Status record for the next PPS (after publication).
+            sample = self.driver.get_sample()
+            count += 1
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="chrony/ntpd SHM refclock feeder driven by the GPSDO PPS")
+    parser.add_argument("--unit",         default=0,      type=int,   help="NTP SHM unit (key 0x4E545030 + unit)")
+    parser.add_argument("--perm",         default=None,   type=lambda v: int(v, 8), help="SHM segment permissions (octal, default: 600 for units 0-1, 666 otherwise)")
+    parser.add_argument("--poll",         default=0.0005, type=float, help="PPS_TIME poll interval around the expected PPS (seconds)")
+    parser.add_argument("--window",       default=0.02,   type=float, help="Fast polling starts this early before the expected PPS (seconds)")
+    parser.add_argument("--min-accuracy", default=3,      type=int,   help="Minimum accuracy for synchronized samples (0-3)")
+    parser.add_argument("--drdy-chip",    default=None,   type=int,   help="Timestamp the PPS with Data Ready edges of this /dev/gpiochipN (gateware built --with-data-ready)")
+    parser.add_argument("--drdy-line",    default=None,   type=int,   help="Data Ready GPIO line offset on --drdy-chip")
+    parser.add_argument("--drdy-latency", default=100,    type=float, help="PPS to Data Ready edge gateware latency (ms, gateware --pps-status-latency)")
+    parser.add_argument("--fit-size",     default=16,     type=int,   help="PPS used to convert PPS_TIME to the system clock")
+    parser.add_argument("--time-t-bits",  default=None,   type=int,   choices=[32, 64], help="time_t size of chrony/ntpd (default: system time_t size)")
+    parser.add_argument("--num",          default=0,      type=int,   help="Number of samples (0 for infinite)")
+    parser.add_argument("--read",         action="store_true",        help="Read samples from the SHM segment (consumer side) instead of feeding it")
+    parser.add_argument("--remove",       action="store_true",        help="Remove the SHM segment on exit")
+    parser.add_argument("--quiet",        action="store_true",        help="Disable console output")
+    parser.add_argument("--speed",        default=500000, type=int,   help="SPI clock frequency (Hz)")
+    parser.add_argument("--sim",          action="store_true",        help="Use simulated gpsdocfg backend instead of spidev")
+    args = parser.parse_args()
+    if args.drdy_chip is not None and args.drdy_line is None and not args.sim:
+        parser.error("--drdy-chip requires --drdy-line.")
+
+    shm = NTPSHM(unit=args.unit, perm=args.perm, time_t=args.time_t_bits)
+
+    # Consumer side (local test of the segment, chrony/ntpd must not be reading it).
+    if args.read:
+        count = 0
+        try:
+            while args.num == 0 or count < args.num:
+                sample = shm.get()
+                if sample is not None:
+                    offset = (sample["clock_ns"] - sample["receive_ns"]) / 1e9
+                    print(f"SHM unit {args.unit}: clock {sample['clock_ns']/1e9:.9f}, offset {offset:+.6f}s, "
+                          f"leap {sample['leap']}, precision {sample['precision']}")
+                    count += 1
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            shm.close(remove=args.remove)
+        return
+
+    edge = None
+    if args.sim:
+        from gpsdo_sim import SimTransport, FakeGPIOEdge
+        transport = SimTransport(speed=args.speed)
+        driver    = GPSDODriver(transport=transport, cache=False)
+        if args.drdy_chip is not None:
+            edge = FakeGPIOEdge(transport.model, latency=args.drdy_latency * 1e-3)
+    else:
+        driver = GPSDODriver(speed=args.speed, cache=False)
+        if args.drdy_chip is not None:
+            edge = CdevGPIOEdge(args.drdy_chip, args.drdy_line)
+    feeder = GPSDOSHMFeeder(driver, shm, poll=args.poll, window=args.window, min_accuracy=args.min_accuracy,
+        edge=edge, latency=args.drdy_latency * 1e-3, fit_size=args.fit_size)
+
+    def report(sample):
+        if args.quiet:
+            return
+        leap = {None: "no PPS, skipped", LEAP_NOWARNING: "synchronized", LEAP_NOTINSYNC: "not in sync"}[sample["leap"]]
+        print(f"PPS {sample['pps']['time']:20d} | count {sample['pps']['count']:10d} | clock {sample['clock_ns']//1000000000} | "
+              f"offset {(sample['clock_ns'] - sample['receive_ns'])/1e3:+10.1f}us | fit {(sample['receive_ns'] - sample['observed_ns'])/1e3:+8.1f}us | "
+              f"window {sample['window_ns']/1e3:7.1f}us | {leap}")
+
+    print(f"Feeding NTP SHM unit {args.unit} (key 0x{shm.key:08X}).")
+    try:
+        feeder.run(num=args.num, callback=report)
+    except KeyboardInterrupt:
+        print("\nFeeder stopped.")
+    finally:
+        print(f"{feeder.stats['samples']} samples ({feeder.stats['unsynced']} not in sync), {feeder.stats['skipped']} skipped, "
+              f"{feeder.stats['stale']} Data Ready edges without new PPS.")
+        driver.close()
+        shm.close(remove=args.remove)
+        if edge is not None:
+            edge.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Simulated gpsdocfg backend for LimePSB-RPCM host tooling (https://github.com/myriadrf/LimePSB_RPCM_GW)
+#
+
+import os
+import sys
+import time
+import random
+import threading
+import collections
+import argparse
+import statistics
+
+from test_gpsdo import *
+
+# gpsdocfg reset values, shared with the gateware.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "hdl", "gpsdocfg", "src"))
+from gpsdocfg import gpsdocfg_mem_defaults, gpsdocfg_dac_init_default
+
+# Constants ----------------------------------------------------------------------------------------
+
+# gpsdocfg module address (maddress, hard wired to 0 in GPSDOCFG).
+GPSDOCFG_MADDRESS     = 0
+
+# VCTCXO clock frequencies selected by CLK_SEL (0: 30.72MHz LMKRF, 1: 10MHz LMK10).
+CLK_SEL_FREQS         = [30.72e6, 10e6]
+
+# PPSDO Model --------------------------------------------------------------------------------------
+
+class PPSDOModel:
+    """
+    Behavioural model of the PPSDO core status outputs.
+
+    The VCTCXO runs at `CLK_SEL_FREQS[clk_sel] * (1 + y)` with y = offset_ppm + DAC pulling + white
+    frequency noise; one PPS is generated per simulated second (`clock()` scaled by `speedup`). The
+    errors are the counts over 1s/10s/100s (intervals aligned on enable) minus the configured
+    targets, accuracy/state follow the configured tolerances of the intervals measured since enable.
+    The DAC value is not regulated: it stays at `dac` unless changed (or set to DAC_INIT on enable
+    when warm start is enabled and supported: `warm_start`, STATUS DAC_INIT_CAP).
+
+    The SoC-level SEQ and telemetry history are also modelled: incremented/one entry per PPS edge
+    (only while `pps_active`), `hist_depth` entries max.
+    """
+    def __init__(self, offset_ppm=0.05, noise_ppb=1.0, dac=0x8000, dac_gain_ppb=0.15, pps_active=True,
+        speedup=1.0, clock=time.monotonic, seed=None, hist_depth=256, warm_start=True):
+        self.offset_ppm   = offset_ppm
+        self.noise_ppb    = noise_ppb
+        self.dac          = dac
+        self.dac_gain_ppb = dac_gain_ppb
+        self.pps_active   = pps_active
+        self.warm_start   = warm_start
+        self.speedup      = speedup
+        self.clock        = clock
+        self.random       = random.Random(seed)
+
+        # Status outputs.
+        self.one_s_error     = 0
+        self.ten_s_error     = 0
+        self.hundred_s_error = 0
+        self.accuracy        = 0
+        self.state           = 0
+        self.seq             = 0
+        self.history         = collections.deque(maxlen=hist_depth)
+        self.pps_time        = 0 # rf clock counter latched on the last PPS.
+        self.pps_count       = 0 # rf clock cycles between the last two PPS (0 on the first one).
+        self.pps_seen        = False
+        self.enabled         = False
+
+        # # #
+
+        self.t0       = clock()
+        self.ticks    = 0
+        self.phase    = 0.0 # Fractional clock cycles carried between seconds.
+        self.counts   = []  # Counts of the last 100 seconds.
+        self.measured = 0   # Intervals (1s/10s/100s) measured since enable.
+        self.uptime   = 0   # Seconds since enable (10s/100s intervals aligned on enable).
+
+    def frequency(self, clk_sel):
+        y  = self.offset_ppm * 1e-6
+        y += (self.dac - 0x8000) * self.dac_gain_ppb * 1e-9
+        y += self.random.gauss(0.0, self.noise_ppb * 1e-9)
+        return CLK_SEL_FREQS[clk_sel] * (1 + y)
+
+    @property
+    def status(self):
+        """STATUS register layout."""
+        return (int(self.warm_start) << 9) | (int(self.pps_active) << 8) | (self.accuracy << 4) | self.state
+
+    def update(self, config):
+        """Advance the model to the current time, generating the elapsed PPS ticks."""
+        ticks = int((self.clock() - self.t0) * self.speedup)
+        while self.ticks < ticks:
+            self.ticks += 1
+            self.step(config)
+            # SoC-level per-PPS events (PPS edges only): sequence counter and history entry.
+            if self.pps_active:
+                self.seq = (self.seq + 1) & 0xFFFF
+                self.history.append(self.one_s_error & 0xFFFFFFFF | (self.dac << 32) | ((self.status & 0x1FF) << 48))
+
+    def step(self, config):
+        """Process one PPS tick."""
+        if not self.pps_active:
+            return
+
+        # Enable: intervals are measured again, warm start from DAC_INIT.
+        if config["en"] and not self.enabled:
+            self.counts   = []
+            self.measured = 0
+            self.uptime   = 0
+            if config.get("dac_init_en") and self.warm_start:
+                self.dac = config["dac_init"]
+        self.enabled = bool(config["en"])
+
+        # Count VCTCXO cycles over the last second.
+        cycles      = self.frequency(config["clk_sel"]) + self.phase
+        count       = int(cycles)
+        self.phase  = cycles - count
+        self.counts = (self.counts + [count])[-100:]
+
+        # PPS timestamp (free-running rf clock counter).
+        self.pps_time  = (self.pps_time + count) & (2**64 - 1)
+        self.pps_count = count if self.pps_seen else 0
+        self.pps_seen  = True
+
+        if not config["en"]:
+            self.accuracy = 0
+            self.state    = 0
+            return
+
+        # Publish errors.
+        self.one_s_error = count - config["one_s_target"]
+        self.uptime  += 1
+        self.measured = max(self.measured, 1)
+        if self.uptime % 10 == 0:
+            self.ten_s_error = sum(self.counts[-10:]) - config["ten_s_target"]
+            self.measured    = max(self.measured, 2)
+        if self.uptime % 100 == 0:
+            self.hundred_s_error = sum(self.counts) - config["hundred_s_target"]
+            self.measured        = 3
+
+        # Accuracy/State from tolerances (of the intervals measured since enable).
+        accuracy = 0
+        for error, tol in [
+            (self.one_s_error,     config["one_s_tol"]),
+            (self.ten_s_error,     config["ten_s_tol"]),
+            (self.hundred_s_error, config["hundred_s_tol"])][:self.measured]:
+            if abs(error) > tol:
+                break
+            accuracy += 1
+        self.accuracy = accuracy
+        self.state    = 1 if accuracy > 0 else 0
+
+# GPSDOCFG Model -----------------------------------------------------------------------------------
+
+class GPSDOCFGModel:
+    """
+    Bit-level model of the gpsdocfg SPI slave (mcfg32wm_fsm + gpsdocfg register file).
+
+    Frames follow doc/spi_waveforms.txt: a 16-bit instruction (W/R bit, BURST bit, module address,
+    5-bit register address) followed by 16-bit data words, MSB first. MISO is only driven during
+    the data phase of read cycles addressed to this module.
+    """
+    def __init__(self, ppsdo=None, maddress=GPSDOCFG_MADDRESS):
+        self.ppsdo    = PPSDOModel() if ppsdo is None else ppsdo
+        self.maddress = maddress
+        self.reset()
+
+    def reset(self):
+        self.mem  = list(gpsdocfg_mem_defaults)
+        self.snap = [0] * (REG_STATUS - REG_PPS_1S_ERR_H + 1) # Snapshot of 0x0B-0x11.
+        self.snap_hist = 0
+        self.snap_pps  = 0 # PPS_TIME0-3, PPS_CNT_L/H.
+        self.scratch   = 0
+        self.dac_init  = gpsdocfg_dac_init_default
+
+    @property
+    def config(self):
+        """Decoded configuration outputs (IICFG_*_out)."""
+        mem = self.mem
+        return {
+            "en"               : (mem[0] >> 0) & 0b1,
+            "clk_sel"          : (mem[0] >> 1) & 0b1,
+            "tpulse_sel"       : (mem[0] >> 2) & 0b11,
+            "rpi_sync_in_dir"  : (mem[0] >> 4) & 0b1,
+            "dac_init_en"      : (mem[0] >> 5) & 0b1,
+            "dac_init"         : self.dac_init,
+            "one_s_target"     : (mem[2] << 16) | mem[1],
+            "one_s_tol"        : mem[3],
+            "ten_s_target"     : (mem[5] << 16) | mem[4],
+            "ten_s_tol"        : mem[6],
+            "hundred_s_target" : (mem[8] << 16) | mem[7],
+            "hundred_s_tol"    : mem[9],
+        }
+
+    def load(self, address):
+        """Data output register load (read mux), including the status record latch."""
+        ppsdo = self.ppsdo
+        if address == REG_PPS_1S_ERR_L:
+            self.snap = [
+                (ppsdo.one_s_error     >> 16) & 0xFFFF,
+                (ppsdo.ten_s_error     >>  0) & 0xFFFF,
+                (ppsdo.ten_s_error     >> 16) & 0xFFFF,
+                (ppsdo.hundred_s_error >>  0) & 0xFFFF,
+                (ppsdo.hundred_s_error >> 16) & 0xFFFF,
+                ppsdo.dac & 0xFFFF,
+                ppsdo.status,
+            ]
+            return ppsdo.one_s_error & 0xFFFF
+        if REG_PPS_1S_ERR_H <= address <= REG_STATUS:
+            return self.snap[address - REG_PPS_1S_ERR_H]
+        if address == REG_SEQ:
+            return ppsdo.seq
+        if address == REG_HIST_LEVEL:
+            return len(ppsdo.history)
+        if address == REG_HIST_DATA0:
+            self.snap_hist = ppsdo.history[0] if ppsdo.history else 0
+        if REG_HIST_DATA0 <= address <= REG_HIST_DATA3:
+            return (self.snap_hist >> (16 * (address - REG_HIST_DATA0))) & 0xFFFF
+        if address == REG_SCRATCH:
+            return self.scratch
+        if address == REG_DAC_INIT:
+            return self.dac_init
+        if address == REG_PPS_TIME0:
+            self.snap_pps = ppsdo.pps_time | (ppsdo.pps_count << 64)
+        if REG_PPS_TIME0 <= address <= REG_PPS_CNT_H:
+            return (self.snap_pps >> (16 * (address - REG_PPS_TIME0))) & 0xFFFF
+        if address < len(self.mem):
+            return self.mem[address]
+        return 0x0000
+
+    def store(self, address, value):
+        """Configuration memory write."""
+        if address == REG_HIST_LEVEL:
+            if self.ppsdo.history:
+                self.ppsdo.history.popleft()
+        elif address == REG_SCRATCH:
+            self.scratch = value
+        elif address == REG_DAC_INIT:
+            self.dac_init = value
+        elif address < len(self.mem):
+            self.mem[address] = value
+
+    def transfer(self, frame):
+        """Clock one chip-select cycle (bytes, MSB first) through the slave and return MISO bytes."""
+        self.ppsdo.update(self.config)
+        miso  = []
+        inst  = 0
+        count = 0 # Bits in current instruction/data word.
+        data  = None # None: instruction phase.
+        dout  = 0
+        for byte in frame:
+            rx = 0
+            for bit in range(7, -1, -1):
+                sdin = (byte >> bit) & 1
+                selected = ((inst >> 5) & 0x1FF) == self.maddress
+                write    = (inst >> 15) & 1
+                burst    = (inst >> 14) & 1
+                # Instruction phase.
+                if data is None:
+                    rx    = (rx << 1)
+                    inst  = ((inst << 1) | sdin) & 0xFFFF
+                    count += 1
+                    if count == 16:
+                        count = 0
+                        data  = 0
+                        if not ((inst >> 15) & 1):
+                            dout = self.load(inst & 0x1F)
+                # Data phase.
+                else:
+                    oe    = selected and not write
+                    rx    = (rx << 1) | (((dout >> (15 - count)) & 1) if oe else 0)
+                    data  = ((data << 1) | sdin) & 0xFFFF
+                    count += 1
+                    if count == 16:
+                        count = 0
+                        if selected and write:
+                            self.store(inst & 0x1F, data)
+                        if selected and burst:
+                            inst = (inst & ~0x1F) | ((inst + 1) & 0x1F)
+                            data = 0
+                            if not write:
+                                dout = self.load(inst & 0x1F)
+                        else:
+                            inst = 0
+                            data = None
+            miso.append(rx)
+        return miso
+
+# Sim Transport ------------------------------------------------------------------------------------
+
+class SimTransport(SPITransport):
+    """
+    In-process SPI transport to a GPSDOCFGModel.
+
+    With `realtime`, each frame also takes its SPI wire time at `speed`. Above `max_speed`, MISO
+    bits are flipped with a probability growing with the speed (link characterization tests).
+    """
+    def __init__(self, model=None, speed=500000, realtime=False, max_speed=None, seed=None):
+        self.model     = GPSDOCFGModel() if model is None else model
+        self.speed     = speed
+        self.realtime  = realtime
+        self.max_speed = max_speed
+        self.random    = random.Random(seed)
+        self.frames   = 0
+        self.bits     = 0
+
+    def xfer(self, frame):
+        self.frames += 1
+        self.bits   += 8 * len(frame)
+        if self.realtime:
+            time.sleep(8 * len(frame) / self.speed)
+        miso = self.model.transfer(frame)
+        if self.max_speed is not None and self.speed > self.max_speed:
+            ber  = min(0.5, 1e-3 * self.speed / self.max_speed)
+            miso = [byte ^ sum(1 << bit for bit in range(8) if self.random.random() < ber) for byte in miso]
+        return miso
+
+# Fake GPIO Edge -----------------------------------------------------------------------------------
+
+class FakeGPIOEdge(GPIOEdge):
+    """
+    Fake Data Ready GPIO edge.
+
+    Edges are generated by trigger() or, when a GPSDOCFGModel is given, `latency` seconds after each
+    simulated PPS (gateware --pps-status-latency); `timestamp_ns` is the (CLOCK_REALTIME) wake-up
+    time of the last edge.
+    """
+    def __init__(self, model=None, latency=100e-3):
+        self.model        = model
+        self.latency      = latency
+        self.event        = threading.Event()
+        self.timestamp_ns = None
+
+    def trigger(self):
+        self.event.set()
+
+    def wait(self, timeout=None):
+        if self.model is not None:
+            # Sleep until the next simulated PPS (bounded by timeout).
+            ppsdo = self.model.ppsdo
+            delay = (ppsdo.ticks + 1) / ppsdo.speedup - (ppsdo.clock() - ppsdo.t0) + self.latency
+            if timeout is not None and delay > timeout:
+                time.sleep(timeout)
+                return False
+            time.sleep(max(delay, 0))
+            self.timestamp_ns = time.clock_gettime_ns(time.CLOCK_REALTIME)
+            return True
+        if not self.event.wait(timeout):
+            return False
+        self.event.clear()
+        self.timestamp_ns = time.clock_gettime_ns(time.CLOCK_REALTIME)
+        return True
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def run_benchmark(driver, num=1000):
+    ops = {
+        "read_register" : lambda: driver.read_register(REG_SEQ), # Live register (no snapshot).
+        "get_1s_error"  : lambda: driver.get_1s_error(),
+        "get_status"    : lambda: driver.get_status(),
+        "get_snapshot"  : lambda: driver.get_snapshot(),
+        "get_sample"    : lambda: driver.get_sample(),
+        "dump"          : lambda: driver.read_block(REG_CONTROL, REG_STATUS + 1),
+    }
+    transport = driver.transport
+
+    print(f"Operation     | Ops/s    | Mean (us) | P99 (us) | Frames/Op | Bits/Op | Wire (us) @ {transport.speed/1e3:g}kHz")
+    for name, op in ops.items():
+        frames, bits = transport.frames, transport.bits
+        latencies    = []
+        for i in range(num):
+            start = time.perf_counter()
+            op()
+            latencies.append(time.perf_counter() - start)
+        frames = (transport.frames - frames) / num
+        bits   = (transport.bits   - bits)   / num
+        mean   = statistics.mean(latencies)
+        p99    = sorted(latencies)[int(0.99 * (num - 1))]
+        print(f"{name:13} | {1/mean:8.0f} | {mean*1e6:9.1f} | {p99*1e6:8.1f} | {frames:9.1f} | {bits:7.0f} | {bits/transport.speed*1e6:9.1f}")
+
+# Main ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="GPSDO driver benchmark against the simulated gpsdocfg backend")
+    parser.add_argument("--num",        default=1000,   type=int,   help="Iterations per operation")
+    parser.add_argument("--speed",      default=500000, type=int,   help="Simulated SPI clock (Hz)")
+    parser.add_argument("--realtime",   action="store_true",        help="Include SPI wire time in transfers")
+    parser.add_argument("--offset-ppm", default=0.05,   type=float, help="VCTCXO frequency offset (ppm)")
+    parser.add_argument("--speedup",    default=1.0,    type=float, help="Simulated seconds per wall-clock second")
+    args = parser.parse_args()
+
+    ppsdo     = PPSDOModel(offset_ppm=args.offset_ppm, speedup=args.speedup)
+    transport = SimTransport(GPSDOCFGModel(ppsdo), speed=args.speed, realtime=args.realtime)
+    driver    = GPSDODriver(transport=transport)
+    try:
+        enable_gpsdo(driver)
+        run_benchmark(driver, num=args.num)
+    finally:
+        driver.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Thin gpsdod client (no driver/spidev import, starts in milliseconds).
+#
+
+import os
+import sys
+import json
+import socket
+import argparse
+
+GPSDOD_SOCKET = os.environ.get("GPSDOD_SOCKET", "/tmp/gpsdod.sock")
+
+# Client -------------------------------------------------------------------------------------------
+
+class GPSDOClient:
+    """gpsdod Unix socket client: one JSON request/reply line per call."""
+    def __init__(self, path=GPSDOD_SOCKET, timeout=10.0):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self.file = self.sock.makefile("rwb")
+
+    def call(self, cmd, **kwargs):
+        self.file.write((json.dumps(dict(cmd=cmd, **kwargs)) + "\n").encode())
+        self.file.flush()
+        reply = json.loads(self.file.readline())
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="gpsdod client")
+    parser.add_argument("--socket", default=GPSDOD_SOCKET, help="gpsdod Unix socket path")
+    subparsers = parser.add_subparsers(dest="cmd", required=True)
+    subparsers.add_parser("sample",  help="Last status record (cached per PPS)")
+    subparsers.add_parser("status",  help="Decoded state/accuracy/timepulse")
+    subparsers.add_parser("dump",    help="Dump registers")
+    subparsers.add_parser("stats",   help="Daemon statistics")
+    subparsers.add_parser("disable", help="Disable GPSDO")
+    read = subparsers.add_parser("read", help="Read register")
+    read.add_argument("address", type=lambda v: int(v, 0))
+    write = subparsers.add_parser("write", help="Write register")
+    write.add_argument("address", type=lambda v: int(v, 0))
+    write.add_argument("value",   type=lambda v: int(v, 0))
+    enable = subparsers.add_parser("enable", help="Configure and enable GPSDO")
+    enable.add_argument("--clk-freq", default=30.72, type=float, help="Clock frequency in MHz (10 or 30.72)")
+    enable.add_argument("--ppm",      default=0.1,   type=float, help="Tolerance in ppm")
+    enable.add_argument("--warm-start", action="store_true",     help="Seed the regulation loop with the saved DAC value")
+    reset = subparsers.add_parser("reset", help="Reset GPSDO (disable then re-enable)")
+    reset.add_argument("--reset-delay", default=2.0, type=float, help="Delay after disable before re-enable (seconds)")
+    reset.add_argument("--warm-start",  action="store_true",     help="Seed the regulation loop with the saved DAC value")
+    subparsers.add_parser("save_dac", help="Save the DAC value if converged (warm start)")
+    history = subparsers.add_parser("history", help="Drain on-FPGA telemetry history")
+    history.add_argument("--num", default=0, type=int, help="Max entries (0 for all)")
+    args = parser.parse_args()
+
+    kwargs = {k: v for k, v in vars(args).items() if k not in ["socket", "cmd"]}
+    try:
+        client = GPSDOClient(args.socket)
+    except OSError as e:
+        print(f"Unable to connect to gpsdod on {args.socket}: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        result = client.call(args.cmd, **kwargs)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        client.close()
+
+    if args.cmd == "dump":
+        for address, value in enumerate(result):
+            print(f"0x{address:04X}: 0x{value:04X}")
+    elif args.cmd == "read":
+        print(f"0x{result:04X}")
+    elif result is not None:
+        print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# GPSDO daemon: owns the GPSDODriver and serves clients (gpsdoctl.py) on a Unix socket.
+#
+
+import os
+import sys
+import json
+import time
+import errno
+import socket
+import threading
+import signal
+import argparse
+import socketserver
+
+from test_gpsdo import *
+
+# Constants ----------------------------------------------------------------------------------------
+
+GPSDOD_SOCKET = os.environ.get("GPSDOD_SOCKET", "/tmp/gpsdod.sock")
+
+# GPSDO Service ------------------------------------------------------------------------------------
+
+class GPSDOService:
+    """
+    Serialized access to a GPSDODriver for many clients.
+
+    All SPI accesses run under a single lock, so read-modify-writes (e.g. CONTROL EN) from different
+    clients can't interleave. Samples are cached per status record: a sample request only reads SEQ
+    when the cache is older than `max_age`, and concurrent sample requests waiting on the lock reuse
+    the sample read by the first one (coalescing).
+    """
+    def __init__(self, driver, max_age=0.1, board_id="spi1.1", warm_start_file=WARM_START_FILE):
+        self.driver          = driver
+        self.max_age         = max_age
+        self.board_id        = board_id
+        self.warm_start_file = warm_start_file
+        self.lock            = threading.Lock()
+        self.sample          = None
+        self.time            = 0.0
+        self.stats           = {"requests": 0, "sample_reads": 0, "sample_hits": 0}
+
+    def get_sample(self):
+        request = time.monotonic()
+        with self.lock:
+            # Refreshed while waiting for the lock, or recent enough.
+            if self.sample is not None and (self.time >= request or request - self.time < self.max_age):
+                self.stats["sample_hits"] += 1
+                return self.sample
+            sample = self.driver.get_sample_if_changed(None if self.sample is None else self.sample["seq"])
+            if sample is not None:
+                self.sample = sample
+                self.stats["sample_reads"] += 1
+            self.time = time.monotonic()
+            return self.sample
+
+    def load_warm_start(self, clk_sel):
+        return load_warm_start(self.board_id, clk_sel, self.warm_start_file)
+
+    def handle(self, request):
+        """Execute one request ({"cmd": ..., args}) and return its result."""
+        self.stats["requests"] += 1
+        cmd = request.get("cmd")
+        if cmd == "sample":
+            return self.get_sample()
+        if cmd == "status":
+            return decode_status(self.get_sample()["status"])
+        if cmd == "stats":
+            return self.stats
+        with self.lock:
+            # Commands changing the GPSDO state invalidate the cached sample.
+            if cmd in ["write", "set_enabled", "enable", "disable", "reset"]:
+                self.sample = None
+            if cmd == "dump":
+                return self.driver.read_block(REG_CONTROL, REG_PPS_CNT_H + 1)
+            if cmd == "read":
+                return self.driver.read_register(int(request["address"]))
+            if cmd == "write":
+                self.driver.write_register(int(request["address"]), int(request["value"]))
+                return None
+            if cmd == "set_enabled":
+                self.driver.set_enabled(bool(request["enable"]))
+                return None
+            # Enable/Reset: return True if warm started (saved DAC value for the board/CLK_SEL).
+            if cmd == "enable":
+                clk_freq = request.get("clk_freq", 30.72)
+                dac_init = self.load_warm_start(gpsdo_config(clk_freq)["clk_sel"]) if request.get("warm_start") else None
+                return enable_gpsdo(self.driver, clk_freq_mhz=clk_freq, ppm=request.get("ppm", 0.1), dac_init=dac_init)
+            if cmd == "disable":
+                disable_gpsdo(self.driver)
+                return None
+            if cmd == "reset":
+                clk_sel  = get_field(self.driver.read_register(REG_CONTROL, cached=False), CONTROL_CLK_SEL_OFFSET, CONTROL_CLK_SEL_SIZE)
+                dac_init = self.load_warm_start(clk_sel) if request.get("warm_start") else None
+                return reset_gpsdo(self.driver, reset_delay=request.get("reset_delay", 2.0), dac_init=dac_init)
+            if cmd == "save_dac":
+                return save_warm_start(self.driver, self.board_id, self.warm_start_file)
+            if cmd == "history":
+                num = request.get("num", 0)
+                return list(self.driver.drain_history(max_entries=num if num > 0 else None))
+        raise ValueError(f"Unknown command {cmd}.")
+
+# Unix Socket Server -------------------------------------------------------------------------------
+
+class GPSDORequestHandler(socketserver.StreamRequestHandler):
+    """JSON lines protocol: one request per line, one {"ok": ..., "result"/"error": ...} reply per line."""
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = {"ok": True, "result": self.server.service.handle(json.loads(line))}
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+            self.wfile.flush()
+
+class GPSDOServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, service, mode=0o660):
+        # Only remove a stale socket: another daemon would drive the same SPI device.
+        if os.path.exists(path):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                if os.path.exists(path):
+                    os.unlink(path)
+            else:
+                raise OSError(errno.EADDRINUSE, f"gpsdod already running on {path}")
+            finally:
+                sock.close()
+        socketserver.UnixStreamServer.__init__(self, path, GPSDORequestHandler)
+        os.chmod(path, mode)
+        self.service = service
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        os.unlink(self.server_address)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="GPSDO daemon (Unix socket API, see gpsdoctl.py)")
+    parser.add_argument("--socket",     default=GPSDOD_SOCKET,       help="Unix socket path")
+    parser.add_argument("--spi-bus",    default=1,      type=int,   help="spidev bus")
+    parser.add_argument("--spi-device", default=1,      type=int,   help="spidev chip select")
+    parser.add_argument("--speed",      default=500000, type=int,   help="SPI clock frequency (Hz)")
+    parser.add_argument("--max-age",    default=0.1,    type=float, help="Sample cache validity before SEQ is polled again (seconds)")
+    parser.add_argument("--sim",        action="store_true",        help="Use simulated gpsdocfg backend instead of spidev")
+    parser.add_argument("--board-id",   default="spi1.1",           help="Board identifier for warm start state")
+    parser.add_argument("--warm-start-file", default=WARM_START_FILE, help="Warm start state file")
+    args = parser.parse_args()
+
+    if args.sim:
+        from gpsdo_sim import SimTransport
+        driver = GPSDODriver(transport=SimTransport(speed=args.speed), cache=False)
+    else:
+        driver = GPSDODriver(spi_bus=args.spi_bus, spi_device=args.spi_device, speed=args.speed, cache=False)
+    service = GPSDOService(driver, max_age=args.max_age, board_id=args.board_id, warm_start_file=args.warm_start_file)
+    try:
+        server = GPSDOServer(args.socket, service)
+    except OSError as e:
+        driver.close()
+        sys.exit(f"Unable to listen on {args.socket}: {e}")
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    print(f"gpsdod listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        driver.close()
+
+if __name__ == "__main__":
+    main()
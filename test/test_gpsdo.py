@@ -9,8 +9,13 @@
 # Test script for LimePSB-RPCM board (https://github.com/myriadrf/LimePSB_RPCM_GW)
 #
 
+import os
+import json
 import time
-import spidev
+import fcntl
+import select
+import struct
+import ctypes
 import argparse
 import math
 
@@ -35,6 +40,55 @@ REG_PPS_100S_ERR_L     = 0x000E
 REG_PPS_100S_ERR_H     = 0x000F
 REG_DAC_TUNED_VAL      = 0x0010
 REG_STATUS             = 0x0011
+REG_SEQ                = 0x0012
+REG_HIST_LEVEL         = 0x0013
+REG_HIST_DATA0         = 0x0014
+REG_HIST_DATA1         = 0x0015
+REG_HIST_DATA2         = 0x0016
+REG_HIST_DATA3         = 0x0017
+REG_SCRATCH            = 0x0018
+REG_DAC_INIT           = 0x0019
+REG_PPS_TIME0          = 0x001A
+REG_PPS_TIME1          = 0x001B
+REG_PPS_TIME2          = 0x001C
+REG_PPS_TIME3          = 0x001D
+REG_PPS_CNT_L          = 0x001E
+REG_PPS_CNT_H          = 0x001F
+
+# Configuration (R/W) registers: only changed by the host, can be shadowed.
+CONFIG_REGS            = range(REG_CONTROL, REG_PPS_100S_ERR_TOL + 1)
+
+# SPI link test patterns (written/read back through SCRATCH) and autotune speed steps (Hz).
+SCRATCH_PATTERNS       = [0x0000, 0xFFFF, 0xAAAA, 0x5555, 0xA55A, 0x5AA5, 0x00FF, 0xFF00, 0x8001, 0x7FFE]
+SPI_SPEEDS             = [500e3, 1e6, 2e6, 4e6, 5e6, 8e6, 10e6, 12.5e6, 16e6, 20e6, 25e6, 32e6]
+
+# Native (migen) gpsdocfg samples SPI in the sys clock domain: SCLK <= sys_clk_freq/8.
+NATIVE_GPSDOCFG_SCLK_DIV = 8
+
+# Instruction bits.
+INST_WRITE             = 0x8000 # 1: Write, 0: Read.
+INST_BURST             = 0x4000 # 1: Data words follow with auto-incremented address.
+
+# spidev ioctl (linux/spi/spidev.h).
+SPI_IOC_MAGIC          = ord("k")
+SPI_IOC_TRANSFER_FMT   = "<QQIIHBBBBBB" # struct spi_ioc_transfer (32 bytes).
+SPI_IOC_MAX_FRAMES     = 511  # SPI_IOC_MESSAGE(n) size field is 14-bit: n * 32 < 16384.
+SPIDEV_BUFSIZ          = 4096 # spidev default bufsiz: max data bytes per message.
+
+# Helper function to compute the SPI_IOC_MESSAGE(n) ioctl request (_IOW('k', 0, char[n * 32])).
+def spi_ioc_message(n):
+    size = n * struct.calcsize(SPI_IOC_TRANSFER_FMT)
+    if not 0 < n <= SPI_IOC_MAX_FRAMES:
+        raise ValueError(f"SPI_IOC_MESSAGE({n}): 1 to {SPI_IOC_MAX_FRAMES} transfers per message.")
+    return (1 << 30) | (size << 16) | (SPI_IOC_MAGIC << 8) | 0
+
+# GPIO character device uAPI v2 (linux/gpio.h).
+GPIO_V2_LINE_REQUEST_FMT    = "<64I32sQI5I" + "IIQQ" * 10 + "II5Ii" # struct gpio_v2_line_request (592 bytes).
+GPIO_V2_LINE_EVENT_FMT      = "<QIIII6I" # struct gpio_v2_line_event (48 bytes).
+GPIO_V2_GET_LINE_IOCTL      = (3 << 30) | (struct.calcsize(GPIO_V2_LINE_REQUEST_FMT) << 16) | (0xB4 << 8) | 0x07
+GPIO_V2_LINE_FLAG_INPUT     = 1 << 2
+GPIO_V2_LINE_FLAG_EDGE_RISING          = 1 << 3
+GPIO_V2_LINE_FLAG_EVENT_CLOCK_REALTIME = 1 << 11
 
 # Status bit fields
 STATUS_STATE_OFFSET    = 0
@@ -43,12 +97,19 @@ STATUS_ACCURACY_OFFSET = 4
 STATUS_ACCURACY_SIZE   = 4
 STATUS_TPULSE_OFFSET   = 8
 STATUS_TPULSE_SIZE     = 1
+STATUS_DAC_INIT_CAP_OFFSET = 9
+STATUS_DAC_INIT_CAP_SIZE   = 1
 
 # Control bit fields
 CONTROL_EN_OFFSET      = 0
 CONTROL_EN_SIZE        = 1
 CONTROL_CLK_SEL_OFFSET = 1
 CONTROL_CLK_SEL_SIZE   = 1
+CONTROL_DAC_INIT_EN_OFFSET = 5
+CONTROL_DAC_INIT_EN_SIZE   = 1
+
+# Warm start state file: converged DAC values per board and CLK_SEL.
+WARM_START_FILE        = os.path.join(os.environ.get("XDG_STATE_HOME", os.path.expanduser("~/.local/state")), "limepsb_rpcm", "warm_start.json")
 
 # Helper function to get a field from a register value.
 def get_field(reg_value, offset, size):
@@ -60,71 +121,476 @@ def set_field(reg_value, offset, size, value):
     mask = ((1 << size) - 1) << offset
     return (reg_value & ~mask) | ((value << offset) & mask)
 
-# GPSDODriver --------------------------------------------------------------------------------------
-
-class GPSDODriver:
+# Helper function to combine low/high registers into a signed 32-bit value.
+def to_signed_32bit(low, high):
+    value = (high << 16) | low
+    if value & (1 << 31):  # Sign extend if negative
+        value -= (1 << 32)
+    return value
+
+# Helper function to decode the status register.
+def decode_status(status):
+    state     = get_field(status, STATUS_STATE_OFFSET, STATUS_STATE_SIZE)
+    accuracy  = get_field(status, STATUS_ACCURACY_OFFSET, STATUS_ACCURACY_SIZE)
+    tpulse    = get_field(status, STATUS_TPULSE_OFFSET, STATUS_TPULSE_SIZE)
+    dac_init  = get_field(status, STATUS_DAC_INIT_CAP_OFFSET, STATUS_DAC_INIT_CAP_SIZE)
+    state_str = "Coarse Tune" if state == 0 else "Fine Tune" if state == 1 else f"Unknown ({state})"
+    accuracy_str = ['Disabled/Lowest', '1s Tune', '2s Tune', '3s Tune (Highest)'][accuracy] if accuracy < 4 else f"Unknown ({accuracy})"
+    return {
+        "state": state_str,
+        "accuracy": accuracy_str,
+        "tpulse_active": bool(tpulse),
+        "warm_start": bool(dac_init),
+    }
+
+# SPI Transports -----------------------------------------------------------------------------------
+
+class SPITransport:
     """
-    Driver for LimePSB-RPCM GPSDO gpsdocfg registers.
+    SPI transport interface used by GPSDODriver.
 
-    This driver handles SPI communication to read/write registers and decode values.
+    A transport exchanges full-duplex frames (lists of bytes); each frame is one chip-select cycle.
     """
+    speed = None
+
+    def xfer(self, frame):
+        """Transfer one frame and return the received bytes."""
+        raise NotImplementedError
+
+    def xfer_many(self, frames):
+        """Transfer several frames (CS toggled between frames) and return the received bytes of each."""
+        return [self.xfer(frame) for frame in frames]
+
+    def close(self):
+        pass
+
+class SpidevTransport(SPITransport):
+    """Linux spidev transport (e.g. /dev/spidev1.1 on the Raspberry Pi)."""
     def __init__(self, spi_bus=1, spi_device=1, speed=500000, mode=0):
+        import spidev
         self.spi              = spidev.SpiDev()
         self.spi.open(spi_bus, spi_device)
         self.spi.max_speed_hz = speed
         self.spi.mode         = mode
 
-    def read_register(self, address):
-        """Read a 16-bit register value."""
+    @property
+    def speed(self):
+        return self.spi.max_speed_hz
+
+    @speed.setter
+    def speed(self, value):
+        self.spi.max_speed_hz = value
+
+    def xfer(self, frame):
+        return self.spi.xfer2(list(frame))
+
+    def xfer_many(self, frames):
+        """
+        Transfer several frames with SPI_IOC_MESSAGE ioctls, toggling CS between frames.
+
+        Frames are sent in as few messages as possible: at most SPI_IOC_MAX_FRAMES frames and
+        SPIDEV_BUFSIZ data bytes per message.
+        """
+        rx_data = []
+        message = []
+        size    = 0
+        for frame in frames:
+            if message and (len(message) == SPI_IOC_MAX_FRAMES or size + len(frame) > SPIDEV_BUFSIZ):
+                rx_data += self._xfer_message(message)
+                message  = []
+                size     = 0
+            message.append(frame)
+            size += len(frame)
+        if message:
+            rx_data += self._xfer_message(message)
+        return rx_data
+
+    def _xfer_message(self, frames):
+        """Transfer frames in a single SPI_IOC_MESSAGE ioctl."""
+        bufs  = [ctypes.create_string_buffer(bytes(frame), len(frame)) for frame in frames]
+        xfers = bytearray() # Mutable: not subject to the 1024-byte ioctl argument limit.
+        for i, buf in enumerate(bufs):
+            xfers += struct.pack(SPI_IOC_TRANSFER_FMT,
+                ctypes.addressof(buf),           # tx_buf.
+                ctypes.addressof(buf),           # rx_buf (in-place).
+                len(buf),                        # len.
+                self.spi.max_speed_hz,           # speed_hz.
+                0,                               # delay_usecs.
+                8,                               # bits_per_word.
+                int(i < len(bufs) - 1),          # cs_change (deassert CS between frames).
+                0, 0, 0, 0,                      # tx_nbits, rx_nbits, word_delay_usecs, pad.
+            )
+        if len(xfers) != len(bufs) * struct.calcsize(SPI_IOC_TRANSFER_FMT):
+            raise ValueError(f"Packed spi_ioc_transfer array size mismatch ({len(xfers)} bytes).")
+        fcntl.ioctl(self.spi.fileno(), spi_ioc_message(len(bufs)), xfers)
+        return [list(buf.raw) for buf in bufs]
+
+    def close(self):
+        self.spi.close()
+
+# GPIO Edges ---------------------------------------------------------------------------------------
+
+class GPIOEdge:
+    """GPIO edge interface (e.g. gateware Data Ready output)."""
+    def wait(self, timeout=None):
+        """Wait for an edge; returns False on timeout (seconds, None: forever)."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SysfsGPIOEdge(GPIOEdge):
+    """
+    Linux sysfs GPIO edge (/sys/class/gpio/gpioN), waiting with poll() on POLLPRI.
+
+    `gpio` is the sysfs GPIO number (may include the gpiochip base offset on recent kernels).
+    """
+    def __init__(self, gpio, edge="rising"):
+        path = f"/sys/class/gpio/gpio{gpio}"
+        if not os.path.exists(path):
+            with open("/sys/class/gpio/export", "w") as f:
+                f.write(str(gpio))
+        with open(f"{path}/direction", "w") as f:
+            f.write("in")
+        with open(f"{path}/edge", "w") as f:
+            f.write(edge)
+        self.fd     = os.open(f"{path}/value", os.O_RDONLY)
+        self.poller = select.poll()
+        self.poller.register(self.fd, select.POLLPRI | select.POLLERR)
+        self._clear()
+
+    def _clear(self):
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.read(self.fd, 8)
+
+    def wait(self, timeout=None):
+        events = self.poller.poll(None if timeout is None else timeout * 1e3)
+        if not events:
+            return False
+        self._clear()
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+class CdevGPIOEdge(GPIOEdge):
+    """
+    Linux GPIO character device rising edge (/dev/gpiochipN line `line`, uAPI v2, Linux >= 5.11).
+
+    Edges are timestamped by the kernel in its interrupt handler (CLOCK_REALTIME): `timestamp_ns`
+    holds the timestamp of the last edge returned by wait().
+    """
+    def __init__(self, chip, line, consumer="gpsdo-drdy"):
+        flags   = GPIO_V2_LINE_FLAG_INPUT | GPIO_V2_LINE_FLAG_EDGE_RISING | GPIO_V2_LINE_FLAG_EVENT_CLOCK_REALTIME
+        request = bytearray(struct.pack(GPIO_V2_LINE_REQUEST_FMT,
+            line, *[0] * 63,                # offsets.
+            consumer.encode(),              # consumer.
+            flags, 0, *[0] * 5, *[0] * 40,  # config: flags, num_attrs, padding, attrs.
+            1, 0, *[0] * 5,                 # num_lines, event_buffer_size, padding.
+            0))                             # fd (returned).
+        chip_fd = os.open(f"/dev/gpiochip{chip}", os.O_RDONLY)
+        try:
+            fcntl.ioctl(chip_fd, GPIO_V2_GET_LINE_IOCTL, request)
+        finally:
+            os.close(chip_fd)
+        self.fd           = struct.unpack(GPIO_V2_LINE_REQUEST_FMT, request)[-1]
+        self.timestamp_ns = None
+        self.poller       = select.poll()
+        self.poller.register(self.fd, select.POLLIN | select.POLLERR)
+
+    def wait(self, timeout=None):
+        if not self.poller.poll(None if timeout is None else timeout * 1e3):
+            return False
+        event = os.read(self.fd, struct.calcsize(GPIO_V2_LINE_EVENT_FMT))
+        self.timestamp_ns = struct.unpack(GPIO_V2_LINE_EVENT_FMT, event)[0]
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+# GPSDODriver --------------------------------------------------------------------------------------
+
+class GPSDODriver:
+    """
+    Driver for LimePSB-RPCM GPSDO gpsdocfg registers.
+
+    This driver handles SPI communication to read/write registers and decode values.
+
+    Configuration registers (CONFIG_REGS) are kept in a write-through shadow cache when `cache` is
+    enabled: reads are served from the cache once a value is known, writes update both hardware and
+    cache. Status registers are never cached. The cache is never refreshed on its own (changes by
+    other hosts/processes or a reconfiguration are missed until verify_cache()/invalidate_cache()):
+    long-running monitors and daemons disable it.
+
+    SPI access goes through `transport` (a SPITransport); defaults to spidev on `spi_bus`/`spi_device`.
+    """
+    def __init__(self, spi_bus=1, spi_device=1, speed=500000, mode=0, cache=True, transport=None):
+        if transport is None:
+            transport = SpidevTransport(spi_bus, spi_device, speed=speed, mode=mode)
+        self.transport = transport
+        self.cache     = cache
+        self.shadow    = {}
+
+    def _update_shadow(self, address, value):
+        if self.cache and address in CONFIG_REGS:
+            self.shadow[address] = value & 0xFFFF
+
+    def invalidate_cache(self, addresses=None):
+        """Drop cached values (all of them or only `addresses`); next reads go to hardware."""
+        if addresses is None:
+            self.shadow.clear()
+        else:
+            for address in addresses:
+                self.shadow.pop(address, None)
+
+    def verify_cache(self):
+        """
+        Read back configuration registers and compare them with the shadow cache.
+
+        Mismatching entries are refreshed from hardware; returns the list of mismatching addresses.
+        """
+        cached     = dict(self.shadow)
+        values     = self.read_block(CONFIG_REGS.start, len(CONFIG_REGS)) # Also refreshes the cache.
+        mismatches = []
+        for address, value in zip(CONFIG_REGS, values):
+            if cached.get(address, value) != value:
+                mismatches.append(address)
+        return mismatches
+
+    def read_register(self, address, cached=True):
+        """Read a 16-bit register value (from hardware if not `cached`)."""
+        if cached and address in self.shadow:
+            return self.shadow[address]
         tx_data = [0x00, (address & 0xFF), 0x00, 0x00]
-        rx_data = self.spi.xfer2(tx_data)
+        rx_data = self.transport.xfer(tx_data)
         value   = (rx_data[2] << 8) | rx_data[3]
+        self._update_shadow(address, value)
         return value
 
     def write_register(self, address, value):
         """Write a 16-bit value to a register."""
         tx_data = [0x80, (address & 0xFF), (value >> 8) & 0xFF, value & 0xFF]
-        self.spi.xfer2(tx_data)
-
-    def get_signed_32bit(self, low_addr, high_addr):
-        """Get signed 32-bit value from low/high registers."""
-        low   = self.read_register(low_addr)
-        high  = self.read_register(high_addr)
-        value = (high << 16) | low
-        if value & (1 << 31):  # Sign extend if negative
-            value -= (1 << 32)
-        return value
+        self.transport.xfer(tx_data)
+        self._update_shadow(address, value)
+
+    def read_block(self, start, count):
+        """Read `count` consecutive 16-bit registers from `start` in a single burst transfer."""
+        tx_data = [INST_BURST >> 8, (start & 0xFF)] + [0x00, 0x00] * count
+        rx_data = self.transport.xfer(tx_data)
+        values  = [(rx_data[2 + 2*i] << 8) | rx_data[3 + 2*i] for i in range(count)]
+        for i, value in enumerate(values):
+            self._update_shadow(start + i, value)
+        return values
+
+    def write_block(self, start, values):
+        """Write consecutive 16-bit registers from `start` in a single burst transfer."""
+        tx_data = [(INST_WRITE | INST_BURST) >> 8, (start & 0xFF)]
+        for value in values:
+            tx_data += [(value >> 8) & 0xFF, value & 0xFF]
+        self.transport.xfer(tx_data)
+        for i, value in enumerate(values):
+            self._update_shadow(start + i, value)
+
+    def read_many(self, addresses, cached=True):
+        """Read several 16-bit registers (one frame each) with a single syscall."""
+        # Only registers missing from the shadow cache go on the bus (all of them if not `cached`).
+        uncached = [address for address in addresses if not cached or address not in self.shadow]
+        values   = {}
+        if uncached:
+            frames  = [[0x00, (address & 0xFF), 0x00, 0x00] for address in uncached]
+            rx_data = self.transport.xfer_many(frames)
+            for address, rx in zip(uncached, rx_data):
+                values[address] = (rx[2] << 8) | rx[3]
+                self._update_shadow(address, values[address])
+        return [values[address] if address in values else self.shadow[address] for address in addresses]
+
+    def get_snapshot(self):
+        """
+        Get a consistent status record (errors, DAC value and raw status) in a single transfer.
+
+        Reading PPS_1S_ERR_L latches the whole status record in gpsdocfg, the following registers
+        of the burst are then returned from that snapshot.
+        """
+        regs = self.read_block(REG_PPS_1S_ERR_L, REG_STATUS - REG_PPS_1S_ERR_L + 1)
+        return {
+            "error_1s"   : to_signed_32bit(regs[0], regs[1]),
+            "error_10s"  : to_signed_32bit(regs[2], regs[3]),
+            "error_100s" : to_signed_32bit(regs[4], regs[5]),
+            "dac"        : regs[6],
+            "status"     : regs[7],
+        }
+
+    def get_sample(self):
+        """Get enabled status, a consistent status record and the sequence counter with a single syscall."""
+        # CONTROL is always read from hardware: the enabled status must not come from the cache.
+        addresses = [REG_CONTROL] + list(range(REG_PPS_1S_ERR_L, REG_STATUS + 1)) + [REG_SEQ]
+        regs      = self.read_many(addresses, cached=False)
+        return {
+            "enabled"    : bool(regs[0] & 0x0001),
+            "error_1s"   : to_signed_32bit(regs[1], regs[2]),
+            "error_10s"  : to_signed_32bit(regs[3], regs[4]),
+            "error_100s" : to_signed_32bit(regs[5], regs[6]),
+            "dac"        : regs[7],
+            "status"     : regs[8],
+            "seq"        : regs[9],
+        }
+
+    def get_seq(self):
+        """Get sample sequence counter."""
+        return self.read_register(REG_SEQ)
+
+    def get_sample_if_changed(self, last_seq, retries=3):
+        """
+        Poll the sequence counter and only read a full sample when it differs from `last_seq`.
+
+        Returns the sample, or None when no new record was published.
+        """
+        seq = self.get_seq()
+        if seq == last_seq:
+            return None
+        for i in range(retries):
+            sample = self.get_sample()
+            # SEQ is read after the record latch: if unchanged, the record matches `seq`.
+            if sample["seq"] == seq:
+                break
+            seq = sample["seq"]
+        return sample
 
     def get_1s_error(self):
         """Get 1s error as signed 32-bit."""
-        return self.get_signed_32bit(REG_PPS_1S_ERR_L, REG_PPS_1S_ERR_H)
+        low, high = self.read_many([REG_PPS_1S_ERR_L, REG_PPS_1S_ERR_H])
+        return to_signed_32bit(low, high)
 
     def get_10s_error(self):
         """Get 10s error as signed 32-bit."""
-        return self.get_signed_32bit(REG_PPS_10S_ERR_L, REG_PPS_10S_ERR_H)
+        return self.get_snapshot()["error_10s"]
 
     def get_100s_error(self):
         """Get 100s error as signed 32-bit."""
-        return self.get_signed_32bit(REG_PPS_100S_ERR_L, REG_PPS_100S_ERR_H)
+        return self.get_snapshot()["error_100s"]
 
     def get_dac_value(self):
         """Get DAC tuned value."""
-        return self.read_register(REG_DAC_TUNED_VAL)
+        return self.get_snapshot()["dac"]
+
+    def has_warm_start(self):
+        """True if the gateware supports warm start (STATUS DAC_INIT_CAP, 0 on older gateware)."""
+        status = self.get_snapshot()["status"]
+        return bool(get_field(status, STATUS_DAC_INIT_CAP_OFFSET, STATUS_DAC_INIT_CAP_SIZE))
 
     def get_status(self):
-        """Get decoded status: state, accuracy, tpulse_active."""
-        status    = self.read_register(REG_STATUS)
-        state     = get_field(status, STATUS_STATE_OFFSET, STATUS_STATE_SIZE)
-        accuracy  = get_field(status, STATUS_ACCURACY_OFFSET, STATUS_ACCURACY_SIZE)
-        tpulse    = get_field(status, STATUS_TPULSE_OFFSET, STATUS_TPULSE_SIZE)
-        state_str = "Coarse Tune" if state == 0 else "Fine Tune" if state == 1 else f"Unknown ({state})"
-        accuracy_str = ['Disabled/Lowest', '1s Tune', '2s Tune', '3s Tune (Highest)'][accuracy] if accuracy < 4 else f"Unknown ({accuracy})"
+        """Get decoded status: state, accuracy, tpulse_active, warm_start."""
+        # PPS_1S_ERR_L is read first to latch the status record.
+        _, status = self.read_many([REG_PPS_1S_ERR_L, REG_STATUS])
+        return decode_status(status)
+
+    def wait_sample(self, edge, timeout=None):
+        """Wait for a Data Ready edge then read the new sample; returns None on timeout."""
+        if not edge.wait(timeout):
+            return None
+        return self.get_sample()
+
+    def get_pps_timestamp(self):
+        """
+        Get the rf clock counter latched on the last PPS and the rf cycles between the last two PPS.
+
+        Reading PPS_TIME0 latches both in gpsdocfg, the following registers of the burst are then
+        returned from that snapshot. The count is 0 after the first PPS (no previous PPS).
+        """
+        regs = self.read_block(REG_PPS_TIME0, REG_PPS_CNT_H - REG_PPS_TIME0 + 1)
         return {
-            "state": state_str,
-            "accuracy": accuracy_str,
-            "tpulse_active": bool(tpulse)
+            "time"  : regs[0] | (regs[1] << 16) | (regs[2] << 32) | (regs[3] << 48),
+            "count" : regs[4] | (regs[5] << 16),
         }
 
+    def get_history_level(self):
+        """Get number of entries in the on-FPGA telemetry history."""
+        return self.read_register(REG_HIST_LEVEL)
+
+    def drain_history(self, max_entries=None, batch=128):
+        """
+        Drain the on-FPGA telemetry history (oldest entry first).
+
+        Each entry is read with a burst over HIST_DATA0-3 (latching the FIFO head) and popped by a
+        write to HIST_LEVEL; the entries reported by HIST_LEVEL are transferred in batches of
+        `batch` entries (2 frames each, split by the transport in as few SPI_IOC_MESSAGE ioctls as
+        spidev allows). Yields dicts with error_1s, dac and raw status.
+        """
+        while max_entries is None or max_entries > 0:
+            level = min(self.get_history_level(), batch)
+            if max_entries is not None:
+                level = min(level, max_entries)
+                max_entries -= level
+            if level == 0:
+                return
+            frames = []
+            for i in range(level):
+                frames.append([INST_BURST >> 8, REG_HIST_DATA0] + [0x00, 0x00] * 4)
+                frames.append([INST_WRITE >> 8, REG_HIST_LEVEL, 0x00, 0x00])
+            rx_data = self.transport.xfer_many(frames)
+            for rx in rx_data[::2]:
+                words = [(rx[2 + 2*i] << 8) | rx[3 + 2*i] for i in range(4)]
+                yield {
+                    "error_1s" : to_signed_32bit(words[0], words[1]),
+                    "dac"      : words[2],
+                    "status"   : words[3],
+                }
+
+    def check_link(self, speed, patterns=SCRATCH_PATTERNS, iterations=1):
+        """
+        Read back `patterns` from SCRATCH at `speed` (one syscall per pattern).
+
+        Only reads go on the bus at `speed`: each pattern is written at the current (known good)
+        speed, which is restored before returning. Returns the number of mismatching read-backs.
+        """
+        initial = self.transport.speed
+        errors  = 0
+        try:
+            for pattern in patterns:
+                self.transport.speed = initial
+                self.write_register(REG_SCRATCH, pattern)
+                self.transport.speed = int(speed)
+                rx_data = self.transport.xfer_many([[0x00, REG_SCRATCH, 0x00, 0x00]] * iterations)
+                errors += sum(((rx[2] << 8) | rx[3]) != pattern for rx in rx_data)
+        finally:
+            self.transport.speed = initial
+        return errors
+
+    def autotune_speed(self, speeds=SPI_SPEEDS, margin=0.5, iterations=100, max_speed=None):
+        """
+        Find the fastest reliable SPI clock and select it with margin.
+
+        `speeds` (up to `max_speed`) are tried upward until a SCRATCH read-back fails; the selected
+        speed is the fastest tried speed <= `margin` x the last error-free one, verified again before
+        returning. The original speed is kept (and None returned) when even the lowest speed fails.
+
+        A corrupted read frame can be decoded as a write (CONTROL, targets, history pop...): the
+        configuration registers are read before the probe and restored at the selected speed if
+        changed, the cache being invalidated.
+        """
+        speeds   = sorted(s for s in speeds if max_speed is None or s <= max_speed)
+        config   = self.read_block(CONFIG_REGS.start, len(CONFIG_REGS))
+        passed   = None
+        selected = None
+        for speed in speeds:
+            if self.check_link(speed, iterations=iterations):
+                break
+            passed = speed
+        if passed is not None:
+            speed = max([s for s in speeds if s <= margin * passed] or speeds[:1])
+            if self.check_link(speed, iterations=iterations) == 0:
+                selected = int(speed)
+                self.transport.speed = selected
+
+        # Restore the configuration if changed by a corrupted frame.
+        self.invalidate_cache()
+        if self.read_block(CONFIG_REGS.start, len(CONFIG_REGS)) != config:
+            self.write_block(CONFIG_REGS.start, config)
+            if self.read_block(CONFIG_REGS.start, len(CONFIG_REGS)) != config:
+                raise IOError("Configuration registers changed during SPI autotune and could not be restored.")
+        self.invalidate_cache()
+        return selected
+
     def get_enabled(self):
         """Get enabled status from control register."""
         control = self.read_register(REG_CONTROL)
@@ -138,11 +604,11 @@ class GPSDODriver:
 
     def close(self):
         """Close the SPI connection."""
-        self.spi.close()
+        self.transport.close()
 
 # Test Functions -----------------------------------------------------------------------------------
 
-def run_monitoring(driver, num_dumps=0, delay=1.0, banner_interval=10):
+def run_monitoring(driver, num_dumps=0, delay=1.0, banner_interval=10, on_change=False, drdy=None, record=None):
     # Header banner
     header = "Dump | Enabled | 1s Error | 10s Error | 100s Error | DAC Value | State        | Accuracy          | TPulse"
 
@@ -150,14 +616,34 @@ def run_monitoring(driver, num_dumps=0, delay=1.0, banner_interval=10):
     print(header)
 
     dump_count = 0
+    last_seq   = None
     try:
         while num_dumps == 0 or dump_count < num_dumps:
-            enabled   = driver.get_enabled()
-            error_1s  = driver.get_1s_error()
-            error_10s = driver.get_10s_error()
-            error_100s = driver.get_100s_error()
-            dac       = driver.get_dac_value()
-            status    = driver.get_status()
+            # Data Ready: wait for the gateware pulse, read the new sample right away.
+            if drdy is not None:
+                sample = driver.wait_sample(drdy, timeout=2.0)
+                if sample is None:
+                    continue
+            # On change: only poll SEQ, read the full sample when a new record is published.
+            elif on_change:
+                sample = driver.get_sample_if_changed(last_seq)
+                if sample is None:
+                    time.sleep(delay)
+                    continue
+                last_seq = sample["seq"]
+            else:
+                sample = driver.get_sample()
+            enabled    = sample["enabled"]
+            error_1s   = sample["error_1s"]
+            error_10s  = sample["error_10s"]
+            error_100s = sample["error_100s"]
+            dac        = sample["dac"]
+            status     = decode_status(sample["status"])
+
+            # Binary record.
+            if record is not None:
+                record.write(time.time(), sample)
+                record.flush()
 
             # Single-line output
             print(f"{dump_count + 1:4d} | {str(enabled):7} | {error_1s:8d} | {error_10s:9d} | {error_100s:10d} | 0x{dac:04X}    | {status['state']:12} | {status['accuracy']:17} | {str(status['tpulse_active']):6}")
@@ -168,7 +654,7 @@ def run_monitoring(driver, num_dumps=0, delay=1.0, banner_interval=10):
             if dump_count % banner_interval == 0:
                 print(header)
 
-            if num_dumps == 0 or dump_count < num_dumps:
+            if (num_dumps == 0 or dump_count < num_dumps) and drdy is None:
                 time.sleep(delay)
     except KeyboardInterrupt:
         print("\nMonitoring stopped.")
@@ -201,33 +687,87 @@ def dump_registers(driver, num_dumps=1, delay=1.0):
             REG_PPS_100S_ERR_L,
             REG_PPS_100S_ERR_H,
             REG_DAC_TUNED_VAL,
-            REG_STATUS
+            REG_STATUS,
+            REG_SEQ,
+            REG_HIST_LEVEL,
+            REG_HIST_DATA0,
+            REG_HIST_DATA1,
+            REG_HIST_DATA2,
+            REG_HIST_DATA3,
+            REG_SCRATCH,
+            REG_DAC_INIT,
+            REG_PPS_TIME0,
+            REG_PPS_TIME1,
+            REG_PPS_TIME2,
+            REG_PPS_TIME3,
+            REG_PPS_CNT_L,
+            REG_PPS_CNT_H,
         ]
 
-        for addr in regs:
-            value    = driver.read_register(addr)
+        # Registers are contiguous: read them in a single burst.
+        values = driver.read_block(regs[0], len(regs))
+        for addr, value in zip(regs, values):
             reg_name = reg_names.get(addr, "UNKNOWN")
             print(f"0x{addr:04X} ({reg_name:{max_name_len}}): 0x{value:04X}")
 
-def reset_gpsdo(driver, reset_delay=2.0):
+def autotune_spi(driver, margin=0.5, max_speed=None):
+    print("Auto-tuning SPI clock (SCRATCH read-back)" + (f", up to {max_speed/1e3:g}kHz:" if max_speed else ":"))
+    speed = driver.autotune_speed(margin=margin, max_speed=max_speed)
+    if speed is None:
+        print(f"SPI link unreliable at all speeds, keeping {driver.transport.speed/1e3:g}kHz.")
+    else:
+        print(f"SPI clock set to {speed/1e3:g}kHz ({margin:g} margin).")
+
+def check_warm_start(driver, dac_init):
+    """`dac_init` if the gateware supports warm start, None (cold start) otherwise."""
+    if dac_init is not None and not driver.has_warm_start():
+        print(f"Warm start not supported by the gateware (DAC_INIT_CAP=0), DAC=0x{dac_init:04X} ignored, cold start.")
+        return None
+    return dac_init
+
+def reset_gpsdo(driver, reset_delay=2.0, dac_init=None):
     print("Resetting GPSDO...")
+    driver.invalidate_cache() # Start from the hardware state.
     driver.set_enabled(False)
     time.sleep(reset_delay)  # Wait for disable to take effect
+    dac_init = check_warm_start(driver, dac_init)
+    if dac_init is not None:
+        driver.write_register(REG_DAC_INIT, dac_init)
+        control = driver.read_register(REG_CONTROL)
+        driver.write_register(REG_CONTROL, set_field(control, CONTROL_DAC_INIT_EN_OFFSET, CONTROL_DAC_INIT_EN_SIZE, 1))
     driver.set_enabled(True)
-    print("GPSDO reset complete (re-enabled).")
+    print("GPSDO reset complete (re-enabled" + (f", warm start DAC=0x{dac_init:04X})." if dac_init is not None else ")."))
+    return dac_init is not None
 
-def enable_gpsdo(driver, clk_freq_mhz=30.72, ppm=0.1):
+def gpsdo_config(clk_freq_mhz=30.72, ppm=0.1):
+    """Targets/tolerances (gpsdocfg config names) for a clock frequency and ppm tolerance."""
     freq = clk_freq_mhz * 1e6
 
-    # Compute targets (expected counter values for intervals).
-    target_1s   = int(freq)
-    target_10s  = int(10 * freq)
-    target_100s = int(100 * freq)
-
     # Compute tolerances in Hz for constant ppm across intervals.
-    tol_1s_hz   = round(freq * ppm / 1e6)
-    tol_10s_hz  = tol_1s_hz * 10
-    tol_100s_hz = tol_1s_hz * 100
+    tol_1s_hz = round(freq * ppm / 1e6)
+
+    return {
+        # Set CLK_SEL (0: 30.72MHz LMKRF, 1: 10MHz LMK10).
+        "clk_sel"          : 1 if math.isclose(clk_freq_mhz, 10.0) else 0,
+        # Compute targets (expected counter values for intervals).
+        "one_s_target"     : int(freq),
+        "ten_s_target"     : int(10 * freq),
+        "hundred_s_target" : int(100 * freq),
+        "one_s_tol"        : tol_1s_hz,
+        "ten_s_tol"        : tol_1s_hz * 10,
+        "hundred_s_tol"    : tol_1s_hz * 100,
+    }
+
+def enable_gpsdo(driver, clk_freq_mhz=30.72, ppm=0.1, dac_init=None):
+    """Configure and enable the GPSDO; returns True if warm started from `dac_init` (if supported)."""
+    dac_init    = check_warm_start(driver, dac_init)
+    config      = gpsdo_config(clk_freq_mhz, ppm)
+    target_1s   = config["one_s_target"]
+    target_10s  = config["ten_s_target"]
+    target_100s = config["hundred_s_target"]
+    tol_1s_hz   = config["one_s_tol"]
+    tol_10s_hz  = config["ten_s_tol"]
+    tol_100s_hz = config["hundred_s_tol"]
 
     # Configure 1s Target and Tolerance.
     driver.write_register(REG_PPS_1S_TARGET_L, target_1s & 0xFFFF)
@@ -244,22 +784,92 @@ def enable_gpsdo(driver, clk_freq_mhz=30.72, ppm=0.1):
     driver.write_register(REG_PPS_100S_TARGET_H, target_100s >> 16)
     driver.write_register(REG_PPS_100S_ERR_TOL, tol_100s_hz)
 
-    # Set CLK_SEL (0: 30.72MHz LMKRF, 1: 10MHz LMK10).
-    clk_sel = 1 if math.isclose(clk_freq_mhz, 10.0) else 0
+    # Warm start: initial DAC value of the regulation loop.
+    if dac_init is not None:
+        driver.write_register(REG_DAC_INIT, dac_init)
 
     # Enable (EN=1).
+    clk_sel = config["clk_sel"]
     control = set_field(0, CONTROL_CLK_SEL_OFFSET, CONTROL_CLK_SEL_SIZE, clk_sel)
+    control = set_field(control, CONTROL_DAC_INIT_EN_OFFSET, CONTROL_DAC_INIT_EN_SIZE, int(dac_init is not None))
     control = set_field(control, CONTROL_EN_OFFSET, CONTROL_EN_SIZE, 1)
     driver.write_register(REG_CONTROL, control)
 
     print(f"GPSDO enabled: CLK_SEL={clk_sel} ({clk_freq_mhz}MHz), {ppm}ppm tolerance "
-          f"(1s tol={tol_1s_hz}Hz, 10s={tol_10s_hz}Hz, 100s={tol_100s_hz}Hz).")
+          f"(1s tol={tol_1s_hz}Hz, 10s={tol_10s_hz}Hz, 100s={tol_100s_hz}Hz)"
+          + (f", warm start DAC=0x{dac_init:04X}." if dac_init is not None else "."))
+    return dac_init is not None
+
+# Warm Start ---------------------------------------------------------------------------------------
+
+def load_warm_start(board, clk_sel, filename=WARM_START_FILE):
+    """Saved converged DAC value for `board`/`clk_sel` (None if unknown)."""
+    try:
+        with open(filename) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    entry = state.get(board, {}).get(str(clk_sel))
+    return None if entry is None else entry["dac"]
+
+def save_warm_start(driver, board, filename=WARM_START_FILE):
+    """
+    Save the DAC value for `board` and the current CLK_SEL if the loop is converged.
+
+    Converged: fine tune at the highest accuracy (3). Returns the saved value or None.
+    """
+    sample   = driver.get_sample()
+    state    = get_field(sample["status"], STATUS_STATE_OFFSET,    STATUS_STATE_SIZE)
+    accuracy = get_field(sample["status"], STATUS_ACCURACY_OFFSET, STATUS_ACCURACY_SIZE)
+    if not sample["enabled"] or state != 1 or accuracy != 3:
+        return None
+    clk_sel = get_field(driver.read_register(REG_CONTROL, cached=False), CONTROL_CLK_SEL_OFFSET, CONTROL_CLK_SEL_SIZE)
+    try:
+        with open(filename) as f:
+            states = json.load(f)
+    except FileNotFoundError:
+        states = {}
+    states.setdefault(board, {})[str(clk_sel)] = {"dac": sample["dac"], "time": time.time()}
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    tmp = f"{filename}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(states, f, indent=2)
+    os.replace(tmp, filename)
+    return sample["dac"]
 
 def disable_gpsdo(driver):
     # Disable.
     driver.write_register(REG_CONTROL, 0x0000)
     print("GPSDO disabled.")
 
+def dump_pps_timestamps(driver, clk_freq_mhz=30.72, num=0, delay=0.1):
+    """Print the PPS timestamps (rf clock cycles) and per-second counts, on each new PPS."""
+    freq = clk_freq_mhz * 1e6
+    print("PPS Time (cycles)    | PPS Time (s)    | Count      | Freq Error (Hz)")
+    last  = None
+    count = 0
+    try:
+        while num == 0 or count < num:
+            pps = driver.get_pps_timestamp()
+            if pps["time"] != last:
+                last = pps["time"]
+                # First PPS since reset: no count.
+                if pps["count"] == 0:
+                    time.sleep(delay)
+                    continue
+                count += 1
+                print(f"{pps['time']:20d} | {pps['time']/freq:15.9f} | {pps['count']:10d} | {pps['count'] - freq:+15.1f}")
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        print("\nMonitoring stopped.")
+
+def dump_history(driver, num=0):
+    print("Draining telemetry history (oldest first):")
+    print("Entry | 1s Error | DAC Value | State        | Accuracy          | TPulse")
+    for i, entry in enumerate(driver.drain_history(max_entries=num if num > 0 else None)):
+        status = decode_status(entry["status"])
+        print(f"{i + 1:5d} | {entry['error_1s']:8d} | 0x{entry['dac']:04X}    | {status['state']:12} | {status['accuracy']:17} | {str(status['tpulse_active']):6}")
+
 # Main ----------------------------------------------------------------------------------------------
 
 def main():
@@ -267,27 +877,73 @@ def main():
     parser.add_argument("--check",       action="store_true",       help="Run monitoring mode")
     parser.add_argument("--dump",        action="store_true",       help="Dump registers")
     parser.add_argument("--reset",       action="store_true",       help="Reset GPSDO")
+    parser.add_argument("--history",     action="store_true",       help="Drain on-FPGA telemetry history (--num: max entries, 0 for all)")
+    parser.add_argument("--pps",         action="store_true",       help="Print PPS timestamps/counts on each PPS (--num: count, 0 for infinite)")
     parser.add_argument("--enable",      action="store_true",       help="Configure and enable GPSDO")
     parser.add_argument("--disable",     action="store_true",       help="Disable GPSDO")
     parser.add_argument("--num",         default=0,     type=int,   help="Number of iterations (for --check: 0 for infinite; for --dump: default 1 if not specified)")
     parser.add_argument("--delay",       default=1.0,   type=float, help="Delay between iterations (seconds, for --check and --dump)")
     parser.add_argument("--banner",      default=10,    type=int,   help="Banner repeat interval (for --check)")
+    parser.add_argument("--drdy-gpio",   default=None,  type=int,   help="Wait on Data Ready edges of this sysfs GPIO (for --check, gateware built --with-data-ready)")
+    parser.add_argument("--record",      default=None,              help="Also record samples to binary FILE (for --check, see gpsdo_record.py)")
+    parser.add_argument("--on-change",   action="store_true",       help="Only read/print samples when SEQ changes (for --check, --delay is the SEQ poll interval)")
     parser.add_argument("--reset-delay", default=2.0,   type=float, help="Delay after disable before re-enable (seconds, for --reset)")
     parser.add_argument("--clk-freq",    default=30.72, type=float, help="Clock frequency in MHz (10 or 30.72)")
     parser.add_argument("--ppm",         default=0.1,   type=float, help="Tolerance in ppm")
+    parser.add_argument("--sim",         action="store_true",       help="Use simulated gpsdocfg backend instead of spidev")
+    parser.add_argument("--speed",       default=500000, type=int,  help="SPI clock frequency (Hz)")
+    parser.add_argument("--autotune",    action="store_true",       help="Auto-tune SPI clock before other operations")
+    parser.add_argument("--margin",      default=0.5,   type=float, help="Auto-tuned SPI clock margin (fraction of the fastest reliable one)")
+    parser.add_argument("--native-gpsdocfg", action="store_true",   help="Gateware built with --native-gpsdocfg: auto-tune up to sys_clk_freq/8")
+    parser.add_argument("--sys-clk-freq", default=6e6,  type=float, help="Gateware system clock frequency (Hz, for --native-gpsdocfg)")
+    parser.add_argument("--warm-start",  action="store_true",       help="Seed the regulation loop with the saved DAC value (for --enable/--reset)")
+    parser.add_argument("--save-dac",    action="store_true",       help="Save the DAC value if converged (after other operations)")
+    parser.add_argument("--board-id",    default="spi1.1",          help="Board identifier for warm start state")
+    parser.add_argument("--warm-start-file", default=WARM_START_FILE, help="Warm start state file")
     args = parser.parse_args()
 
-    driver = GPSDODriver()
+    record = None
+    if args.record is not None:
+        from gpsdo_record import RecordWriter
+        record = RecordWriter(args.record)
+
+    drdy = None
+    if args.sim:
+        from gpsdo_sim import SimTransport, FakeGPIOEdge
+        transport = SimTransport(speed=args.speed)
+        driver    = GPSDODriver(transport=transport, cache=not args.check)
+        if args.drdy_gpio is not None:
+            drdy = FakeGPIOEdge(transport.model)
+    else:
+        driver = GPSDODriver(speed=args.speed, cache=not args.check)
+        if args.drdy_gpio is not None:
+            drdy = SysfsGPIOEdge(args.drdy_gpio)
     try:
 
+        # Auto-tune.
+        if args.autotune:
+            max_speed = args.sys_clk_freq/NATIVE_GPSDOCFG_SCLK_DIV if args.native_gpsdocfg else None
+            autotune_spi(driver, margin=args.margin, max_speed=max_speed)
+
         # Dump.
         if args.dump:
             num_dumps = args.num if args.num > 0 else 1
             dump_registers(driver, num_dumps=num_dumps, delay=args.delay)
 
+        # History.
+        if args.history:
+            dump_history(driver, num=args.num)
+
+        # Warm start.
+        dac_init = None
+        if args.warm_start and (args.enable or args.reset):
+            dac_init = load_warm_start(args.board_id, gpsdo_config(args.clk_freq)["clk_sel"], args.warm_start_file)
+            if dac_init is None:
+                print(f"No saved DAC value for {args.board_id}, cold start.")
+
         # Enable.
         if args.enable:
-            enable_gpsdo(driver, clk_freq_mhz=args.clk_freq, ppm=args.ppm)
+            enable_gpsdo(driver, clk_freq_mhz=args.clk_freq, ppm=args.ppm, dac_init=dac_init)
 
         # Disable.
         if args.disable:
@@ -295,13 +951,29 @@ def main():
 
         # Reset.
         if args.reset:
-            reset_gpsdo(driver, reset_delay=args.reset_delay)
+            reset_gpsdo(driver, reset_delay=args.reset_delay, dac_init=dac_init)
+
+        # PPS timestamps.
+        if args.pps:
+            dump_pps_timestamps(driver, clk_freq_mhz=args.clk_freq, num=args.num)
 
         # Check.
         if args.check:
-            run_monitoring(driver, num_dumps=args.num, delay=args.delay, banner_interval=args.banner)
+            run_monitoring(driver, num_dumps=args.num, delay=args.delay, banner_interval=args.banner, on_change=args.on_change, drdy=drdy, record=record)
+
+        # Save DAC.
+        if args.save_dac:
+            dac = save_warm_start(driver, args.board_id, args.warm_start_file)
+            if dac is None:
+                print("Regulation loop not converged, DAC value not saved.")
+            else:
+                print(f"Converged DAC value 0x{dac:04X} saved for {args.board_id}.")
     finally:
         driver.close()
+        if record is not None:
+            record.close()
+        if drdy is not None:
+            drdy.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# ADEV/MDEV/TDEV estimator tests (python3 -m pytest test/test_gpsdo_adev.py): white phase noise
+# against its theoretical deviations.
+
+import numpy as np
+import pytest
+
+from gpsdo_adev import deviations, octave_taus
+
+# Constants ----------------------------------------------------------------------------------------
+
+TAU0    = 1.0
+SIGMA_X = 1e-9     # White phase noise (s).
+N       = 1 << 16  # Phase points.
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def white_phase_noise(n=N, sigma_x=SIGMA_X, seed=0):
+    """Fractional frequency of white phase noise: first differences of the phase over tau0."""
+    x = np.random.default_rng(seed).normal(0.0, sigma_x, n + 1)
+    return np.diff(x) / TAU0
+
+# Tests --------------------------------------------------------------------------------------------
+
+def test_white_phase_noise():
+    # White PM (overlapping estimators): ADEV = sqrt(3)*sx/tau, MDEV = sqrt(3/m)*sx/tau, TDEV = sx/sqrt(m).
+    ms = [1, 4, 16, 64]
+    r  = deviations(white_phase_noise(), ms=ms, tau0=TAU0)
+    for m in ms:
+        tau, adev, mdev, tdev, n = r[m]
+        assert tau  == m * TAU0
+        assert adev == pytest.approx(np.sqrt(3) * SIGMA_X / tau,     rel=0.05)
+        assert mdev == pytest.approx(np.sqrt(3 / m) * SIGMA_X / tau, rel=0.05)
+        assert tdev == pytest.approx(SIGMA_X / np.sqrt(m),           rel=0.05)
+
+def test_chunked_matches_single_pass():
+    y  = white_phase_noise(n=10000)
+    ms = list(octave_taus(len(y)))
+    single  = deviations(y, ms=ms)
+    chunked = deviations(y, ms=ms, chunk_size=333)
+    assert single.keys() == chunked.keys()
+    for m in ms:
+        assert chunked[m][4] == single[m][4]
+        assert chunked[m][1:4] == pytest.approx(single[m][1:4], rel=1e-9)
+
+def test_octave_taus():
+    assert list(octave_taus(2))  == []
+    assert list(octave_taus(48)) == [1, 2, 4, 8, 16]
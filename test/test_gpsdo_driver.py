@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# GPSDODriver tests against the simulated gpsdocfg (python3 -m pytest test/test_gpsdo_driver.py):
+# burst reads, status record latch, configuration cache and SEQ polling.
+
+import pytest
+
+from test_gpsdo import *
+from gpsdo_sim import GPSDOCFGModel, PPSDOModel, SimTransport
+
+# Helpers ------------------------------------------------------------------------------------------
+
+@pytest.fixture
+def sim():
+    """Driver on a simulated board with a manual clock (`now[0]`, seconds)."""
+    now       = [0.0]
+    model     = GPSDOCFGModel(PPSDOModel(clock=lambda: now[0], seed=0))
+    transport = SimTransport(model)
+    return GPSDODriver(transport=transport), model, now
+
+# Burst Reads --------------------------------------------------------------------------------------
+
+def test_read_block_single_frame(sim):
+    driver, model, now = sim
+    driver.cache = False
+    values = [driver.read_register(address) for address in CONFIG_REGS]
+    frames = driver.transport.frames
+    assert driver.read_block(CONFIG_REGS.start, len(CONFIG_REGS)) == values
+    assert driver.transport.frames == frames + 1
+
+def test_write_block_read_back(sim):
+    driver, model, now = sim
+    values = [0x1234, 0x0001, 0xBEEF]
+    driver.write_block(REG_PPS_1S_TARGET_L, values)
+    assert model.mem[REG_PPS_1S_TARGET_L:REG_PPS_1S_ERR_TOL + 1] == values
+    assert driver.read_block(REG_PPS_1S_TARGET_L, len(values)) == values
+
+# Snapshot Latch -----------------------------------------------------------------------------------
+
+def test_snapshot_latched_on_1s_err_l(sim):
+    driver, model, now = sim
+    ppsdo = model.ppsdo
+    ppsdo.one_s_error, ppsdo.ten_s_error, ppsdo.dac = -2, 0x12345, 0x9000
+    driver.read_register(REG_PPS_1S_ERR_L)
+    # Core update between the latch and the following reads: the latched record is returned.
+    ppsdo.one_s_error, ppsdo.ten_s_error, ppsdo.dac = 5, 7, 0x7000
+    assert driver.read_register(REG_PPS_1S_ERR_H) == 0xFFFF
+    assert driver.read_block(REG_PPS_10S_ERR_L, 2) == [0x2345, 0x0001]
+    assert driver.read_register(REG_DAC_TUNED_VAL) == 0x9000
+    # New latch.
+    snapshot = driver.get_snapshot()
+    assert (snapshot["error_1s"], snapshot["error_10s"], snapshot["dac"]) == (5, 7, 0x7000)
+
+def test_pps_timestamp_latched_on_pps_time0(sim):
+    driver, model, now = sim
+    now[0] = 2.5
+    first  = driver.get_pps_timestamp()
+    assert first["count"] == pytest.approx(30.72e6, rel=1e-6)
+    now[0] = 3.5
+    second = driver.get_pps_timestamp()
+    assert second["time"] - first["time"] == second["count"]
+
+# Register Cache -----------------------------------------------------------------------------------
+
+def test_cache_serves_config_reads(sim):
+    driver, model, now = sim
+    driver.write_register(REG_PPS_1S_ERR_TOL, 42)
+    frames = driver.transport.frames
+    assert driver.read_register(REG_PPS_1S_ERR_TOL) == 42
+    assert driver.transport.frames == frames
+    # Status registers always go to hardware.
+    driver.read_register(REG_SEQ)
+    driver.read_register(REG_SEQ)
+    assert driver.transport.frames == frames + 2
+
+def test_verify_cache_refreshes_mismatches(sim):
+    driver, model, now = sim
+    driver.read_block(CONFIG_REGS.start, len(CONFIG_REGS))
+    # Change behind the driver's back (other host, reconfiguration).
+    model.mem[REG_PPS_10S_ERR_TOL] = 0x0055
+    assert driver.read_register(REG_PPS_10S_ERR_TOL) != 0x0055
+    assert driver.verify_cache() == [REG_PPS_10S_ERR_TOL]
+    assert driver.read_register(REG_PPS_10S_ERR_TOL) == 0x0055
+    assert driver.verify_cache() == []
+
+def test_invalidate_cache(sim):
+    driver, model, now = sim
+    driver.read_register(REG_CONTROL)
+    model.mem[REG_CONTROL] = 0x0001
+    driver.invalidate_cache([REG_CONTROL])
+    assert driver.read_register(REG_CONTROL) == 0x0001
+
+# SEQ Polling --------------------------------------------------------------------------------------
+
+def test_sample_if_changed(sim):
+    driver, model, now = sim
+    now[0] = 1.5
+    seq = driver.get_seq()
+    assert seq == 1
+    assert driver.get_sample_if_changed(seq) is None
+    # One SEQ increment per PPS, even with an identical status record.
+    now[0] = 3.5
+    sample = driver.get_sample_if_changed(seq)
+    assert sample is not None and sample["seq"] == 3
+    assert driver.get_sample_if_changed(sample["seq"]) is None
+
+def test_seq_needs_pps(sim):
+    driver, model, now = sim
+    model.ppsdo.pps_active = False
+    now[0] = 5.5
+    assert driver.get_seq() == 0
+    assert driver.get_history_level() == 0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Multi-board manager tests (python3 -m pytest test/test_gpsdo_fleet.py): per-board states of the
+# aggregated snapshot with simulated, failing and stalled boards.
+
+import time
+import threading
+
+import pytest
+
+from gpsdo_fleet import GPSDOFleet, parse_board
+from test_gpsdo import GPSDODriver
+from gpsdo_sim import SimTransport
+
+# Fake Boards --------------------------------------------------------------------------------------
+
+class FailingDriver:
+    def get_sample(self):
+        raise IOError("SPI transfer failed")
+
+    def close(self):
+        pass
+
+class StalledDriver:
+    """Board whose get_sample() blocks until released."""
+    def __init__(self):
+        self.release = threading.Event()
+
+    def get_sample(self):
+        self.release.wait(5.0)
+        return {"seq": 0}
+
+    def close(self):
+        self.release.set()
+
+@pytest.fixture
+def fleet():
+    stalled = StalledDriver()
+    fleet   = GPSDOFleet({
+        "sim"     : GPSDODriver(transport=SimTransport()),
+        "failing" : FailingDriver(),
+        "stalled" : stalled,
+    }, period=1.0, timeout=0.1)
+    yield fleet, stalled
+    fleet.close()
+
+# Tests --------------------------------------------------------------------------------------------
+
+def test_parse_board():
+    assert parse_board("rack0=1.1") == ("rack0", 1, 1)
+    assert parse_board("0.2")       == ("spi0.2", 0, 2)
+
+def test_next_tick():
+    fleet = GPSDOFleet({"sim": GPSDODriver(transport=SimTransport())}, period=2.0)
+    assert fleet.next_tick(now=101.5) == 102.0
+    assert fleet.next_tick(now=102.0) == 104.0
+    fleet.close()
+
+def test_snapshot_states(fleet):
+    fleet, stalled = fleet
+    tick     = time.time()
+    snapshot = fleet.sample(tick)
+    assert snapshot["sim"]["state"] == "ok"
+    assert snapshot["sim"]["age"]   >= 0.0
+    assert "status" in snapshot["sim"]["sample"]
+    assert snapshot["failing"]["state"] == "error"
+    assert "SPI transfer failed" in snapshot["failing"]["error"]
+    assert snapshot["stalled"]["state"]  == "stalled"
+    assert snapshot["stalled"]["sample"] is None
+
+def test_stalled_board_does_not_delay_others(fleet):
+    fleet, stalled = fleet
+    fleet.sample(time.time())
+    # Stalled read still pending: not resubmitted, the other boards keep their schedule.
+    start    = time.time()
+    snapshot = fleet.sample(start)
+    assert time.time() - start < 0.5
+    assert snapshot["sim"]["state"]     == "ok"
+    assert snapshot["stalled"]["state"] == "stalled"
+    # Late completion: the board is alive again but its sample (from an older tick) is dropped.
+    stalled.release.set()
+    time.sleep(0.05)
+    snapshot = fleet.sample(time.time())
+    assert snapshot["stalled"]["state"]  == "recovered"
+    assert snapshot["stalled"]["sample"] is None
+    snapshot = fleet.sample(time.time())
+    assert snapshot["stalled"]["state"] == "ok"
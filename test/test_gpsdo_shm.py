@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# NTP SHM feeder tests (python3 -m pytest test/test_gpsdo_shm.py): segment put/get round-trip on a
+# private unit and PPS_TIME conversion to the system clock.
+
+import os
+import random
+import ctypes
+
+import pytest
+
+from gpsdo_shm import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+@pytest.fixture(params=[32, 64])
+def shm(request):
+    """NTP SHM segment on a unit no refclock uses, removed after the test."""
+    try:
+        segment = NTPSHM(unit=0x1000 + os.getpid() % 0x1000, time_t=request.param)
+    except OSError as e:
+        pytest.skip(f"SysV shared memory unavailable: {e}")
+    yield segment
+    segment.close(remove=True)
+
+# NTP SHM Segment ----------------------------------------------------------------------------------
+
+def test_shm_layout():
+    # ntpd/chrony struct shmTime: 96 bytes with 64-bit time_t, 80 with 32-bit time_t.
+    assert ctypes.sizeof(shm_time_struct(64)) == 96
+    assert ctypes.sizeof(shm_time_struct(32)) == 80
+
+def test_shm_round_trip(shm):
+    clock   = 1700000000 * 1000000000
+    receive = clock + 123456789
+    shm.put(clock, receive, leap=LEAP_NOTINSYNC, precision=-10)
+    assert shm.shm.mode == 1 and shm.shm.count % 2 == 0
+    assert shm.shm.receiveTimeStampUSec == 123456
+    assert shm.get() == {"clock_ns": clock, "receive_ns": receive, "leap": LEAP_NOTINSYNC, "precision": -10}
+    # Consumed like chrony/ntpd.
+    assert shm.get() is None
+
+def test_shm_invalid_sample_ignored(shm):
+    # Writer between valid = 0 and valid = 1.
+    shm.put(0, 0)
+    shm.shm.valid = 0
+    assert shm.get() is None
+
+# PPS Clock Fit ------------------------------------------------------------------------------------
+
+def test_clock_fit_averages_jitter():
+    fit  = PPSClockFit(size=16)
+    rng  = random.Random(0)
+    freq = 30.72e6 * (1 + 5e-8)
+    t0   = 1700000000 * 1000000000 + 250000000
+    raw, fitted = [], []
+    for second in range(256):
+        pps_time = round(second * freq)
+        true_ns  = t0 + second * 1000000000
+        observed = true_ns + round(rng.uniform(-500e3, 500e3)) # Poll bracket (1ms).
+        receive, rms = fit.add(pps_time, observed)
+        if second >= 16:
+            raw.append(observed - true_ns)
+            fitted.append(receive - true_ns)
+    rms = lambda errors: (sum(e**2 for e in errors) / len(errors))**0.5
+    assert rms(fitted) < 0.6 * rms(raw)
+    assert len(fit.points) == 16
+
+def test_clock_fit_restarts_on_reset():
+    fit = PPSClockFit(size=16)
+    for second in range(4):
+        fit.add(1000 + second * 30720000, second * 1000000000)
+    # Counter reset (FPGA reconfiguration): fit restarts from this observation.
+    assert fit.add(500, 4 * 1000000000) == (4 * 1000000000, 0.0)
+    assert len(fit.points) == 1
+    # System clock step.
+    fit.add(500 + 30720000, 5 * 1000000000)
+    fit.add(500 + 2 * 30720000, 6 * 1000000000 + 100000000)
+    assert len(fit.points) == 1
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Per-PPS events gateware simulation (python3 -m pytest test/test_pps_events.py): the PPSDO core is
+# modelled by a record published some sys cycles after each PPS edge.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from migen import *
+
+from pps_events import PPSEvents
+
+# Constants ----------------------------------------------------------------------------------------
+
+SYS_CLK_FREQ   = 1e6
+PPS_PERIOD     = 200 # Sys cycles per simulated second.
+PPS_WIDTH      = 20  # Sys cycles.
+CORE_LATENCY   = 30  # Sys cycles from PPS edge to the core status record update.
+STATUS_LATENCY = 50e-6
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def simulate(seconds, status_latency=STATUS_LATENCY, hist_depth=16):
+    """
+    Run `seconds` PPS then drain the history; returns SEQ, the history level and entries and the
+    core record seen on each Data Ready rising edge.
+    """
+    pps    = Signal()
+    record = Signal(64)
+    dut    = PPSEvents(pps, record, SYS_CLK_FREQ, status_latency=status_latency, hist_depth=hist_depth, with_data_ready=True)
+    result = {"data_ready": [], "history": []}
+
+    def stimulus():
+        for second in range(1, seconds + 1):
+            for cycle in range(PPS_PERIOD):
+                yield pps.eq(cycle < PPS_WIDTH)
+                # Core: new second's record published CORE_LATENCY cycles after the PPS edge.
+                if cycle == CORE_LATENCY:
+                    yield record.eq(second)
+                yield
+        for cycle in range(PPS_PERIOD):
+            yield
+        result["seq"]   = (yield dut.seq)
+        result["level"] = (yield dut.hist_level)
+        # Drain (pop toggle, resynchronized).
+        for i in range(result["level"]):
+            result["history"].append((yield dut.hist_data))
+            yield dut.hist_pop.eq(~dut.hist_pop)
+            for j in range(8):
+                yield
+
+    def monitor():
+        data_ready = 0
+        for cycle in range((seconds + 1) * PPS_PERIOD):
+            if (yield dut.data_ready) and not data_ready:
+                result["data_ready"].append((yield record))
+            data_ready = (yield dut.data_ready)
+            yield
+
+    run_simulation(dut, [stimulus(), monitor()])
+    return result
+
+# Tests --------------------------------------------------------------------------------------------
+
+def test_events_see_new_second():
+    result = simulate(seconds=5)
+    # One SEQ increment, Data Ready pulse and history entry per PPS, each with the new second's record.
+    assert result["seq"]        == 5
+    assert result["level"]      == 5
+    assert result["data_ready"] == [1, 2, 3, 4, 5]
+    assert result["history"]    == [1, 2, 3, 4, 5]
+
+def test_events_before_core_update_are_stale():
+    # Without the status latency (strobe on the PPS edge), the previous second's record is captured.
+    result = simulate(seconds=3, status_latency=0)
+    assert result["data_ready"] == [0, 1, 2]
+    assert result["history"]    == [0, 1, 2]
+
+def test_history_drops_oldest_when_full():
+    # hist_depth entries in the FIFO + 1 in its output register.
+    result = simulate(seconds=7, hist_depth=4)
+    assert result["seq"]     == 7
+    assert result["level"]   == 5
+    assert result["history"] == [3, 4, 5, 6, 7]
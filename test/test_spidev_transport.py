@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+#
+# This file is part of LimePSB_RPCM_GW.
+#
+# Copyright (c) 2024-2025 Lime Microsystems.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# SpidevTransport packing tests (python3 -m pytest test/test_spidev_transport.py): the ioctl is
+# emulated on top of the simulated gpsdocfg, the spi_ioc_transfer arrays are the real ones.
+
+import sys
+import types
+import ctypes
+import struct
+
+import pytest
+
+import test_gpsdo
+from test_gpsdo import *
+from gpsdo_sim import GPSDOCFGModel, PPSDOModel
+
+# spidev Emulation ---------------------------------------------------------------------------------
+
+class FakeSpiDev:
+    def __init__(self):
+        self.max_speed_hz = 500000
+        self.mode         = 0
+
+    def open(self, bus, device):
+        pass
+
+    def fileno(self):
+        return -1
+
+    def close(self):
+        pass
+
+class FakeSpidevIoctl:
+    """SPI_IOC_MESSAGE ioctl: CPython argument limits, spidev limits, frames through `device`."""
+    def __init__(self, device):
+        self.device   = device
+        self.messages = []
+
+    def ioctl(self, fd, request, arg):
+        if isinstance(arg, bytes) and len(arg) > 1024:
+            raise ValueError("ioctl string arg too long")
+        size = (request >> 16) & 0x3FFF
+        assert request & 0xFF == 0 and (request >> 8) & 0xFF == SPI_IOC_MAGIC
+        assert size == len(arg)
+        xfers = list(struct.iter_unpack(SPI_IOC_TRANSFER_FMT, bytes(arg)))
+        assert sum(xfer[2] for xfer in xfers) <= SPIDEV_BUFSIZ
+        self.messages.append(len(xfers))
+        for tx_buf, rx_buf, length, *_ in xfers:
+            miso = self.device(list(ctypes.string_at(tx_buf, length)))
+            ctypes.memmove(rx_buf, bytes(miso), length)
+        return 0
+
+@pytest.fixture
+def spidev(monkeypatch):
+    monkeypatch.setitem(sys.modules, "spidev", types.SimpleNamespace(SpiDev=FakeSpiDev))
+    def make(device):
+        ioctl = FakeSpidevIoctl(device)
+        monkeypatch.setattr(test_gpsdo, "fcntl", types.SimpleNamespace(ioctl=ioctl.ioctl))
+        transport = SpidevTransport()
+        transport.spi.xfer2 = device # Single frames.
+        return transport, ioctl
+    return make
+
+# Tests --------------------------------------------------------------------------------------------
+
+def test_xfer_many_splits_messages(spidev):
+    transport, ioctl = spidev(lambda frame: [b ^ 0xFF for b in frame])
+    frames = [[i & 0xFF, 0x00, 0x12, 0x34] for i in range(1200)]
+    rx     = transport.xfer_many(frames)
+    assert rx == [[b ^ 0xFF for b in frame] for frame in frames]
+    assert sum(ioctl.messages) == len(frames)
+    assert max(ioctl.messages) <= SPI_IOC_MAX_FRAMES
+
+def test_xfer_many_bufsiz(spidev):
+    transport, ioctl = spidev(lambda frame: frame)
+    frames = [[0x00] * 1000 for _ in range(10)]
+    assert transport.xfer_many(frames) == frames
+    assert ioctl.messages == [4, 4, 2]
+
+def test_spi_ioc_message_size():
+    with pytest.raises(ValueError):
+        spi_ioc_message(SPI_IOC_MAX_FRAMES + 1)
+
+def test_drain_history(spidev):
+    # 200 PPS of history (HIST_LEVEL > 16: more than 32 frames per batch).
+    now   = [0.0]
+    model = GPSDOCFGModel(PPSDOModel(clock=lambda: now[0], seed=0))
+    transport, ioctl = spidev(model.transfer)
+    driver = GPSDODriver(transport=transport)
+    now[0] = 200.5
+    assert driver.get_history_level() == 200
+    entries = list(driver.drain_history())
+    assert len(entries) == 200
+    assert driver.get_history_level() == 0
+    assert max(ioctl.messages) > 32